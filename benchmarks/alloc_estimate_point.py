@@ -0,0 +1,89 @@
+"""Microbenchmark: pydantic model allocations and wall time per `estimate_point`.
+
+Counts every pydantic model created through `__init__`, `model_construct` or `model_copy` while estimating one point,
+then times repeated calls. Run from the repo root:
+
+    python benchmarks/alloc_estimate_point.py [--model examples/model_qwen3_1p7b.yaml] [--hardware ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections import Counter
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from selfspec_calculator.config import HardwareConfig, ModelConfig, ScheduleMode
+from selfspec_calculator.estimator import estimate_point
+from selfspec_calculator.io import load_speculation_stats
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def count_model_allocations(fn) -> Counter[str]:  # noqa: ANN001
+    counts: Counter[str] = Counter()
+    orig_init = BaseModel.__init__
+    orig_construct = BaseModel.model_construct.__func__  # type: ignore[attr-defined]
+    orig_copy = BaseModel.model_copy
+
+    def init(self, /, **data):  # noqa: ANN001, ANN202
+        counts[type(self).__name__] += 1
+        orig_init(self, **data)
+
+    def construct(cls, *args, **kwargs):  # noqa: ANN001, ANN202
+        counts[cls.__name__] += 1
+        return orig_construct(cls, *args, **kwargs)
+
+    def copy(self, *args, **kwargs):  # noqa: ANN001, ANN202
+        counts[type(self).__name__] += 1
+        return orig_copy(self, *args, **kwargs)
+
+    BaseModel.__init__ = init  # type: ignore[method-assign]
+    BaseModel.model_construct = classmethod(construct)  # type: ignore[method-assign,assignment]
+    BaseModel.model_copy = copy  # type: ignore[method-assign]
+    try:
+        fn()
+    finally:
+        BaseModel.__init__ = orig_init  # type: ignore[method-assign]
+        BaseModel.model_construct = classmethod(orig_construct)  # type: ignore[method-assign,assignment]
+        BaseModel.model_copy = orig_copy  # type: ignore[method-assign]
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", type=Path, default=REPO_ROOT / "examples" / "model_qwen3_1p7b.yaml")
+    parser.add_argument("--hardware", type=Path, default=REPO_ROOT / "examples" / "hardware_soc_memory.yaml")
+    parser.add_argument("--stats", type=Path, default=REPO_ROOT / "examples" / "stats.json")
+    parser.add_argument("--l-prompt", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--schedule", choices=["serialized", "layer-pipelined"], default=None)
+    args = parser.parse_args()
+
+    model = ModelConfig.from_yaml(args.model)
+    hardware = HardwareConfig.from_yaml(args.hardware)
+    if args.schedule is not None:
+        hardware.soc.schedule = ScheduleMode(args.schedule)
+    stats = load_speculation_stats(args.stats)
+
+    def run() -> None:
+        estimate_point(model, hardware, stats, args.l_prompt)
+
+    run()  # warm-up
+    counts = count_model_allocations(run)
+    print(f"pydantic model allocations per estimate_point: {sum(counts.values())}")
+    for name, n in counts.most_common():
+        print(f"  {name:<28} {n}")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        run()
+    elapsed = time.perf_counter() - start
+    print(f"time per estimate_point: {elapsed / args.repeat * 1e6:.1f} us ({args.repeat} runs)")
+
+
+if __name__ == "__main__":
+    main()
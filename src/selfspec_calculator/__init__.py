@@ -1,6 +1,6 @@
 """Self-speculating analog inference performance calculator."""
 
+from .estimator import Estimator
 from .report import Report, SweepPoint
 
-__all__ = ["Report", "SweepPoint"]
-
+__all__ = ["Estimator", "Report", "SweepPoint"]
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import gc
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from contextlib import contextmanager
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Generic, Iterable, Iterator, TypeVar
+
+from .config import HardwareConfig, ModelConfig, _content_digest
+from .report import SweepPoint
+from .stats import SpeculationStats
+
+V = TypeVar("V")
+
+try:
+    PACKAGE_VERSION = version("selfspec-calculator")
+except PackageNotFoundError:  # pragma: no cover - uninstalled source tree
+    PACKAGE_VERSION = "unknown"
+
+RESULT_CACHE_NAME = "results.sqlite3"
+DEFAULT_CACHE_MAX_BYTES = 1 << 30
+_SQL_BATCH = 500  # prompt lengths per `IN (...)` query, well below SQLite's bound-parameter limit
+# Cache hits refresh `last_used` only once it is this old, and give up if the write lock is not free within
+# `_TOUCH_TIMEOUT_MS`: reads stay lock-free in the common case, at the cost of a coarser LRU order.
+_TOUCH_INTERVAL_S = 60.0
+_TOUCH_TIMEOUT_MS = 50
+
+# `usage.bytes` tracks the summed point sizes through triggers, so every process sees a consistent total without
+# scanning the table. Re-storing an existing key only refreshes its `last_used` (points are deterministic).
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS points (
+    config TEXT NOT NULL,
+    l_prompt INTEGER NOT NULL,
+    point TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    UNIQUE (config, l_prompt)
+);
+CREATE INDEX IF NOT EXISTS points_last_used ON points (last_used);
+CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO usage (id, bytes) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS points_insert AFTER INSERT ON points BEGIN
+    UPDATE usage SET bytes = bytes + new.size;
+END;
+CREATE TRIGGER IF NOT EXISTS points_delete AFTER DELETE ON points BEGIN
+    UPDATE usage SET bytes = bytes - old.size;
+END;
+COMMIT;
+"""
+
+
+class LruCache(Generic[V]):
+    """Bounded in-process LRU map with hit/miss counters."""
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be > 0 (got {maxsize})")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> V:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return value
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def default_cache_dir() -> Path:
+    """`$XDG_CACHE_HOME/selfspec-calculator`, by default `~/.cache/selfspec-calculator`."""
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "selfspec-calculator"
+
+
+def result_key(model: ModelConfig, hardware: HardwareConfig, stats: SpeculationStats, detail: str) -> str:
+    """Cache key of a sweep's points (besides `l_prompt`): config fingerprints, detail level and package version."""
+    return _content_digest([PACKAGE_VERSION, model.fingerprint(), hardware.fingerprint(), stats.fingerprint(), detail])
+
+
+class ResultCache:
+    """Persistent cache of sweep points in a SQLite database under `directory` (default: `default_cache_dir()`).
+
+    Points are stored per (`result_key`, `l_prompt`): `detail="full"` points with their phase breakdowns, `"metrics"`
+    points with the metrics only. The database runs in WAL mode, so any number of processes can share a directory:
+    readers do not block, writers take turns (waiting up to `timeout_s`). Once the stored points exceed `max_bytes`,
+    the least recently used are evicted; hits refresh a point's recency at most once a minute, and only if no other
+    process is writing. `hits`/`misses` count this instance's point lookups in this process.
+
+    Instances pickle as their settings and (re)connect lazily in each process, so one can be handed to pool workers.
+    """
+
+    def __init__(
+        self, directory: str | Path | None = None, *, max_bytes: int = DEFAULT_CACHE_MAX_BYTES, timeout_s: float = 60.0
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be >= 1 (got {max_bytes})")
+        self.directory = Path(directory).expanduser() if directory is not None else default_cache_dir()
+        self.path = self.directory / RESULT_CACHE_NAME
+        self.max_bytes = max_bytes
+        self.timeout_s = timeout_s
+        self.hits = 0
+        self.misses = 0
+        self._db: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {**self.__dict__, "_db": None, "_pid": None}
+
+    def __enter__(self) -> ResultCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        self._db = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None or self._pid != os.getpid():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=self.timeout_s, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(f"PRAGMA busy_timeout={int(self.timeout_s * 1000)}")
+            db.executescript(_SCHEMA)
+            self._db, self._pid = db, os.getpid()
+        return self._db
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM points").fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        """Summed size of the stored points (the database file adds page and index overhead)."""
+        return self._connection().execute("SELECT bytes FROM usage").fetchone()[0]
+
+    def get_many(self, key: str, prompt_lengths: Iterable[int]) -> dict[int, SweepPoint]:
+        """Cached points of `key` among `prompt_lengths`, by `l_prompt`; marks them as recently used (best effort)."""
+        lengths = list(dict.fromkeys(prompt_lengths))
+        db = self._connection()
+        rows: list[tuple[int, str, float]] = []
+        for start in range(0, len(lengths), _SQL_BATCH):
+            chunk = lengths[start : start + _SQL_BATCH]
+            marks = ",".join("?" * len(chunk))
+            query = f"SELECT l_prompt, point, last_used FROM points WHERE config = ? AND l_prompt IN ({marks})"
+            rows.extend(db.execute(query, (key, *chunk)))
+        self.hits += len(rows)
+        self.misses += len(lengths) - len(rows)
+        if not rows:
+            return {}
+
+        now = time.time()
+        stale = [l_prompt for l_prompt, _text, last_used in rows if now - last_used >= _TOUCH_INTERVAL_S]
+        if stale:
+            self._touch(key, stale, now)
+        # Validation allocates many small objects and no garbage cycles; as in `parallel`, pausing the cyclic GC
+        # meanwhile makes decoding large cached sweeps several times faster.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return {l_prompt: SweepPoint.model_validate_json(text) for l_prompt, text, _last_used in rows}
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _touch(self, key: str, lengths: list[int], now: float) -> None:
+        db = self._connection()
+        db.execute(f"PRAGMA busy_timeout={_TOUCH_TIMEOUT_MS}")
+        try:
+            with self._write() as db:
+                for start in range(0, len(lengths), _SQL_BATCH):
+                    chunk = lengths[start : start + _SQL_BATCH]
+                    marks = ",".join("?" * len(chunk))
+                    query = f"UPDATE points SET last_used = ? WHERE config = ? AND l_prompt IN ({marks})"
+                    db.execute(query, (now, key, *chunk))
+        except sqlite3.OperationalError as exc:
+            if exc.sqlite_errorcode & 0xFF not in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED):  # primary code
+                raise
+        finally:
+            db.execute(f"PRAGMA busy_timeout={int(self.timeout_s * 1000)}")
+
+    def put_many(self, key: str, points: Iterable[SweepPoint]) -> None:
+        """Store points under `key`, then evict least recently used points until the cache fits `max_bytes`."""
+        now = time.time()
+        rows = [(key, point.l_prompt, text, len(text), now) for point in points for text in (point.model_dump_json(),)]
+        if not rows:
+            return
+        with self._write() as db:
+            db.executemany(
+                "INSERT INTO points (config, l_prompt, point, size, last_used) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (config, l_prompt) DO UPDATE SET last_used = excluded.last_used",
+                rows,
+            )
+            excess = db.execute("SELECT bytes FROM usage").fetchone()[0] - self.max_bytes
+            if excess > 0:
+                victims: list[tuple[int]] = []
+                cursor = db.execute("SELECT rowid, size FROM points ORDER BY last_used, rowid")
+                for rowid, size in cursor:
+                    victims.append((rowid,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                cursor.close()
+                db.executemany("DELETE FROM points WHERE rowid = ?", victims)
+
+    def clear(self) -> None:
+        with self._write() as db:
+            db.execute("DELETE FROM points")
+        self.hits = 0
+        self.misses = 0
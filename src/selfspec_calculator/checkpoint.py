@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import IO
+
+from .config import HardwareConfig, ModelConfig, _content_digest
+from .report import SweepPoint
+from .stats import SpeculationStats
+
+
+def sweep_fingerprint(model: ModelConfig, hardware: HardwareConfig, stats: SpeculationStats, detail: str) -> str:
+    """Hex digest identifying everything a sweep point depends on besides `l_prompt`."""
+    return _content_digest([model.fingerprint(), hardware.fingerprint(), stats.fingerprint(), detail])
+
+
+class SweepJournal:
+    """Append-only JSON Lines journal of completed sweep points, keyed by (config fingerprint, `l_prompt`).
+
+    `Estimator.evaluate_many(..., journal=...)` skips the points already journaled under its fingerprint, appends the
+    others as they complete and flushes (to disk, via fsync) every `flush_every` points, so an interrupted sweep loses
+    at most that many. Entries of other fingerprints are kept but ignored. A new journal refuses an existing non-empty
+    file unless `resume=True`; on resume a torn last line (from a crash mid-write) is dropped.
+    """
+
+    def __init__(self, path: str | Path, *, resume: bool = False, flush_every: int = 64) -> None:
+        if flush_every < 1:
+            raise ValueError(f"flush_every must be >= 1 (got {flush_every})")
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self._entries: dict[str, dict[int, SweepPoint]] = {}
+        if self.path.exists() and self.path.stat().st_size > 0:
+            if not resume:
+                raise ValueError(f"Checkpoint journal {self.path} already exists; resume it or remove it")
+            self._load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] | None = self.path.open("a", encoding="utf-8")
+
+    def _load(self) -> None:
+        data = self.path.read_bytes()
+        complete = data[: data.rfind(b"\n") + 1]
+        if len(complete) != len(data):
+            with self.path.open("r+b") as f:
+                f.truncate(len(complete))
+        for number, line in enumerate(complete.decode("utf-8").splitlines(), start=1):
+            try:
+                entry = json.loads(line)
+                point = SweepPoint.model_validate(entry["point"])
+            except (ValueError, KeyError) as exc:
+                raise ValueError(f"Corrupt checkpoint journal {self.path} at line {number}: {exc}") from exc
+            self._entries.setdefault(entry["fingerprint"], {})[point.l_prompt] = point
+
+    def __enter__(self) -> SweepJournal:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def completed(self, fingerprint: str) -> dict[int, SweepPoint]:
+        """Journaled points for `fingerprint`, by `l_prompt`."""
+        return dict(self._entries.get(fingerprint, {}))
+
+    def append(self, fingerprint: str, point: SweepPoint) -> None:
+        if self._file is None:
+            raise ValueError(f"Checkpoint journal {self.path} is closed")
+        entry = {"fingerprint": fingerprint, "l_prompt": point.l_prompt, "point": point.model_dump(mode="json")}
+        self._file.write(json.dumps(entry, sort_keys=True) + "\n")
+        self._entries.setdefault(fingerprint, {})[point.l_prompt] = point
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
 import argparse
+import glob
 import json
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
-from .config import HardwareConfig, ModelConfig
-from .estimator import estimate_sweep
+import numpy as np
+
+from .cache import ResultCache, default_cache_dir
+from .checkpoint import SweepJournal
+from .config import HardwareConfig, ModelConfig, _load_yaml
+from .depth import sweep_depth
+from .dse import TOP_OBJECTIVES, pareto_front_rows, parse_sweep_arg, run_sweep, run_top
+from .estimator import DETAIL_LEVELS, estimate_batch, estimate_sweep
+from .heatmap import HEATMAP_METRICS, write_heatmap
 from .io import load_speculation_stats
+from .parallel import ProcessSweepExecutor
+from .report import Metrics
+from .sampling import SAMPLERS, parse_sample_axis, sample_overrides
+from .shards import SPEC_NAME, merge_report, merge_shards, plan_shards, requeue_stale, shard_status, work_shards
+from .stats import fit_acceptance_probability
 
 
 def _existing_path(value: str) -> Path:
@@ -21,7 +35,15 @@ def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="ppa-calculator", add_help=True)
     parser.add_argument("--model", required=True, type=_existing_path, help="Path to model.yaml")
     parser.add_argument("--hardware", required=True, type=_existing_path, help="Path to hardware.yaml")
-    parser.add_argument("--stats", required=True, type=_existing_path, help="Path to stats (json|yaml)")
+    parser.add_argument(
+        "--stats",
+        required=True,
+        nargs="+",
+        help=(
+            "Path to stats (json|yaml). Several paths or glob patterns (e.g. 'runs/noise_*.json') evaluate every "
+            "histogram against the same model/hardware and emit one table keyed by (stats_id, l_prompt)"
+        ),
+    )
     parser.add_argument(
         "--prompt-lengths",
         nargs="+",
@@ -29,6 +51,109 @@ def build_parser() -> argparse.ArgumentParser:
         type=int,
         help="One or more prompt lengths (e.g., 64 128 256)",
     )
+    parser.add_argument(
+        "--detail",
+        choices=DETAIL_LEVELS,
+        default="full",
+        help="Report detail: full per-phase breakdowns (default) or metrics only (faster)",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        metavar="PATH=V1,V2,...",
+        help=(
+            "Sweep a dotted hardware path (e.g. analog.dac_bits=1,2,4) or model path (model.n_layers=16,32); "
+            "repeat for a cartesian product. Writes one JSON line per combination."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for --sweep combinations or for the prompt lengths of a single sweep (default: 1)",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "Evaluate N sampled combinations instead of the full grid; --sweep then also accepts ranges "
+            "(PATH=LOW..HIGH). Combinations failing cheap feasibility rules are rejected before validation."
+        ),
+    )
+    parser.add_argument("--sampler", choices=SAMPLERS, default=None, help="Sampling design for --sample (default: lhs)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for --sample")
+    parser.add_argument(
+        "--pareto",
+        action="store_true",
+        help=(
+            "With --sweep: emit only the per-prompt-length Pareto front over energy/token, latency/token and "
+            "on-chip area"
+        ),
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Keep only the best N (combination, prompt length) results by --objective, with full breakdowns",
+    )
+    parser.add_argument(
+        "--objective",
+        choices=TOP_OBJECTIVES,
+        default="tokens_per_joule",
+        help="Ranking metric for --top (energy/latency are minimized, throughput/tokens-per-joule maximized)",
+    )
+    parser.add_argument(
+        "--optimize-k",
+        type=int,
+        default=None,
+        metavar="K_MAX",
+        help=(
+            "Evaluate K=1..K_MAX under a truncated-geometric acceptance model and report the throughput- and "
+            "tokens/J-optimal K per prompt length"
+        ),
+    )
+    parser.add_argument(
+        "--acceptance",
+        type=float,
+        default=None,
+        metavar="ALPHA",
+        help="Per-token acceptance probability for --optimize-k (default: fitted to the --stats histogram)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        metavar="JOURNAL",
+        help="Append completed points to this JSON Lines journal as the sweep runs (refuses an existing journal)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="With --checkpoint: reuse the points already journaled for this configuration and continue",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        nargs="?",
+        const=default_cache_dir(),
+        default=None,
+        metavar="DIR",
+        help=(
+            "Reuse and store evaluated points in a persistent SQLite cache in DIR "
+            f"(default when the flag is given without DIR: {default_cache_dir()})"
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Size cap of the --cache-dir cache; least recently used points are evicted beyond it (default: 1024)",
+    )
     parser.add_argument(
         "--output",
         type=Path,
@@ -38,27 +163,356 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main(argv: list[str] | None = None) -> int:
-    args = build_parser().parse_args(argv)
+def _result_cache(args: argparse.Namespace) -> ResultCache | None:
+    if args.cache_dir is None:
+        return None
+    if args.cache_max_mb is None:
+        return ResultCache(args.cache_dir)
+    return ResultCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 2**20))
+
+
+def _write_sweep(args: argparse.Namespace) -> int:
+    try:
+        samples = None
+        if args.sample is not None:
+            axes = [parse_sample_axis(text) for text in args.sweep]
+            samples = sample_overrides(axes, args.sample, method=args.sampler or "lhs", seed=args.seed)
+        common = {
+            "model_raw": _load_yaml(args.model),
+            "hardware_raw": _load_yaml(args.hardware),
+            "stats": load_speculation_stats(args.stats),
+            "prompt_lengths": args.prompt_lengths,
+            "sweeps": [] if samples is not None else [parse_sweep_arg(text) for text in args.sweep],
+            "jobs": args.jobs,
+            "samples": samples,
+            "cache": _result_cache(args),
+        }
+        if args.top is not None:
+            rows = run_top(**common, n=args.top, objective=args.objective)
+        elif args.pareto:
+            rows = pareto_front_rows(run_sweep(**common, detail="metrics"))
+        else:
+            rows = run_sweep(**common, detail=args.detail)
+        if args.output is None:
+            for row in rows:
+                print(json.dumps(row, sort_keys=True), flush=True)
+            return 0
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with args.output.open("w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, sort_keys=True) + "\n")
+                f.flush()
+    except Exception as exc:  # noqa: BLE001
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def build_heatmap_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ppa-calculator heatmap",
+        description="Write K x prompt-length metric grids to memory-mapped .npy files with a JSON sidecar.",
+    )
+    parser.add_argument("--model", required=True, type=_existing_path, help="Path to model.yaml")
+    parser.add_argument("--hardware", required=True, type=_existing_path, help="Path to hardware.yaml")
+    parser.add_argument(
+        "--stats",
+        type=_existing_path,
+        default=None,
+        help="Stats (json|yaml) to fit the per-token acceptance probability from (or pass --acceptance)",
+    )
+    parser.add_argument("--acceptance", type=float, default=None, metavar="ALPHA", help="Per-token acceptance")
+    parser.add_argument("--k-max", type=int, required=True, help="Rows are K = 1..K_MAX")
+    parser.add_argument(
+        "--prompt-range",
+        type=int,
+        nargs=3,
+        required=True,
+        metavar=("START", "STOP", "STEP"),
+        help="Columns are prompt lengths START, START+STEP, ... (< STOP)",
+    )
+    parser.add_argument(
+        "--metrics",
+        nargs="+",
+        choices=tuple(Metrics.model_fields),
+        default=list(HEATMAP_METRICS),
+        help="Metric grids to write (default: tokens_per_joule latency_ns_per_token)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=8192, help="Prompt lengths computed per chunk")
+    parser.add_argument("--output-dir", required=True, type=Path, help="Directory for <metric>.npy and heatmap.json")
+    return parser
+
 
+def _heatmap_main(argv: list[str]) -> int:
+    parser = build_heatmap_parser()
+    args = parser.parse_args(argv)
+    if (args.stats is None) == (args.acceptance is None):
+        parser.error("pass exactly one of --stats or --acceptance")
+    start, stop, step = args.prompt_range
+    if step < 1:
+        parser.error("--prompt-range STEP must be >= 1")
+    if args.k_max < 1:
+        parser.error("--k-max must be >= 1")
     try:
         model = ModelConfig.from_yaml(args.model)
         hardware = HardwareConfig.from_yaml(args.hardware)
-        stats = load_speculation_stats(args.stats)
-        report = estimate_sweep(
-            model=model,
-            hardware=hardware,
-            stats=stats,
+        alpha = args.acceptance
+        if alpha is None:
+            alpha = fit_acceptance_probability(load_speculation_stats(args.stats))
+        sidecar = write_heatmap(
+            model,
+            hardware,
+            args.output_dir,
+            k_values=range(1, args.k_max + 1),
+            prompt_lengths=np.arange(start, stop, step, dtype=np.int64),
+            alpha=alpha,
+            metrics=args.metrics,
+            chunk_size=args.chunk_size,
+        )
+    except Exception as exc:  # noqa: BLE001
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(json.dumps(sidecar["arrays"], sort_keys=True))
+    return 0
+
+
+def build_shard_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ppa-calculator sweep",
+        description=(
+            "Sharded sweep over a shared directory: plan it (with --model/--hardware/--stats/--prompt-lengths), then "
+            "run any number of --work processes on any host, then `ppa-calculator merge`."
+        ),
+    )
+    parser.add_argument("--shard-dir", required=True, type=Path, help="Shared directory holding the shards")
+    parser.add_argument("--model", type=_existing_path, default=None, help="Path to model.yaml (plan)")
+    parser.add_argument("--hardware", type=_existing_path, default=None, help="Path to hardware.yaml (plan)")
+    parser.add_argument("--stats", type=_existing_path, default=None, help="Path to stats (json|yaml) (plan)")
+    parser.add_argument("--prompt-lengths", nargs="+", type=int, default=None, help="Prompt lengths (plan)")
+    parser.add_argument("--detail", choices=DETAIL_LEVELS, default="full", help="Report detail (plan)")
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        metavar="PATH=V1,V2,...",
+        help="Knob axis as for the main command; repeat for a cartesian product (plan)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=256,
+        help="(combination, prompt length) evaluations per shard (plan, default: 256)",
+    )
+    parser.add_argument("--work", action="store_true", help="Claim and evaluate pending shards until none are left")
+    parser.add_argument("--worker-id", default=None, help="Worker name for claims (default: <host>-<pid>)")
+    parser.add_argument("--max-shards", type=int, default=None, help="Stop after this many shards (work)")
+    parser.add_argument(
+        "--requeue-stale",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Before working, return claims older than SECONDS (crashed workers) to the pending queue",
+    )
+    return parser
+
+
+def _shard_main(argv: list[str]) -> int:
+    parser = build_shard_parser()
+    args = parser.parse_args(argv)
+    plan_args = (args.model, args.hardware, args.stats, args.prompt_lengths)
+    if args.work:
+        if any(value is not None for value in plan_args) or args.sweep:
+            parser.error("--work takes no plan arguments (they are read from the shard directory)")
+    elif any(value is None for value in plan_args):
+        parser.error("planning needs --model, --hardware, --stats and --prompt-lengths (or pass --work)")
+    try:
+        if args.work:
+            requeued = [] if args.requeue_stale is None else requeue_stale(args.shard_dir, args.requeue_stale)
+            done = work_shards(args.shard_dir, worker_id=args.worker_id, max_shards=args.max_shards)
+            status = shard_status(args.shard_dir)
+            print(json.dumps({"worker_shards": done, "requeued": requeued, **status}, sort_keys=True))
+            return 0
+        shards = plan_shards(
+            args.shard_dir,
+            model_raw=_load_yaml(args.model),
+            hardware_raw=_load_yaml(args.hardware),
+            stats=load_speculation_stats(args.stats),
             prompt_lengths=args.prompt_lengths,
-            paths={
-                "model": str(args.model),
-                "hardware": str(args.hardware),
-                "stats": str(args.stats),
-            },
+            sweeps=[parse_sweep_arg(text) for text in args.sweep],
+            detail=args.detail,
+            shard_size=args.shard_size,
+            paths={"model": str(args.model), "hardware": str(args.hardware), "stats": str(args.stats)},
         )
     except Exception as exc:  # noqa: BLE001
         print(f"error: {exc}", file=sys.stderr)
         return 2
+    print(json.dumps({"shards": shards}))
+    return 0
+
+
+def _merge_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="ppa-calculator merge",
+        description="Reassemble a sharded sweep: JSON Lines rows for knob sweeps, one report JSON otherwise.",
+    )
+    parser.add_argument("--shard-dir", required=True, type=Path, help="Directory of a completed sharded sweep")
+    parser.add_argument("--output", type=Path, default=None, help="Write the merged output here (default: stdout)")
+    args = parser.parse_args(argv)
+    try:
+        if json.loads((args.shard_dir / SPEC_NAME).read_text(encoding="utf-8"))["sweeps"]:
+            text = "".join(json.dumps(row, sort_keys=True) + "\n" for row in merge_shards(args.shard_dir))
+        else:
+            text = json.dumps(merge_report(args.shard_dir), indent=2, sort_keys=True) + "\n"
+    except Exception as exc:  # noqa: BLE001
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if args.output is None:
+        print(text, end="")
+        return 0
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(text, encoding="utf-8")
+    return 0
+
+
+def _expand_stats(parser: argparse.ArgumentParser, values: list[str]) -> list[Path]:
+    paths: list[Path] = []
+    for value in values:
+        if glob.has_magic(value):
+            matches = sorted(glob.glob(value))
+            if not matches:
+                parser.error(f"argument --stats: No files match: {value}")
+            paths.extend(Path(match) for match in matches)
+        else:
+            try:
+                paths.append(_existing_path(value))
+            except argparse.ArgumentTypeError as exc:
+                parser.error(f"argument --stats: {exc}")
+    return paths
+
+
+def _write_batch(args: argparse.Namespace, stats_paths: list[Path]) -> int:
+    try:
+        model = ModelConfig.from_yaml(args.model)
+        hardware = HardwareConfig.from_yaml(args.hardware)
+        stats = {str(path): load_speculation_stats(path) for path in stats_paths}
+        report = estimate_batch(model, hardware, stats, args.prompt_lengths, detail=args.detail)
+    except Exception as exc:  # noqa: BLE001
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    text = json.dumps(report.model_dump(mode="json"), indent=2, sort_keys=True)
+    if args.output is None:
+        print(text)
+        return 0
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(text + "\n", encoding="utf-8")
+    return 0
+
+
+def _write_depth(args: argparse.Namespace) -> int:
+    try:
+        model = ModelConfig.from_yaml(args.model)
+        hardware = HardwareConfig.from_yaml(args.hardware)
+        alpha = args.acceptance
+        if alpha is None:
+            alpha = fit_acceptance_probability(load_speculation_stats(args.stats))
+        depth = sweep_depth(model, hardware, args.prompt_lengths, k_max=args.optimize_k, alpha=alpha)
+    except Exception as exc:  # noqa: BLE001
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    payload = {
+        "alpha": alpha,
+        "alpha_source": "fitted" if args.acceptance is None else "given",
+        "k_max": args.optimize_k,
+        "points": depth.to_rows(),
+    }
+    text = json.dumps(payload, indent=2, sort_keys=True)
+    if args.output is None:
+        print(text)
+        return 0
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(text + "\n", encoding="utf-8")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["heatmap"]:
+        return _heatmap_main(argv[1:])
+    if argv[:1] == ["sweep"]:
+        return _shard_main(argv[1:])
+    if argv[:1] == ["merge"]:
+        return _merge_main(argv[1:])
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    stats_paths = _expand_stats(parser, args.stats)
+    batch = len(stats_paths) > 1 or any(glob.has_magic(value) for value in args.stats)
+    if batch and (args.sweep or args.top is not None or args.optimize_k is not None):
+        parser.error("several --stats files cannot be combined with --sweep, --top or --optimize-k")
+    args.stats = stats_paths[0]
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
+    if args.jobs > 1 and (batch or args.optimize_k is not None):
+        parser.error("--jobs applies to --sweep and single-configuration sweeps (not --optimize-k or batches)")
+    if args.sample is not None and not args.sweep:
+        parser.error("--sample requires --sweep axes")
+    if args.sample is None and (args.sampler is not None or args.seed is not None):
+        parser.error("--sampler and --seed require --sample")
+    if args.pareto and not args.sweep:
+        parser.error("--pareto requires --sweep")
+    if args.pareto and args.top is not None:
+        parser.error("--pareto and --top are mutually exclusive")
+    if args.resume and args.checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+    if args.checkpoint is not None and (batch or args.sweep or args.top is not None or args.optimize_k is not None):
+        parser.error("--checkpoint applies to single-configuration sweeps (not --sweep, --top, --optimize-k, batches)")
+    if args.cache_max_mb is not None and args.cache_dir is None:
+        parser.error("--cache-max-mb requires --cache-dir")
+    if args.cache_max_mb is not None and args.cache_max_mb <= 0:
+        parser.error("--cache-max-mb must be > 0")
+    if args.cache_dir is not None and (batch or args.optimize_k is not None):
+        parser.error("--cache-dir applies to prompt-length and knob sweeps (not --optimize-k or batches)")
+    if args.acceptance is not None and args.optimize_k is None:
+        parser.error("--acceptance requires --optimize-k")
+    if args.optimize_k is not None:
+        if args.sweep or args.top is not None:
+            parser.error("--optimize-k cannot be combined with --sweep or --top")
+        return _write_depth(args)
+    if args.sweep or args.top is not None:
+        return _write_sweep(args)
+    if batch:
+        return _write_batch(args, stats_paths)
+
+    try:
+        model = ModelConfig.from_yaml(args.model)
+        hardware = HardwareConfig.from_yaml(args.hardware)
+        stats = load_speculation_stats(args.stats)
+        journal = None if args.checkpoint is None else SweepJournal(args.checkpoint, resume=args.resume)
+        cache = _result_cache(args)
+        with ProcessSweepExecutor(args.jobs) as executor, journal or nullcontext(), cache or nullcontext():
+            report = estimate_sweep(
+                model=model,
+                hardware=hardware,
+                stats=stats,
+                prompt_lengths=args.prompt_lengths,
+                paths={
+                    "model": str(args.model),
+                    "hardware": str(args.hardware),
+                    "stats": str(args.stats),
+                },
+                detail=args.detail,
+                executor=executor if args.jobs > 1 else None,
+                journal=journal,
+                cache=cache,
+                break_even=True,
+            )
+    except Exception as exc:  # noqa: BLE001
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if cache is not None:
+        print(f"cache: {cache.hits} hits, {cache.misses} misses ({cache.path})", file=sys.stderr)
 
     payload = report.model_dump(mode="json")
     text = json.dumps(payload, indent=2, sort_keys=True)
@@ -1,12 +1,76 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from copy import deepcopy
 from enum import Enum
 from pathlib import Path
 from typing import Any, ClassVar
 
 import yaml
-from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError, field_validator, model_validator
+
+
+# Bump when the canonical forms below change, so stored fingerprints from older versions never match.
+FINGERPRINT_VERSION = 3
+
+
+def _canonical_floats(value: Any) -> Any:
+    # Exact: json writes the round-tripping repr. Only -0.0 (== 0.0) and NaN (one spelling) are normalized.
+    if isinstance(value, float):
+        return "nan" if value != value else value + 0.0
+    if isinstance(value, dict):
+        return {str(k): _canonical_floats(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical_floats(v) for v in value]
+    return value
+
+
+def _content_digest(payload: Any) -> str:
+    text = json.dumps([FINGERPRINT_VERSION, _canonical_floats(payload)], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _snapshot(value: Any) -> Any:
+    # Cheap structural copy of field values (models, dicts and lists down to scalars) to validate memos against.
+    if isinstance(value, BaseModel):
+        return (type(value), tuple(_snapshot(v) for v in value.__dict__.values()))
+    if isinstance(value, dict):
+        return tuple((k, _snapshot(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_snapshot(v) for v in value)
+    return value
+
+
+class _ConfigModel(BaseModel):
+    _fingerprint_memo: tuple[Any, str] | None = PrivateAttr(default=None)
+
+    def __eq__(self, other: object) -> bool:
+        # Private attributes only hold memos; equality is about field content.
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return (
+            type(self) is type(other)
+            and self.__dict__ == other.__dict__
+            and self.__pydantic_extra__ == other.__pydantic_extra__
+        )
+
+    def _canonical(self) -> Any:
+        return self.model_dump(mode="json")
+
+    def fingerprint(self) -> str:
+        """Stable hex digest of the canonical content: labels and equivalent spellings are ignored, values are exact.
+
+        Memoized per object against a snapshot of its field values, so assignments anywhere in the config tree and
+        in-place edits of dict fields (e.g. `histogram[a] = ...`) are picked up without re-hashing unchanged configs.
+        """
+        snapshot = _snapshot(self)
+        memo = self._fingerprint_memo
+        if memo is not None and memo[0] == snapshot:
+            return memo[1]
+        digest = _content_digest(self._canonical())
+        self._fingerprint_memo = (snapshot, digest)
+        return digest
 
 
 class FfnType(str, Enum):
@@ -19,13 +83,13 @@ class PrecisionMode(str, Enum):
     full = "full"
 
 
-class BlockDraftPolicy(BaseModel):
+class BlockDraftPolicy(_ConfigModel):
     qkv: PrecisionMode = PrecisionMode.draft
     wo: PrecisionMode = PrecisionMode.draft
     ffn: PrecisionMode = PrecisionMode.draft
 
 
-class DraftPrecisionPolicy(BaseModel):
+class DraftPrecisionPolicy(_ConfigModel):
     default: BlockDraftPolicy = Field(default_factory=BlockDraftPolicy)
     per_layer: dict[int, BlockDraftPolicy] = Field(default_factory=dict)
 
@@ -33,7 +97,7 @@ class DraftPrecisionPolicy(BaseModel):
         return self.per_layer.get(layer, self.default)
 
 
-class ModelConfig(BaseModel):
+class ModelConfig(_ConfigModel):
     name: str | None = None
     n_layers: int = Field(..., ge=1)
     d_model: int = Field(..., ge=1)
@@ -69,6 +133,25 @@ class ModelConfig(BaseModel):
             raise ValueError("Either d_ff or ffn_expansion must be provided")
         return int(round(self.d_model * self.ffn_expansion))
 
+    def _canonical(self) -> Any:
+        # The name is a label; d_ff / ffn_expansion only matter through the FFN width; per-layer policies equal to the
+        # default are no-ops.
+        data = self.model_dump(mode="json", exclude={"name", "d_ff", "ffn_expansion", "draft_policy"})
+        try:
+            data["effective_d_ff"] = self.effective_d_ff
+        except ValueError:
+            data["effective_d_ff"] = None
+        policy = self.draft_policy
+        data["draft_policy"] = {
+            "default": policy.default.model_dump(mode="json"),
+            "per_layer": {
+                str(layer): block.model_dump(mode="json")
+                for layer, block in sorted(policy.per_layer.items())
+                if block != policy.default
+            },
+        }
+        return data
+
     @classmethod
     def from_yaml(cls, path: str | Path) -> "ModelConfig":
         data = _load_yaml(path)
@@ -93,16 +176,16 @@ class ScheduleMode(str, Enum):
     layer_pipelined = "layer-pipelined"
 
 
-class PerMacCost(BaseModel):
+class PerMacCost(_ConfigModel):
     energy_pj_per_mac: float = Field(..., ge=0.0)
     latency_ns_per_mac: float = Field(..., ge=0.0)
 
 
-class PerWeightArea(BaseModel):
+class PerWeightArea(_ConfigModel):
     area_mm2_per_weight: float = Field(..., ge=0.0)
 
 
-class HardwareCosts(BaseModel):
+class HardwareCosts(_ConfigModel):
     analog_draft: PerMacCost
     analog_full: PerMacCost
     analog_verify_reuse: PerMacCost
@@ -114,18 +197,18 @@ class HardwareCosts(BaseModel):
     digital_overhead_area_mm2_per_layer: float = Field(0.0, ge=0.0)
 
 
-class AdcResolutionConfig(BaseModel):
+class AdcResolutionConfig(_ConfigModel):
     draft_bits: int = Field(..., ge=1)
     residual_bits: int = Field(..., ge=1)
 
 
-class PerOpOverheadSpec(BaseModel):
+class PerOpOverheadSpec(_ConfigModel):
     energy_pj_per_op: float = Field(0.0, ge=0.0)
     latency_ns_per_op: float = Field(0.0, ge=0.0)
     area_mm2_per_unit: float = Field(0.0, ge=0.0)
 
 
-class AnalogPeripheryKnobs(BaseModel):
+class AnalogPeripheryKnobs(_ConfigModel):
     tia: PerOpOverheadSpec = Field(default_factory=PerOpOverheadSpec)
     snh: PerOpOverheadSpec = Field(default_factory=PerOpOverheadSpec)
     mux: PerOpOverheadSpec = Field(default_factory=PerOpOverheadSpec)
@@ -134,7 +217,7 @@ class AnalogPeripheryKnobs(BaseModel):
     write_drivers: PerOpOverheadSpec = Field(default_factory=PerOpOverheadSpec)
 
 
-class AnalogKnobs(BaseModel):
+class AnalogKnobs(_ConfigModel):
     xbar_size: int = Field(..., ge=1)
     num_columns_per_adc: int = Field(..., ge=1)
     dac_bits: int = Field(..., ge=1)
@@ -151,38 +234,38 @@ class AnalogKnobs(BaseModel):
         return self
 
 
-class PeripheralSpec(BaseModel):
+class PeripheralSpec(_ConfigModel):
     energy_pj_per_conversion: float = Field(..., ge=0.0)
     latency_ns_per_conversion: float = Field(..., ge=0.0)
     area_mm2_per_unit: float = Field(..., ge=0.0)
 
 
-class AnalogArraySpec(BaseModel):
+class AnalogArraySpec(_ConfigModel):
     energy_pj_per_activation: float = Field(..., ge=0.0)
     latency_ns_per_activation: float = Field(..., ge=0.0)
     area_mm2_per_weight: float = Field(..., ge=0.0)
 
 
-class VerifySetupKnobs(BaseModel):
+class VerifySetupKnobs(_ConfigModel):
     energy_pj_per_burst: float = Field(0.0, ge=0.0)
     latency_ns_per_burst: float = Field(0.0, ge=0.0)
 
 
-class ControlOverheadKnobs(BaseModel):
+class ControlOverheadKnobs(_ConfigModel):
     energy_pj_per_token: float = Field(0.0, ge=0.0)
     latency_ns_per_token: float = Field(0.0, ge=0.0)
     energy_pj_per_burst: float = Field(0.0, ge=0.0)
     latency_ns_per_burst: float = Field(0.0, ge=0.0)
 
 
-class SocKnobs(BaseModel):
+class SocKnobs(_ConfigModel):
     schedule: ScheduleMode = ScheduleMode.serialized
     verify_setup: VerifySetupKnobs = Field(default_factory=VerifySetupKnobs)
     buffers_add: PerOpOverheadSpec = Field(default_factory=PerOpOverheadSpec)
     control: ControlOverheadKnobs = Field(default_factory=ControlOverheadKnobs)
 
 
-class MemoryTechKnobs(BaseModel):
+class MemoryTechKnobs(_ConfigModel):
     read_energy_pj_per_byte: float = Field(0.0, ge=0.0)
     write_energy_pj_per_byte: float = Field(0.0, ge=0.0)
     read_bandwidth_GBps: float = Field(0.0, ge=0.0)
@@ -192,13 +275,13 @@ class MemoryTechKnobs(BaseModel):
     area_mm2: float = Field(0.0, ge=0.0)
 
 
-class KvCacheFormatKnobs(BaseModel):
+class KvCacheFormatKnobs(_ConfigModel):
     value_bytes_per_elem: int = Field(1, ge=0)
     scale_bytes: int = Field(2, ge=0)
     scales_per_token_per_head: int = Field(2, ge=0)
 
 
-class KvCacheMemoryKnobs(BaseModel):
+class KvCacheMemoryKnobs(_ConfigModel):
     hbm: KvCacheFormatKnobs = Field(default_factory=KvCacheFormatKnobs)
     sram: KvCacheFormatKnobs | None = None
     max_context_tokens: int | None = Field(default=None, ge=0)
@@ -207,26 +290,26 @@ class KvCacheMemoryKnobs(BaseModel):
         return self.sram or self.hbm
 
 
-class MemoryKnobs(BaseModel):
+class MemoryKnobs(_ConfigModel):
     sram: MemoryTechKnobs = Field(default_factory=MemoryTechKnobs)
     hbm: MemoryTechKnobs = Field(default_factory=MemoryTechKnobs)
     fabric: MemoryTechKnobs = Field(default_factory=MemoryTechKnobs)
     kv_cache: KvCacheMemoryKnobs = Field(default_factory=KvCacheMemoryKnobs)
 
 
-class MemoryLibraryDefaults(BaseModel):
+class MemoryLibraryDefaults(_ConfigModel):
     sram: MemoryTechKnobs = Field(default_factory=MemoryTechKnobs)
     hbm: MemoryTechKnobs = Field(default_factory=MemoryTechKnobs)
     fabric: MemoryTechKnobs = Field(default_factory=MemoryTechKnobs)
 
 
-class SocLibraryDefaults(BaseModel):
+class SocLibraryDefaults(_ConfigModel):
     verify_setup: VerifySetupKnobs = Field(default_factory=VerifySetupKnobs)
     buffers_add: PerOpOverheadSpec = Field(default_factory=PerOpOverheadSpec)
     control: ControlOverheadKnobs = Field(default_factory=ControlOverheadKnobs)
 
 
-class DigitalCostDefaults(BaseModel):
+class DigitalCostDefaults(_ConfigModel):
     attention: PerMacCost
     softmax: PerMacCost
     elementwise: PerMacCost
@@ -234,7 +317,7 @@ class DigitalCostDefaults(BaseModel):
     digital_overhead_area_mm2_per_layer: float = Field(0.0, ge=0.0)
 
 
-class ResolvedKnobSpecs(BaseModel):
+class ResolvedKnobSpecs(_ConfigModel):
     library: str
     dac_bits: int
     adc_draft_bits: int
@@ -246,7 +329,7 @@ class ResolvedKnobSpecs(BaseModel):
     digital: DigitalCostDefaults
 
 
-class HardwareConfig(BaseModel):
+class HardwareConfig(_ConfigModel):
     reuse_policy: ReusePolicy = ReusePolicy.reuse
     library: str | None = None
     soc: SocKnobs = Field(default_factory=SocKnobs)
@@ -254,6 +337,10 @@ class HardwareConfig(BaseModel):
     analog: AnalogKnobs | None = None
     costs: HardwareCosts | None = None
 
+    # Resolved specs/payload keyed by the knobs they depend on, so mutating those knobs re-resolves.
+    _resolved_specs: tuple[tuple[str, int, int, int], ResolvedKnobSpecs] | None = PrivateAttr(default=None)
+    _resolved_payload: tuple[tuple[str, int, int, int], dict[str, Any]] | None = PrivateAttr(default=None)
+
     DEFAULT_LIBRARY: ClassVar[str] = "puma_like_v1"
     LIBRARIES: ClassVar[dict[str, dict[str, Any]]] = {
         "puma_like_v1": {
@@ -577,10 +664,32 @@ class HardwareConfig(BaseModel):
     def selected_library(self) -> str:
         return self.library or self.DEFAULT_LIBRARY
 
+    def _canonical(self) -> Any:
+        # Knob configs: the library enters through the resolved specs (its other defaults are already in the knobs).
+        # Legacy configs ignore the library. An unset SRAM KV format means the HBM one.
+        data = self.model_dump(mode="json", exclude={"library"})
+        if self.mode == HardwareMode.knob_based:
+            data["resolved_specs"] = self.resolve_knob_specs().model_dump(mode="json")
+        if self.memory is not None:
+            data["memory"]["kv_cache"]["sram"] = self.memory.kv_cache.resolved_sram().model_dump(mode="json")
+        return data
+
+    def _knob_spec_key(self) -> tuple[str, int, int, int]:
+        assert self.analog is not None
+        return (self.selected_library, self.analog.dac_bits, self.analog.adc.draft_bits, self.analog.adc.residual_bits)
+
     def resolve_knob_specs(self) -> ResolvedKnobSpecs:
         if self.mode != HardwareMode.knob_based:
             raise ValueError("Cannot resolve knob specs for legacy costs.* config")
 
+        key = self._knob_spec_key()
+        if self._resolved_specs is not None and self._resolved_specs[0] == key:
+            return self._resolved_specs[1]
+        specs = self._resolve_knob_specs_uncached()
+        self._resolved_specs = (key, specs)
+        return specs
+
+    def _resolve_knob_specs_uncached(self) -> ResolvedKnobSpecs:
         library_name = self.selected_library
         lib = self.LIBRARIES.get(library_name)
         if lib is None:
@@ -628,6 +737,12 @@ class HardwareConfig(BaseModel):
     def resolved_library_payload(self) -> dict[str, Any] | None:
         if self.mode != HardwareMode.knob_based:
             return None
+        key = self._knob_spec_key()
+        if self._resolved_payload is None or self._resolved_payload[0] != key:
+            self._resolved_payload = (key, self._resolved_library_payload_uncached())
+        return deepcopy(self._resolved_payload[1])
+
+    def _resolved_library_payload_uncached(self) -> dict[str, Any]:
         specs = self.resolve_knob_specs()
         payload: dict[str, Any] = {
             "name": specs.library,
@@ -682,7 +797,7 @@ def _load_yaml(path: str | Path) -> dict[str, Any]:
         raise ValueError(f"Failed to parse YAML: {p}") from exc
 
 
-class InputPaths(BaseModel):
+class InputPaths(_ConfigModel):
     model: str
     hardware: str
     stats: str
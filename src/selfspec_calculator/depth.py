@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .config import HardwareConfig, ModelConfig, ScheduleMode
+from .estimator import Estimator
+from .report import MAXIMIZED_METRICS, Metrics
+from .stats import expected_committed_tokens_geometric, truncated_geometric_stats
+
+_PHASES = ("draft", "verify_drafted", "verify_bonus")
+DEPTH_OBJECTIVES = ("throughput_tokens_per_s", "tokens_per_joule")
+
+
+@dataclass(frozen=True)
+class DepthSweep:
+    """Per-token metrics for every (K, l_prompt) pair under a truncated-geometric acceptance model.
+
+    Metric arrays have shape `(len(k_values), len(prompt_lengths))`. Pairs whose context `l_prompt + K` exceeds the KV
+    cache capacity are NaN and never selected.
+    """
+
+    alpha: float
+    k_values: np.ndarray
+    prompt_lengths: np.ndarray
+    metrics: dict[str, np.ndarray]
+
+    def best_k(self, objective: str) -> np.ndarray:
+        """Optimal K per prompt length for a `Metrics` field (0 where no K fits the context)."""
+        if objective not in Metrics.model_fields:
+            raise ValueError(f"Unknown objective '{objective}'. Available: {', '.join(Metrics.model_fields)}")
+        values = self.metrics[objective]
+        if objective in MAXIMIZED_METRICS:
+            index = np.argmax(np.where(np.isnan(values), -np.inf, values), axis=0)
+        else:
+            index = np.argmin(np.where(np.isnan(values), np.inf, values), axis=0)
+        feasible = ~np.isnan(values).all(axis=0)
+        return np.where(feasible, self.k_values[index], 0)
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        """One row per prompt length with the throughput- and tokens/J-optimal K and their metric values."""
+        rows: list[dict[str, Any]] = [{"l_prompt": int(l_prompt)} for l_prompt in self.prompt_lengths]
+        for objective in DEPTH_OBJECTIVES:
+            best = self.best_k(objective)
+            values = self.metrics[objective]
+            for i, row in enumerate(rows):
+                k = int(best[i])
+                row[f"{objective}_optimal_k"] = k or None
+                row[objective] = float(values[np.searchsorted(self.k_values, k), i]) if k else None
+        return rows
+
+
+def _check_alpha(alpha: float) -> None:
+    if not 0.0 <= alpha <= 1.0:
+        raise ValueError(f"acceptance probability must be in [0, 1] (got {alpha})")
+
+
+def _check_prompt_lengths(prompt_lengths: np.ndarray | list[int]) -> np.ndarray:
+    lengths = np.asarray(prompt_lengths, dtype=np.int64)
+    if lengths.ndim != 1:
+        raise ValueError(f"prompt_lengths must be one-dimensional (got shape {lengths.shape})")
+    if lengths.size and int(lengths.min()) < 0:
+        raise ValueError(f"prompt_lengths must be non-negative (got {int(lengths.min())})")
+    return lengths
+
+
+class _DepthModel:
+    """Per-token metrics as array functions of (K, l_prompt), with every K-dependent coefficient precomputed.
+
+    K only scales the per-step draft / verify-drafted costs, sets the KV traffic (whose within-burst SRAM terms grow
+    as K(K-1)/2) and the expected committed tokens, sum_{i<=K} alpha^i. Per-step costs come from the compiled (affine
+    in `l_prompt`) step totals.
+    """
+
+    def __init__(self, model: ModelConfig, hardware: HardwareConfig, k_values: np.ndarray, alpha: float) -> None:
+        if k_values.ndim != 1 or k_values.size == 0 or int(k_values.min()) < 1:
+            raise ValueError("K values must be a non-empty list of integers >= 1")
+        estimator = Estimator(model, hardware)
+        self.hardware = hardware
+        self.totals = estimator.step_totals
+        self.k = k_values.astype(np.float64)[:, None]
+        self.committed = expected_committed_tokens_geometric(alpha, self.k)
+        # KV memory cost per phase as (K, 1) coefficient columns: energy and bandwidth latency are affine in the
+        # (affine) byte counts; the fixed per-access latency applies where bytes > 0. Byte counts have non-negative
+        # intercepts and slopes, so that is either every l_prompt or only l_prompt > 0.
+        self.memory: dict[str, dict[str, np.ndarray]] = {}
+        if hardware.memory is not None:
+            traffic = [estimator.kv_traffic(truncated_geometric_stats(alpha, int(k))) for k in k_values]
+            for phase in _PHASES:
+                terms = {name: np.zeros_like(self.k) for name in ("e0", "e1", "t0", "t1", "t_always", "t_positive")}
+                for tech_name in ("sram", "hbm", "fabric"):
+                    tech = getattr(hardware.memory, tech_name)
+                    for rw in ("read", "write"):
+                        field = f"{tech_name}_{rw}_bytes"
+                        intercept = np.array([t[phase].intercept[field] for t in traffic])[:, None]
+                        slope = np.array([t[phase].slope[field] for t in traffic])[:, None]
+                        energy_per_byte = getattr(tech, f"{rw}_energy_pj_per_byte")
+                        bandwidth = getattr(tech, f"{rw}_bandwidth_GBps")
+                        fixed = getattr(tech, f"{rw}_latency_ns")
+                        terms["e0"] += intercept * energy_per_byte
+                        terms["e1"] += slope * energy_per_byte
+                        if bandwidth > 0:
+                            terms["t0"] += intercept / bandwidth
+                            terms["t1"] += slope / bandwidth
+                        terms["t_always"] += np.where(intercept > 0, fixed, 0.0)
+                        terms["t_positive"] += np.where((intercept <= 0) & (slope > 0), fixed, 0.0)
+                self.memory[phase] = terms
+
+    def metrics(self, lengths: np.ndarray) -> dict[str, np.ndarray]:
+        hardware = self.hardware
+        k = self.k
+        l_prompt = lengths.astype(np.float64)[None, :]
+
+        def column(name: str) -> np.ndarray:
+            return self.totals.intercept[name] + self.totals.slope[name] * l_prompt
+
+        energy = column("verify_bonus_energy_pj") + k * (
+            column("draft_energy_pj") + column("verify_drafted_energy_pj")
+        )
+        latency = column("verify_bonus_latency_ns") + k * (
+            column("draft_latency_ns") + column("verify_drafted_latency_ns")
+        )
+        kv_latency: dict[str, Any] = {phase: 0.0 for phase in _PHASES}
+        if self.memory:
+            positive = l_prompt > 0
+            for phase, terms in self.memory.items():
+                mem_latency = terms["t0"] + terms["t1"] * l_prompt + terms["t_always"]
+                mem_latency = mem_latency + np.where(positive, terms["t_positive"], 0.0)
+                energy = energy + (terms["e0"] + terms["e1"] * l_prompt)
+                latency = latency + mem_latency
+                kv_latency[phase] = mem_latency
+
+        energy_per_token = energy / self.committed
+        latency_per_token = latency / self.committed
+        if hardware.soc.schedule == ScheduleMode.layer_pipelined:
+            t_draft = np.maximum(column("draft_max_layer_latency_ns"), kv_latency["draft"] / k)
+            t_verify_drafted = np.maximum(
+                column("verify_drafted_max_layer_latency_ns"), kv_latency["verify_drafted"] / k
+            )
+            t_verify_bonus = np.maximum(column("verify_bonus_max_layer_latency_ns"), kv_latency["verify_bonus"])
+            latency_per_token = (k * t_draft + k * t_verify_drafted + t_verify_bonus) / self.committed
+        shape = (k.shape[0], lengths.size)
+        energy_per_token = np.broadcast_to(energy_per_token, shape).astype(np.float64)
+        latency_per_token = np.broadcast_to(latency_per_token, shape).astype(np.float64)
+
+        if hardware.memory is not None and hardware.memory.kv_cache.max_context_tokens is not None:
+            over = np.broadcast_to(l_prompt + k > hardware.memory.kv_cache.max_context_tokens, shape)
+            energy_per_token[over] = np.nan
+            latency_per_token[over] = np.nan
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            throughput = np.where(latency_per_token == 0, 0.0, 1e9 / latency_per_token)
+            tokens_per_joule = np.where(energy_per_token == 0, 0.0, 1e12 / energy_per_token)
+        return {
+            "energy_pj_per_token": energy_per_token,
+            "latency_ns_per_token": latency_per_token,
+            "throughput_tokens_per_s": throughput,
+            "tokens_per_joule": tokens_per_joule,
+        }
+
+
+def sweep_depth(
+    model: ModelConfig,
+    hardware: HardwareConfig,
+    prompt_lengths: np.ndarray | list[int],
+    *,
+    k_max: int,
+    alpha: float,
+) -> DepthSweep:
+    """Evaluate K = 1..k_max for every prompt length in one array pass.
+
+    Matches `estimate_point` with `truncated_geometric_stats(alpha, K)` for each (K, l_prompt) pair; see `_DepthModel`.
+    """
+    if k_max < 1:
+        raise ValueError(f"k_max must be >= 1 (got {k_max})")
+    _check_alpha(alpha)
+    lengths = _check_prompt_lengths(prompt_lengths)
+    k_values = np.arange(1, k_max + 1, dtype=np.int64)
+    metrics = _DepthModel(model, hardware, k_values, alpha).metrics(lengths)
+    return DepthSweep(alpha=alpha, k_values=k_values, prompt_lengths=lengths, metrics=metrics)
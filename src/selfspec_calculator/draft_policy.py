@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Any, Literal, Mapping
+
+from pydantic import BaseModel
+
+from .config import BlockDraftPolicy, DraftPrecisionPolicy, HardwareConfig, ModelConfig, PrecisionMode
+from .estimator import _check_context_capacity, _kv_memory_traffic_by_phase, _layer_costs, _metrics_from_step_totals
+from .report import Metrics
+from .stats import SpeculationStats
+
+BLOCKS = ("qkv", "wo", "ffn")
+PolicyObjective = Literal["energy_pj_per_token", "latency_ns_per_token"]
+POLICY_OBJECTIVES: tuple[PolicyObjective, ...] = ("energy_pj_per_token", "latency_ns_per_token")
+_PHASES = ("draft", "verify_drafted", "verify_bonus")
+
+
+class DraftPolicyPlan(BaseModel):
+    objective: PolicyObjective
+    budget: float
+    value: float
+    all_draft_value: float
+    sensitivity: float
+    full_blocks: list[tuple[int, str]]
+    draft_policy: dict[str, Any]
+
+    def apply_to(self, model: ModelConfig) -> ModelConfig:
+        return model.model_copy(update={"draft_policy": DraftPrecisionPolicy.model_validate(self.draft_policy)})
+
+
+def _block_policy(mask: int) -> BlockDraftPolicy:
+    return BlockDraftPolicy(
+        **{block: PrecisionMode.full if mask & (1 << i) else PrecisionMode.draft for i, block in enumerate(BLOCKS)}
+    )
+
+
+class _PolicyCostModel:
+    """Per-token metrics of a per-layer draft-policy assignment, in O(1) per assignment.
+
+    All layers share the same shapes, so one layer's per-token costs depend only on which of its blocks run in full
+    precision (8 classes, precomputed once), and layers add up in the draft/verify phases. An assignment is summarized by
+    the number of layers in each class; the per-layer pipeline maxima are a max over the 8 classes.
+    """
+
+    def __init__(self, model: ModelConfig, hardware: HardwareConfig, stats: SpeculationStats, l_prompt: int) -> None:
+        self.hardware = hardware
+        self.stats = stats
+        layer_costs = _layer_costs(model, hardware, l_prompt)
+        # Per class: one layer's (energy, latency) for the draft, verify-drafted and verify-bonus steps.
+        self.classes: list[tuple[tuple[float, float], ...]] = []
+        for mask in range(1 << len(BLOCKS)):
+            accs = layer_costs(_block_policy(mask))
+            self.classes.append(tuple((sum(acc.stage_energy), acc.latency_ns()) for acc in accs))
+
+        self.traffic = None
+        if hardware.memory is not None:
+            by_phase = _kv_memory_traffic_by_phase(model=model, hardware=hardware, stats=stats, l_prompt=l_prompt)
+            self.traffic = {phase: dict(t) for phase, t in by_phase.items()}
+
+    def metrics(self, counts: list[int]) -> Metrics:
+        totals = {f"{phase}_{field}": 0.0 for phase in _PHASES for field in ("energy_pj", "latency_ns")}
+        totals.update({f"{phase}_max_layer_latency_ns": 0.0 for phase in _PHASES})
+        for costs, n in zip(self.classes, counts):
+            if n == 0:
+                continue
+            for phase, (energy, latency) in zip(_PHASES, costs):
+                totals[f"{phase}_energy_pj"] += n * energy
+                totals[f"{phase}_latency_ns"] += n * latency
+                key = f"{phase}_max_layer_latency_ns"
+                totals[key] = max(totals[key], latency)
+        return _metrics_from_step_totals(hardware=self.hardware, stats=self.stats, totals=totals, traffic=self.traffic)
+
+
+def optimize_draft_policy(
+    model: ModelConfig,
+    hardware: HardwareConfig,
+    stats: SpeculationStats,
+    l_prompt: int,
+    *,
+    sensitivity: Mapping[int, Mapping[str, float]],
+    budget: float,
+    objective: PolicyObjective = "energy_pj_per_token",
+) -> DraftPolicyPlan:
+    """Choose which (layer, block) pairs run in full precision during drafting, within a per-token budget.
+
+    `sensitivity[layer][block]` is the user's benefit score for running that block in full precision (e.g. a Hessian or
+    perplexity-drop score; missing entries count as 0). Starting from an all-draft policy, blocks are flipped to full
+    greedily by score per marginal increase of `objective`, skipping flips that would exceed `budget` (a knapsack
+    with greedy-by-density selection). Every candidate flip is evaluated exactly in O(1) via `_PolicyCostModel`.
+    """
+    if objective not in POLICY_OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}'. Available: {', '.join(POLICY_OBJECTIVES)}")
+    candidates: dict[tuple[int, int], float] = {}
+    for layer, scores in sensitivity.items():
+        if layer < 0 or layer >= model.n_layers:
+            raise ValueError(f"sensitivity has invalid layer index: {layer} (n_layers={model.n_layers})")
+        for block, score in scores.items():
+            if block not in BLOCKS:
+                raise ValueError(f"sensitivity has unknown block '{block}' for layer {layer} (expected {BLOCKS})")
+            if score > 0:
+                candidates[(layer, BLOCKS.index(block))] = float(score)
+
+    _check_context_capacity(hardware, stats, l_prompt)
+    cost_model = _PolicyCostModel(model, hardware, stats, l_prompt)
+    masks = [0] * model.n_layers
+    counts = [0] * len(cost_model.classes)
+    counts[0] = model.n_layers
+    all_draft_value = current = getattr(cost_model.metrics(counts), objective)
+    if all_draft_value > budget:
+        raise ValueError(f"All-draft policy already exceeds the budget: {objective}={all_draft_value} > {budget}")
+
+    chosen: list[tuple[int, str]] = []
+    covered = 0.0
+    while candidates:
+        best: tuple[float, float, tuple[int, int], float] | None = None
+        for (layer, bit), score in candidates.items():
+            old, new = masks[layer], masks[layer] | (1 << bit)
+            counts[old] -= 1
+            counts[new] += 1
+            value = getattr(cost_model.metrics(counts), objective)
+            counts[new] -= 1
+            counts[old] += 1
+            if value > budget:
+                continue
+            delta = value - current
+            density = float("inf") if delta <= 0 else score / delta
+            if best is None or (density, score) > (best[0], best[1]):
+                best = (density, score, (layer, bit), value)
+        if best is None:
+            break
+
+        _density, score, (layer, bit), current = best
+        counts[masks[layer]] -= 1
+        masks[layer] |= 1 << bit
+        counts[masks[layer]] += 1
+        del candidates[(layer, bit)]
+        chosen.append((layer, BLOCKS[bit]))
+        covered += score
+
+    per_layer = {layer: _block_policy(mask).model_dump(mode="json") for layer, mask in enumerate(masks) if mask}
+    return DraftPolicyPlan(
+        objective=objective,
+        budget=budget,
+        value=current,
+        all_draft_value=all_draft_value,
+        sensitivity=covered,
+        full_blocks=chosen,
+        draft_policy={"default": BlockDraftPolicy().model_dump(mode="json"), "per_layer": per_layer},
+    )
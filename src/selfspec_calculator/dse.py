@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from copy import deepcopy
+from typing import Any, Iterable, Iterator
+
+import yaml
+
+from .cache import ResultCache
+from .config import HardwareConfig, ModelConfig
+from .estimator import Detail, Estimator
+from .report import MAXIMIZED_METRICS, Metrics, Report
+from .parallel import ProcessSweepExecutor
+from .pareto import ParetoFront
+from .sampling import precheck
+from .stats import SpeculationStats
+
+MODEL_PREFIX = "model."
+HARDWARE_PREFIX = "hardware."
+PARETO_OBJECTIVES = ("energy_pj_per_token", "latency_ns_per_token", "on_chip_mm2")
+TOP_OBJECTIVES = tuple(Metrics.model_fields)
+
+
+def parse_sweep_arg(text: str) -> tuple[str, list[Any]]:
+    """Parse `dotted.path=v1,v2,...`; values are YAML scalars (`4`, `0.5`, `reuse`, `true`, `null`)."""
+    path, sep, values = text.partition("=")
+    path = path.strip()
+    if not sep or not path or not values.strip():
+        raise ValueError(f"Invalid --sweep '{text}' (expected dotted.path=v1,v2,...)")
+    return path, [yaml.safe_load(v.strip()) for v in values.split(",")]
+
+
+def split_target(path: str) -> tuple[str, str]:
+    """`("model" | "hardware", dotted path)` for a sweep path; unprefixed paths address the hardware config."""
+    if path.startswith(MODEL_PREFIX):
+        return "model", path[len(MODEL_PREFIX) :]
+    if path.startswith(HARDWARE_PREFIX):
+        return "hardware", path[len(HARDWARE_PREFIX) :]
+    return "hardware", path
+
+
+def set_dotted(raw: dict[str, Any], path: str, value: Any) -> None:
+    """Set `a.b.c` in a raw (YAML-loaded) config dict, creating intermediate mappings as needed."""
+    node: Any = raw
+    parts = path.split(".")
+    for i, part in enumerate(parts):
+        if not isinstance(node, dict):
+            raise ValueError(f"Cannot set '{path}': '{'.'.join(parts[:i])}' is not a mapping")
+        key: Any = part
+        if part.isdigit() and int(part) in node:
+            key = int(part)  # e.g. draft_policy.per_layer.<layer> loaded from YAML with int keys
+        if i == len(parts) - 1:
+            node[key] = value
+        else:
+            node = node.setdefault(key, {})
+
+
+def expand_grid(sweeps: list[tuple[str, list[Any]]]) -> Iterator[dict[str, Any]]:
+    """Cartesian product of the sweep axes, in the order given (last axis varies fastest)."""
+    paths = [path for path, _values in sweeps]
+    if len(set(paths)) != len(paths):
+        raise ValueError(f"Duplicate --sweep paths: {sorted(p for p in set(paths) if paths.count(p) > 1)}")
+    for combo in itertools.product(*(values for _path, values in sweeps)):
+        yield dict(zip(paths, combo))
+
+
+def apply_overrides(
+    model_raw: dict[str, Any],
+    hardware_raw: dict[str, Any],
+    overrides: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    raws = {"model": deepcopy(model_raw), "hardware": deepcopy(hardware_raw)}
+    for path, value in overrides.items():
+        target, dotted = split_target(path)
+        set_dotted(raws[target], dotted, value)
+    return raws["model"], raws["hardware"]
+
+
+# Per-process state of `run_sweep`, installed by `_init_context` in each worker of its `ProcessSweepExecutor`.
+_CONTEXT: dict[str, Any] = {}
+# Whether `evaluate_combination` first screens combinations with the cheap `sampling.precheck` rules.
+_SCREEN = [False]
+
+
+def _init_context(
+    model_raw: dict[str, Any],
+    hardware_raw: dict[str, Any],
+    stats: dict[str, Any],
+    prompt_lengths: list[int],
+    detail: Detail,
+    screen: bool = False,
+    cache: ResultCache | None = None,
+) -> None:
+    _CONTEXT.clear()
+    _CONTEXT.update(
+        model_raw=model_raw,
+        hardware_raw=hardware_raw,
+        stats=SpeculationStats.model_validate(stats),
+        prompt_lengths=prompt_lengths,
+        detail=detail,
+        cache=cache,
+    )
+    _SCREEN[0] = screen
+
+
+def evaluate_overrides(
+    *,
+    model_raw: dict[str, Any],
+    hardware_raw: dict[str, Any],
+    overrides: dict[str, Any],
+    stats: SpeculationStats,
+    prompt_lengths: list[int],
+    detail: Detail,
+    cache: ResultCache | None = None,
+) -> Report:
+    model_raw, hardware_raw = apply_overrides(model_raw, hardware_raw, overrides)
+    model = ModelConfig.model_validate(model_raw)
+    hardware = HardwareConfig.model_validate(hardware_raw)
+    return Estimator(model, hardware).evaluate_many(prompt_lengths, stats, detail=detail, cache=cache)
+
+
+def _report_row(index: int, overrides: dict[str, Any], report: Report) -> dict[str, Any]:
+    payload = report.model_dump(mode="json")
+    payload.pop("generated_at")
+    return {"index": index, "overrides": overrides, "report": payload}
+
+
+def evaluate_combination(task: tuple[int, dict[str, Any]]) -> dict[str, Any]:
+    """One result row: the report for one knob combination, or the validation/evaluation error."""
+    index, overrides = task
+    if _SCREEN[0]:
+        _model_raw, hardware_raw = apply_overrides({}, _CONTEXT["hardware_raw"], overrides)
+        reason = precheck(hardware_raw, _CONTEXT["stats"].k, _CONTEXT["prompt_lengths"])
+        if reason is not None:
+            return {"index": index, "overrides": overrides, "error": reason, "rejected": True}
+    try:
+        report = evaluate_overrides(overrides=overrides, **_CONTEXT)
+    except ValueError as exc:  # includes pydantic ValidationError
+        return {"index": index, "overrides": overrides, "error": str(exc)}
+    return _report_row(index, overrides, report)
+
+
+def run_sweep(
+    *,
+    model_raw: dict[str, Any],
+    hardware_raw: dict[str, Any],
+    stats: SpeculationStats,
+    prompt_lengths: list[int],
+    sweeps: list[tuple[str, list[Any]]],
+    detail: Detail = "full",
+    jobs: int = 1,
+    samples: Iterable[dict[str, Any]] | None = None,
+    cache: ResultCache | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Evaluate every knob combination and yield one row per combination, in grid order.
+
+    With `samples` (override dicts, e.g. from `sampling.sample_overrides`) those are evaluated instead of the grid, in
+    the order given, and each is first screened by `sampling.precheck`: combinations failing its cheap rules are not
+    validated or evaluated and yield an error row marked `"rejected": true`. With a `cache`, every worker reuses and
+    stores points through its own connection to the same `cache.ResultCache` directory.
+
+    Combinations are consumed lazily, also with `jobs > 1` (on a `parallel.ProcessSweepExecutor`, with at most
+    `4 * jobs` chunks of 4 in flight), so rows can be streamed and reduced for grids or sample streams of any size.
+    """
+    if samples is not None and sweeps:
+        raise ValueError("pass either sweeps or samples, not both")
+    context = (model_raw, hardware_raw, stats.model_dump(), list(prompt_lengths), detail, samples is not None, cache)
+    tasks = enumerate(expand_grid(sweeps) if samples is None else samples)
+    # Each combination validates and compiles its own configs, so small chunks already amortize the task overhead.
+    with ProcessSweepExecutor(jobs, min_chunk=4) as executor:
+        yield from executor.imap(evaluate_combination, tasks, initializer=_init_context, initargs=context)
+
+
+def pareto_front_rows(rows: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Reduce sweep rows to the per-`l_prompt` Pareto fronts over `PARETO_OBJECTIVES` (all minimized).
+
+    Fronts are maintained incrementally while `rows` is consumed, so only front members (knob overrides and metrics,
+    not full reports) are kept; fed by `run_sweep`, at most its bounded window of in-flight rows (`jobs > 1`) is held
+    besides. Error rows are skipped.
+    """
+    fronts: dict[int, ParetoFront[dict[str, Any]]] = {}
+    for row in rows:
+        report = row.get("report")
+        if report is None:
+            continue
+        on_chip_mm2 = report["area_breakdown_mm2"]["on_chip_mm2"]
+        for point in report["points"]:
+            metrics = point["speculative"]
+            objectives = (metrics["energy_pj_per_token"], metrics["latency_ns_per_token"], on_chip_mm2)
+            member = {"index": row["index"], "overrides": row["overrides"], "speculative": metrics}
+            fronts.setdefault(point["l_prompt"], ParetoFront()).add(objectives, member)
+
+    for l_prompt in sorted(fronts):
+        for objectives, member in fronts[l_prompt]:
+            yield {"l_prompt": l_prompt, "objectives": dict(zip(PARETO_OBJECTIVES, objectives)), **member}
+
+
+def top_n(rows: Iterator[dict[str, Any]], n: int, objective: str) -> list[dict[str, Any]]:
+    """Best `n` (combination, `l_prompt`) candidates by a speculative `Metrics` field, best first.
+
+    Keeps a bounded heap while `rows` is consumed, so memory is O(n) regardless of sweep size (plus, fed by
+    `run_sweep` with `jobs > 1`, its bounded window of in-flight rows). Ties keep the earlier candidate.
+    """
+    if n < 1:
+        raise ValueError(f"top N must be >= 1 (got {n})")
+    if objective not in TOP_OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}'. Available: {', '.join(TOP_OBJECTIVES)}")
+    sign = 1.0 if objective in MAXIMIZED_METRICS else -1.0
+    heap: list[tuple[float, int, dict[str, Any]]] = []  # min-heap on (score, -seq): the root is the current worst
+    seq = 0
+    for row in rows:
+        report = row.get("report")
+        if report is None:
+            continue
+        for point in report["points"]:
+            value = point["speculative"][objective]
+            candidate = {
+                "index": row["index"],
+                "overrides": row["overrides"],
+                "l_prompt": point["l_prompt"],
+                "value": value,
+            }
+            entry = (sign * value, -seq, candidate)
+            seq += 1
+            if len(heap) < n:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+    return [candidate for *_key, candidate in sorted(heap, key=lambda e: e[:2], reverse=True)]
+
+
+def run_top(
+    *,
+    model_raw: dict[str, Any],
+    hardware_raw: dict[str, Any],
+    stats: SpeculationStats,
+    prompt_lengths: list[int],
+    sweeps: list[tuple[str, list[Any]]],
+    n: int,
+    objective: str,
+    jobs: int = 1,
+    samples: Iterable[dict[str, Any]] | None = None,
+    cache: ResultCache | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Rank the sweep in metrics-only detail, then recompute full breakdowns for the `n` winners only.
+
+    Yields one row per winner, best first: the usual sweep row (`index`, `overrides`, single-point `report`) plus
+    `rank`, `l_prompt` and `objective`. The ranking streams the sweep through `top_n`, so memory stays O(n) plus the
+    sweep's bounded in-flight window for any `jobs`.
+    """
+    rows = run_sweep(
+        model_raw=model_raw,
+        hardware_raw=hardware_raw,
+        stats=stats,
+        prompt_lengths=prompt_lengths,
+        sweeps=sweeps,
+        detail="metrics",
+        jobs=jobs,
+        samples=samples,
+        cache=cache,
+    )
+    for rank, winner in enumerate(top_n(rows, n, objective), start=1):
+        report = evaluate_overrides(
+            model_raw=model_raw,
+            hardware_raw=hardware_raw,
+            overrides=winner["overrides"],
+            stats=stats,
+            prompt_lengths=[winner["l_prompt"]],
+            detail="full",
+            cache=cache,
+        )
+        row = _report_row(winner["index"], winner["overrides"], report)
+        yield {"rank": rank, "l_prompt": winner["l_prompt"], "objective": {objective: winner["value"]}, **row}
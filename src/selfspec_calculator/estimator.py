@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import json
+from copy import deepcopy
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from math import ceil
-from typing import Any
+from functools import cached_property
+from math import ceil, ulp
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Literal, Mapping, Sequence, overload
 
+from .cache import LruCache, ResultCache, result_key
+from .checkpoint import SweepJournal, sweep_fingerprint
 from .config import (
+    BlockDraftPolicy,
     HardwareConfig,
     HardwareMode,
     InputPaths,
     ModelConfig,
+    PerOpOverheadSpec,
     PrecisionMode,
     ReusePolicy,
     ResolvedKnobSpecs,
@@ -19,6 +27,8 @@ from .report import (
     AreaBreakdownMm2,
     AreaComponentsMm2,
     BaselineDelta,
+    BatchReport,
+    BreakEven,
     Breakdown,
     ComponentBreakdown,
     MemoryTraffic,
@@ -26,13 +36,92 @@ from .report import (
     PhaseBreakdown,
     Report,
     StageBreakdown,
+    StatsPoint,
     SweepPoint,
 )
 from .stats import SpeculationStats, expected_committed_tokens_per_burst
 
+if TYPE_CHECKING:
+    from .parallel import ProcessSweepExecutor
+
 
 ANALOG_STAGES = ("qkv", "wo", "ffn")
 DIGITAL_STAGES = ("qk", "pv", "softmax", "elementwise", "kv_cache")
+# Every `StageBreakdown` stage, in the order `Breakdown.from_stage_breakdown` sums them.
+STAGES = ANALOG_STAGES + DIGITAL_STAGES + ("buffers_add", "control")
+# Roadmap §5.3.2 break-even: attention-related stages vs. the analog linear stages (`ANALOG_STAGES`).
+ATTENTION_STAGES = ("qk", "pv", "softmax", "kv_cache")
+BREAK_EVEN_TOLERANCE_TOKENS = 1e-6
+_BREAK_EVEN_MAX_L_PROMPT = float(2**40)
+
+# `full` builds per-phase stage/component/activation/memory breakdowns; `metrics` returns only the scalar metrics.
+Detail = Literal["full", "metrics"]
+DETAIL_LEVELS: tuple[Detail, ...] = ("full", "metrics")
+
+# Non-speculative (K=0) results keyed by (model fingerprint, hardware fingerprint, l_prompt); the baseline does not
+# depend on the acceptance histogram, so sweeps of many stats files against one configuration share these entries.
+# Hits return the cached models themselves (copying a full breakdown costs about as much as recomputing it), so points
+# and reports are read-only: derive new values with `model_copy(update=...)` as the report helpers do.
+BASELINE_CACHE: LruCache[tuple[Metrics, PhaseBreakdown]] = LruCache(maxsize=4096)
+
+# Partial results shared across `Estimator`s, each keyed by only the config subset it reads (see the `_*_key` helpers):
+# a DSE grid that varies e.g. `memory.hbm.read_bandwidth_GBps` or `soc.schedule` reuses the compiled per-token step
+# costs, KV traffic and area, and only re-does the per-point memory/schedule arithmetic.
+STEP_COSTS_CACHE: LruCache[CompiledStepCosts] = LruCache(maxsize=256)
+STEP_TOTALS_CACHE: LruCache[AffineFields] = LruCache(maxsize=256)
+KV_TRAFFIC_CACHE: LruCache[dict[str, AffineFields]] = LruCache(maxsize=1024)
+AREA_CACHE: LruCache[tuple[StageBreakdown, AreaBreakdownMm2]] = LruCache(maxsize=256)
+
+
+def clear_caches() -> None:
+    for cache in (BASELINE_CACHE, STEP_COSTS_CACHE, STEP_TOTALS_CACHE, KV_TRAFFIC_CACHE, AREA_CACHE):
+        cache.clear()
+
+
+def _json_key(payload: Any) -> str:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+
+def _step_costs_key(model: ModelConfig, hardware: HardwareConfig) -> str:
+    # Analog, buffer/control and digital per-token terms are built in one layer traversal, so they share one key:
+    # everything except `soc.schedule` and the memory technologies (only whether `memory.*` models the KV cache).
+    return _json_key(
+        {
+            "model": model.model_dump(mode="json"),
+            "reuse_policy": hardware.reuse_policy.value,
+            "library": hardware.selected_library if hardware.mode == HardwareMode.knob_based else None,
+            "analog": None if hardware.analog is None else hardware.analog.model_dump(mode="json"),
+            "costs": None if hardware.costs is None else hardware.costs.model_dump(mode="json"),
+            "soc": hardware.soc.model_dump(mode="json", exclude={"schedule"}),
+            "memory": hardware.memory is not None,
+        }
+    )
+
+
+def _kv_traffic_key(model: ModelConfig, hardware: HardwareConfig, stats: SpeculationStats) -> str:
+    assert hardware.memory is not None
+    return _json_key(
+        {
+            "model": [model.n_layers, model.d_model, model.n_heads],
+            "kv_cache": hardware.memory.kv_cache.model_dump(mode="json"),
+            "k": stats.k,
+            "histogram": sorted(stats.histogram.items()),
+        }
+    )
+
+
+def _area_key(model: ModelConfig, hardware: HardwareConfig) -> str:
+    return _json_key(
+        {
+            "model": model.model_dump(mode="json", exclude={"draft_policy", "activation_bits"}),
+            "library": hardware.selected_library if hardware.mode == HardwareMode.knob_based else None,
+            "analog": None if hardware.analog is None else hardware.analog.model_dump(mode="json"),
+            "costs": None if hardware.costs is None else hardware.costs.model_dump(mode="json"),
+            "memory_area_mm2": None
+            if hardware.memory is None
+            else [getattr(hardware.memory, tech).area_mm2 for tech in ("sram", "hbm", "fabric")],
+        }
+    )
 
 
 def _kv_bytes_per_token_per_layer(*, d_model: int, n_heads: int, fmt) -> int:  # noqa: ANN001
@@ -41,19 +130,18 @@ def _kv_bytes_per_token_per_layer(*, d_model: int, n_heads: int, fmt) -> int:  #
     return payload_bytes + metadata_bytes
 
 
-def _mem_energy_latency(*, tech, read_bytes: float, write_bytes: float) -> tuple[float, float]:  # noqa: ANN001
-    energy = read_bytes * tech.read_energy_pj_per_byte + write_bytes * tech.write_energy_pj_per_byte
+def memory_energy_latency(*, tech, read_bytes: Any, write_bytes: Any) -> tuple[Any, Any]:  # noqa: ANN001
+    """Energy and latency of one memory technology's traffic, for float or NumPy-array byte counts.
 
-    latency = 0.0
-    if read_bytes > 0:
-        if tech.read_bandwidth_GBps > 0:
-            latency += read_bytes / tech.read_bandwidth_GBps
-        latency += tech.read_latency_ns
-    if write_bytes > 0:
-        if tech.write_bandwidth_GBps > 0:
-            latency += write_bytes / tech.write_bandwidth_GBps
-        latency += tech.write_latency_ns
+    Bandwidth latency applies only if the bandwidth is set (> 0), the fixed per-access latency only where bytes move.
+    Masks are multiplied in (not branched on) so arrays work; for floats the additions keep the scalar order.
+    """
+    energy = read_bytes * tech.read_energy_pj_per_byte + write_bytes * tech.write_energy_pj_per_byte
 
+    read_transfer = read_bytes / tech.read_bandwidth_GBps if tech.read_bandwidth_GBps > 0 else 0.0
+    write_transfer = write_bytes / tech.write_bandwidth_GBps if tech.write_bandwidth_GBps > 0 else 0.0
+    reads, writes = read_bytes > 0, write_bytes > 0
+    latency = reads * (read_transfer + tech.read_latency_ns) + writes * write_transfer + writes * tech.write_latency_ns
     return energy, latency
 
 
@@ -145,13 +233,13 @@ def _add_memory_traffic_costs(
     if hardware.memory is None:
         return breakdown
 
-    sram_e, sram_t = _mem_energy_latency(
+    sram_e, sram_t = memory_energy_latency(
         tech=hardware.memory.sram, read_bytes=traffic.sram_read_bytes, write_bytes=traffic.sram_write_bytes
     )
-    hbm_e, hbm_t = _mem_energy_latency(
+    hbm_e, hbm_t = memory_energy_latency(
         tech=hardware.memory.hbm, read_bytes=traffic.hbm_read_bytes, write_bytes=traffic.hbm_write_bytes
     )
-    fabric_e, fabric_t = _mem_energy_latency(
+    fabric_e, fabric_t = memory_energy_latency(
         tech=hardware.memory.fabric,
         read_bytes=traffic.fabric_read_bytes,
         write_bytes=traffic.fabric_write_bytes,
@@ -219,6 +307,26 @@ def _weights_per_layer(model: ModelConfig) -> dict[str, int]:
     return {"qkv": qkv_weights, "wo": wo_weights, "ffn": ffn_weights}
 
 
+def _layer_policy_groups(model: ModelConfig) -> list[tuple[BlockDraftPolicy, int]]:
+    """Layers grouped by identical draft policy, as `(policy, num_layers)` in first-seen order.
+
+    Layer costs depend on the layer index only through its policy, so callers evaluate each group once and scale by
+    its multiplicity. Runs in O(len(per_layer)), not O(n_layers).
+    """
+    policy = model.draft_policy
+    groups: dict[tuple[PrecisionMode, PrecisionMode, PrecisionMode], list[Any]] = {}
+    num_default = model.n_layers - len(policy.per_layer)
+    if num_default > 0:
+        groups[(policy.default.qkv, policy.default.wo, policy.default.ffn)] = [policy.default, num_default]
+    for layer_policy in policy.per_layer.values():
+        key = (layer_policy.qkv, layer_policy.wo, layer_policy.ffn)
+        if key in groups:
+            groups[key][1] += 1
+        else:
+            groups[key] = [layer_policy, 1]
+    return [(group_policy, count) for group_policy, count in groups.values()]
+
+
 def _analog_cost_for_block(hardware: HardwareConfig, precision: PrecisionMode) -> tuple[float, float]:
     assert hardware.costs is not None
     if precision == PrecisionMode.full:
@@ -387,133 +495,6 @@ def _area_breakdown_mm2(model: ModelConfig, hardware: HardwareConfig) -> AreaBre
     )
 
 
-def _token_step_costs_legacy(model: ModelConfig, hardware: HardwareConfig, l_prompt: int) -> tuple[Breakdown, Breakdown]:
-    macs = _mac_counts_per_token(model, l_prompt)
-    digital_costs = _digital_costs_legacy(hardware)
-    digital_stages = DIGITAL_STAGES if hardware.memory is None else tuple(s for s in DIGITAL_STAGES if s != "kv_cache")
-    analog_outputs = {s: sum(m_out for m_out, _n_in in shapes) for s, shapes in _analog_stage_shapes(model).items()}
-    buf_knobs = hardware.soc.buffers_add
-
-    def stage_energy_latency(stage: str, energy_per_mac: float, latency_per_mac: float) -> tuple[float, float]:
-        m = macs[stage]
-        return (m * energy_per_mac, m * latency_per_mac)
-
-    draft_stage = StageBreakdown()
-    verify_full_stage = StageBreakdown()
-
-    for layer in range(model.n_layers):
-        policy = model.draft_policy.for_layer(layer)
-        for block, precision in {"qkv": policy.qkv, "wo": policy.wo, "ffn": policy.ffn}.items():
-            e_per, t_per = _analog_cost_for_block(hardware, precision)
-            e, t = stage_energy_latency(block, e_per, t_per)
-            draft_stage = draft_stage.add_energy_latency(block, e, t)
-
-            assert hardware.costs is not None
-            e_full, t_full = stage_energy_latency(
-                block,
-                hardware.costs.analog_full.energy_pj_per_mac,
-                hardware.costs.analog_full.latency_ns_per_mac,
-            )
-            verify_full_stage = verify_full_stage.add_energy_latency(block, e_full, t_full)
-
-            outputs = float(analog_outputs[block])
-            if hardware.reuse_policy == ReusePolicy.reuse:
-                draft_stage = draft_stage.add_energy_latency(
-                    "buffers_add",
-                    outputs * buf_knobs.energy_pj_per_op,
-                    outputs * buf_knobs.latency_ns_per_op,
-                )
-            if precision == PrecisionMode.full:
-                draft_stage = draft_stage.add_energy_latency(
-                    "buffers_add",
-                    outputs * buf_knobs.energy_pj_per_op,
-                    outputs * buf_knobs.latency_ns_per_op,
-                )
-            verify_full_stage = verify_full_stage.add_energy_latency(
-                "buffers_add",
-                outputs * buf_knobs.energy_pj_per_op,
-                outputs * buf_knobs.latency_ns_per_op,
-            )
-
-        for stage in digital_stages:
-            e_per, t_per = digital_costs[stage]
-            e, t = stage_energy_latency(stage, e_per, t_per)
-            draft_stage = draft_stage.add_energy_latency(stage, e, t)
-            verify_full_stage = verify_full_stage.add_energy_latency(stage, e, t)
-
-    ctrl_e_tok = model.n_layers * hardware.soc.control.energy_pj_per_token
-    ctrl_t_tok = model.n_layers * hardware.soc.control.latency_ns_per_token
-    draft_stage = draft_stage.add_energy_latency("control", ctrl_e_tok, ctrl_t_tok)
-    verify_full_stage = verify_full_stage.add_energy_latency("control", ctrl_e_tok, ctrl_t_tok)
-
-    ctrl_e_burst = model.n_layers * hardware.soc.control.energy_pj_per_burst
-    ctrl_t_burst = model.n_layers * hardware.soc.control.latency_ns_per_burst
-    setup_e_burst = model.n_layers * hardware.soc.verify_setup.energy_pj_per_burst
-    setup_t_burst = model.n_layers * hardware.soc.verify_setup.latency_ns_per_burst
-    verify_full_stage = verify_full_stage.add_energy_latency(
-        "control",
-        ctrl_e_burst + setup_e_burst,
-        ctrl_t_burst + setup_t_burst,
-    )
-
-    return (
-        Breakdown.from_stage_breakdown(draft_stage, components=_legacy_components_from_stages(draft_stage)),
-        Breakdown.from_stage_breakdown(
-            verify_full_stage,
-            components=_legacy_components_from_stages(verify_full_stage),
-        ),
-    )
-
-
-def _verify_drafted_token_additional_stage_legacy(
-    model: ModelConfig, hardware: HardwareConfig, l_prompt: int
-) -> Breakdown:
-    macs = _mac_counts_per_token(model, l_prompt)
-    digital_costs = _digital_costs_legacy(hardware)
-    digital_stages = DIGITAL_STAGES if hardware.memory is None else tuple(s for s in DIGITAL_STAGES if s != "kv_cache")
-    analog_outputs = {s: sum(m_out for m_out, _n_in in shapes) for s, shapes in _analog_stage_shapes(model).items()}
-    buf_knobs = hardware.soc.buffers_add
-
-    additional = StageBreakdown()
-
-    for layer in range(model.n_layers):
-        policy = model.draft_policy.for_layer(layer)
-        for block, executed_precision in {"qkv": policy.qkv, "wo": policy.wo, "ffn": policy.ffn}.items():
-            e_per, t_per = _verify_additional_cost_for_block(hardware, executed_precision, token_kind="drafted")
-            additional = additional.add_energy_latency(block, macs[block] * e_per, macs[block] * t_per)
-
-            outputs = float(analog_outputs[block])
-            if hardware.reuse_policy == ReusePolicy.reread:
-                additional = additional.add_energy_latency(
-                    "buffers_add",
-                    outputs * buf_knobs.energy_pj_per_op,
-                    outputs * buf_knobs.latency_ns_per_op,
-                )
-            else:
-                if executed_precision == PrecisionMode.full:
-                    additional = additional.add_energy_latency(
-                        "buffers_add",
-                        outputs * buf_knobs.energy_pj_per_op,
-                        outputs * buf_knobs.latency_ns_per_op,
-                    )
-                else:
-                    additional = additional.add_energy_latency(
-                        "buffers_add",
-                        2.0 * outputs * buf_knobs.energy_pj_per_op,
-                        2.0 * outputs * buf_knobs.latency_ns_per_op,
-                    )
-
-        for stage in digital_stages:
-            e_per, t_per = digital_costs[stage]
-            additional = additional.add_energy_latency(stage, macs[stage] * e_per, macs[stage] * t_per)
-
-    ctrl_e_tok = model.n_layers * hardware.soc.control.energy_pj_per_token
-    ctrl_t_tok = model.n_layers * hardware.soc.control.latency_ns_per_token
-    additional = additional.add_energy_latency("control", ctrl_e_tok, ctrl_t_tok)
-
-    return Breakdown.from_stage_breakdown(additional, components=_legacy_components_from_stages(additional))
-
-
 def _analog_stage_shapes(model: ModelConfig) -> dict[str, list[tuple[int, int]]]:
     d_model = model.d_model
     d_ff = model.effective_d_ff
@@ -568,17 +549,45 @@ def _analog_mode(
     raise ValueError(f"Unsupported analog mode: {mode_name}")
 
 
+_STAGE_NAMES = tuple(f[: -len("_energy_pj")] for f in StageBreakdown.model_fields if f.endswith("_energy_pj"))
+_COMPONENT_NAMES = tuple(f[: -len("_energy_pj")] for f in ComponentBreakdown.model_fields if f.endswith("_energy_pj"))
+_STAGE_INDEX = {name: i for i, name in enumerate(_STAGE_NAMES)}
+_COMPONENT_INDEX = {name: i for i, name in enumerate(_COMPONENT_NAMES)}
+
+
 class _TokenAccumulator:
+    """Mutable fixed-index accumulator; builds the pydantic `Breakdown` only once, in `to_breakdown()`."""
+
+    __slots__ = (
+        "stage_energy",
+        "stage_latency",
+        "component_energy",
+        "component_latency",
+        "array_activations",
+        "dac_conversions",
+        "adc_draft_conversions",
+        "adc_residual_conversions",
+    )
+
     def __init__(self) -> None:
-        self.stages = StageBreakdown()
-        self.components = ComponentBreakdown()
-        self.activation_counts = AnalogActivationCounts()
+        self.stage_energy = [0.0] * len(_STAGE_NAMES)
+        self.stage_latency = [0.0] * len(_STAGE_NAMES)
+        self.component_energy = [0.0] * len(_COMPONENT_NAMES)
+        self.component_latency = [0.0] * len(_COMPONENT_NAMES)
+        self.array_activations = 0.0
+        self.dac_conversions = 0.0
+        self.adc_draft_conversions = 0.0
+        self.adc_residual_conversions = 0.0
 
     def add_stage(self, stage: str, energy_pj: float, latency_ns: float) -> None:
-        self.stages = self.stages.add_energy_latency(stage, energy_pj, latency_ns)
+        i = _STAGE_INDEX[stage]
+        self.stage_energy[i] += energy_pj
+        self.stage_latency[i] += latency_ns
 
     def add_component(self, component: str, energy_pj: float, latency_ns: float) -> None:
-        self.components = self.components.add_energy_latency(component, energy_pj, latency_ns)
+        i = _COMPONENT_INDEX[component]
+        self.component_energy[i] += energy_pj
+        self.component_latency[i] += latency_ns
 
     def add_analog_counts(
         self,
@@ -588,20 +597,51 @@ class _TokenAccumulator:
         adc_draft_conversions: float,
         adc_residual_conversions: float,
     ) -> None:
-        self.activation_counts = self.activation_counts.plus(
-            AnalogActivationCounts(
-                array_activations=array_activations,
-                dac_conversions=dac_conversions,
-                adc_draft_conversions=adc_draft_conversions,
-                adc_residual_conversions=adc_residual_conversions,
-            )
+        self.array_activations += array_activations
+        self.dac_conversions += dac_conversions
+        self.adc_draft_conversions += adc_draft_conversions
+        self.adc_residual_conversions += adc_residual_conversions
+
+    def add_scaled(self, other: "_TokenAccumulator", factor: float) -> None:
+        for mine, theirs in (
+            (self.stage_energy, other.stage_energy),
+            (self.stage_latency, other.stage_latency),
+            (self.component_energy, other.component_energy),
+            (self.component_latency, other.component_latency),
+        ):
+            for i, value in enumerate(theirs):
+                if value:
+                    mine[i] += value * factor
+        self.array_activations += other.array_activations * factor
+        self.dac_conversions += other.dac_conversions * factor
+        self.adc_draft_conversions += other.adc_draft_conversions * factor
+        self.adc_residual_conversions += other.adc_residual_conversions * factor
+
+    def latency_ns(self) -> float:
+        return sum(self.stage_latency)
+
+    def to_stage_breakdown(self) -> StageBreakdown:
+        return StageBreakdown.model_construct(
+            **{f"{name}_energy_pj": e for name, e in zip(_STAGE_NAMES, self.stage_energy)},
+            **{f"{name}_latency_ns": t for name, t in zip(_STAGE_NAMES, self.stage_latency)},
         )
 
     def to_breakdown(self) -> Breakdown:
+        stages = self.to_stage_breakdown()
+        components = ComponentBreakdown.model_construct(
+            **{f"{name}_energy_pj": e for name, e in zip(_COMPONENT_NAMES, self.component_energy)},
+            **{f"{name}_latency_ns": t for name, t in zip(_COMPONENT_NAMES, self.component_latency)},
+        )
+        activation_counts = AnalogActivationCounts.model_construct(
+            array_activations=self.array_activations,
+            dac_conversions=self.dac_conversions,
+            adc_draft_conversions=self.adc_draft_conversions,
+            adc_residual_conversions=self.adc_residual_conversions,
+        )
         return Breakdown.from_stage_breakdown(
-            self.stages,
-            components=self.components,
-            activation_counts=self.activation_counts,
+            stages,
+            components=components,
+            activation_counts=activation_counts,
         )
 
 
@@ -702,454 +742,339 @@ def _add_knob_digital_stage(
         acc.add_component("kv_cache", energy, latency)
 
 
-def _token_step_costs_knob(
-    model: ModelConfig,
-    hardware: HardwareConfig,
-    specs: ResolvedKnobSpecs,
-    l_prompt: int,
-) -> tuple[Breakdown, Breakdown]:
-    assert hardware.analog is not None
-    macs = _mac_counts_per_token(model, l_prompt)
-    digital_costs = _digital_costs_knob(specs)
-    digital_stages = DIGITAL_STAGES if hardware.memory is None else tuple(s for s in DIGITAL_STAGES if s != "kv_cache")
-    num_tiles = _tile_counts(model, hardware.analog.xbar_size)
-    num_slices = ceil(model.activation_bits / hardware.analog.dac_bits)
-    buf_knobs = hardware.soc.buffers_add
+@dataclass(frozen=True)
+class _TokenStepCosts:
+    """Per-token step costs at one prompt length (independent of the acceptance histogram)."""
 
-    def add_buffers_add(acc: _TokenAccumulator, ops: float) -> None:
-        if ops <= 0.0:
-            return
-        energy = ops * buf_knobs.energy_pj_per_op
-        latency = ops * buf_knobs.latency_ns_per_op
-        acc.add_stage("buffers_add", energy, latency)
-        acc.add_component("buffers_add", energy, latency)
+    draft: Breakdown
+    verify_full: Breakdown
+    verify_drafted_additional: Breakdown
+    max_layer_latencies_ns: tuple[float, float, float]
 
-    draft = _TokenAccumulator()
-    verify_full = _TokenAccumulator()
 
-    for layer in range(model.n_layers):
-        policy = model.draft_policy.for_layer(layer)
-        for stage, precision in {"qkv": policy.qkv, "wo": policy.wo, "ffn": policy.ffn}.items():
-            _add_knob_analog_stage(
-                acc=draft,
-                stage=stage,
-                num_tiles=num_tiles[stage],
-                num_slices=num_slices,
-                xbar_size=hardware.analog.xbar_size,
-                adc_steps=hardware.analog.num_columns_per_adc,
-                specs=specs,
-                periphery=hardware.analog.periphery,
-                mode_name="draft_full" if precision == PrecisionMode.full else "draft_default",
-            )
-            _add_knob_analog_stage(
-                acc=verify_full,
-                stage=stage,
-                num_tiles=num_tiles[stage],
-                num_slices=num_slices,
-                xbar_size=hardware.analog.xbar_size,
-                adc_steps=hardware.analog.num_columns_per_adc,
-                specs=specs,
-                periphery=hardware.analog.periphery,
-                mode_name="verify_bonus",
-            )
+def _add_buffers_add(acc: _TokenAccumulator, buf_knobs: PerOpOverheadSpec, ops: float) -> None:
+    if ops <= 0.0:
+        return
+    energy = ops * buf_knobs.energy_pj_per_op
+    latency = ops * buf_knobs.latency_ns_per_op
+    acc.add_stage("buffers_add", energy, latency)
+    acc.add_component("buffers_add", energy, latency)
 
-            outputs = float(num_tiles[stage] * num_slices * hardware.analog.xbar_size)
-            if hardware.reuse_policy == ReusePolicy.reuse:
-                add_buffers_add(draft, outputs)  # buffer D_reg / full outputs for reuse
-            if precision == PrecisionMode.full:
-                add_buffers_add(draft, outputs)  # ADC-output combine
-            add_buffers_add(verify_full, outputs)  # ADC-output combine (bonus token)
 
-        for stage in digital_stages:
-            e_per, t_per = digital_costs[stage]
-            _add_knob_digital_stage(acc=draft, stage=stage, macs=macs[stage], energy_per_mac=e_per, latency_per_mac=t_per)
-            _add_knob_digital_stage(
-                acc=verify_full,
-                stage=stage,
-                macs=macs[stage],
-                energy_per_mac=e_per,
-                latency_per_mac=t_per,
-            )
+def _add_control(acc: _TokenAccumulator, energy_pj: float, latency_ns: float) -> None:
+    acc.add_stage("control", energy_pj, latency_ns)
+    acc.add_component("control", energy_pj, latency_ns)
 
-    ctrl_e_tok = model.n_layers * hardware.soc.control.energy_pj_per_token
-    ctrl_t_tok = model.n_layers * hardware.soc.control.latency_ns_per_token
-    draft.add_stage("control", ctrl_e_tok, ctrl_t_tok)
-    draft.add_component("control", ctrl_e_tok, ctrl_t_tok)
-    verify_full.add_stage("control", ctrl_e_tok, ctrl_t_tok)
-    verify_full.add_component("control", ctrl_e_tok, ctrl_t_tok)
 
-    ctrl_e_burst = model.n_layers * hardware.soc.control.energy_pj_per_burst
-    ctrl_t_burst = model.n_layers * hardware.soc.control.latency_ns_per_burst
-    verify_full.add_stage("control", ctrl_e_burst, ctrl_t_burst)
-    verify_full.add_component("control", ctrl_e_burst, ctrl_t_burst)
+def _verify_drafted_buffer_ops(reuse_policy: ReusePolicy, executed_precision: PrecisionMode, outputs: float) -> float:
+    if reuse_policy == ReusePolicy.reread:
+        return outputs  # ADC-output combine (re-read full)
+    if executed_precision == PrecisionMode.full:
+        return outputs  # buffer read of stored full outputs
+    return 2.0 * outputs  # buffer read + Final = D_reg + C
 
-    setup_e_burst = model.n_layers * hardware.soc.verify_setup.energy_pj_per_burst
-    setup_t_burst = model.n_layers * hardware.soc.verify_setup.latency_ns_per_burst
-    verify_full.add_stage("control", setup_e_burst, setup_t_burst)
-    verify_full.add_component("control", setup_e_burst, setup_t_burst)
 
-    return draft.to_breakdown(), verify_full.to_breakdown()
+def _add_layer_control(
+    hardware: HardwareConfig,
+    draft: _TokenAccumulator,
+    verify_drafted: _TokenAccumulator,
+    verify_bonus: _TokenAccumulator,
+) -> None:
+    control = hardware.soc.control
+    setup = hardware.soc.verify_setup
+    for acc in (draft, verify_drafted, verify_bonus):
+        _add_control(acc, control.energy_pj_per_token, control.latency_ns_per_token)
+    _add_control(
+        verify_bonus,
+        control.energy_pj_per_burst + setup.energy_pj_per_burst,
+        control.latency_ns_per_burst + setup.latency_ns_per_burst,
+    )
 
 
-def _verify_drafted_token_additional_stage_knob(
+# (draft, verify_drafted, verify_full) per-token accumulators plus the per-layer pipeline maxima.
+_StepAccumulators = tuple[_TokenAccumulator, _TokenAccumulator, _TokenAccumulator, tuple[float, float, float]]
+# One layer's (draft, verify_drafted, verify_full) per-token costs under a given block draft policy.
+_LayerCosts = Callable[[BlockDraftPolicy], tuple[_TokenAccumulator, _TokenAccumulator, _TokenAccumulator]]
+
+
+def _fold_layer_groups(model: ModelConfig, layer_costs: _LayerCosts) -> _StepAccumulators:
+    """Single traversal over the layer-policy groups.
+
+    Each distinct policy's one-layer costs are built once, charged `num_layers` times into the per-token
+    draft / verify-drafted / verify-full (bonus) accumulators, and compared once for the per-layer maxima used by the
+    `layer-pipelined` schedule.
+    """
+    totals = (_TokenAccumulator(), _TokenAccumulator(), _TokenAccumulator())
+    maxima = [0.0, 0.0, 0.0]
+    for policy, num_layers in _layer_policy_groups(model):
+        layer = layer_costs(policy)
+        for i, (total, acc) in enumerate(zip(totals, layer)):
+            total.add_scaled(acc, float(num_layers))
+            maxima[i] = max(maxima[i], acc.latency_ns())
+    return totals[0], totals[1], totals[2], (maxima[0], maxima[1], maxima[2])
+
+
+def _layer_costs_knob(
     model: ModelConfig,
     hardware: HardwareConfig,
     specs: ResolvedKnobSpecs,
     l_prompt: int,
-) -> Breakdown:
+) -> _LayerCosts:
     assert hardware.analog is not None
+    analog = hardware.analog
     macs = _mac_counts_per_token(model, l_prompt)
     digital_costs = _digital_costs_knob(specs)
     digital_stages = DIGITAL_STAGES if hardware.memory is None else tuple(s for s in DIGITAL_STAGES if s != "kv_cache")
-    num_tiles = _tile_counts(model, hardware.analog.xbar_size)
-    num_slices = ceil(model.activation_bits / hardware.analog.dac_bits)
+    num_tiles = _tile_counts(model, analog.xbar_size)
+    num_slices = ceil(model.activation_bits / analog.dac_bits)
     buf_knobs = hardware.soc.buffers_add
 
-    def add_buffers_add(acc: _TokenAccumulator, ops: float) -> None:
-        if ops <= 0.0:
-            return
-        energy = ops * buf_knobs.energy_pj_per_op
-        latency = ops * buf_knobs.latency_ns_per_op
-        acc.add_stage("buffers_add", energy, latency)
-        acc.add_component("buffers_add", energy, latency)
+    def add_analog(acc: _TokenAccumulator, stage: str, mode_name: str) -> None:
+        _add_knob_analog_stage(
+            acc=acc,
+            stage=stage,
+            num_tiles=num_tiles[stage],
+            num_slices=num_slices,
+            xbar_size=analog.xbar_size,
+            adc_steps=analog.num_columns_per_adc,
+            specs=specs,
+            periphery=analog.periphery,
+            mode_name=mode_name,
+        )
 
-    additional = _TokenAccumulator()
+    def layer_costs(policy: BlockDraftPolicy) -> tuple[_TokenAccumulator, _TokenAccumulator, _TokenAccumulator]:
+        draft = _TokenAccumulator()
+        verify_drafted = _TokenAccumulator()
+        verify_bonus = _TokenAccumulator()
 
-    for layer in range(model.n_layers):
-        policy = model.draft_policy.for_layer(layer)
-        for stage, executed_precision in {"qkv": policy.qkv, "wo": policy.wo, "ffn": policy.ffn}.items():
+        for stage, precision in {"qkv": policy.qkv, "wo": policy.wo, "ffn": policy.ffn}.items():
+            add_analog(draft, stage, "draft_full" if precision == PrecisionMode.full else "draft_default")
             if hardware.reuse_policy == ReusePolicy.reread:
-                mode_name = "verify_full"
-            else:
-                if executed_precision == PrecisionMode.full:
-                    mode_name = "none"
-                else:
-                    mode_name = "verify_residual_only"
-
-            _add_knob_analog_stage(
-                acc=additional,
-                stage=stage,
-                num_tiles=num_tiles[stage],
-                num_slices=num_slices,
-                xbar_size=hardware.analog.xbar_size,
-                adc_steps=hardware.analog.num_columns_per_adc,
-                specs=specs,
-                periphery=hardware.analog.periphery,
-                mode_name=mode_name,
-            )
+                add_analog(verify_drafted, stage, "verify_full")
+            elif precision != PrecisionMode.full:
+                add_analog(verify_drafted, stage, "verify_residual_only")
+            add_analog(verify_bonus, stage, "verify_bonus")
 
-            outputs = float(num_tiles[stage] * num_slices * hardware.analog.xbar_size)
-            if hardware.reuse_policy == ReusePolicy.reread:
-                add_buffers_add(additional, outputs)  # ADC-output combine (re-read full)
-            else:
-                if executed_precision == PrecisionMode.full:
-                    add_buffers_add(additional, outputs)  # buffer read of stored full outputs
-                else:
-                    add_buffers_add(additional, 2.0 * outputs)  # buffer read + Final = D_reg + C
+            outputs = float(num_tiles[stage] * num_slices * analog.xbar_size)
+            if hardware.reuse_policy == ReusePolicy.reuse:
+                _add_buffers_add(draft, buf_knobs, outputs)  # buffer D_reg / full outputs for reuse
+            if precision == PrecisionMode.full:
+                _add_buffers_add(draft, buf_knobs, outputs)  # ADC-output combine
+            _add_buffers_add(
+                verify_drafted,
+                buf_knobs,
+                _verify_drafted_buffer_ops(hardware.reuse_policy, precision, outputs),
+            )
+            _add_buffers_add(verify_bonus, buf_knobs, outputs)  # ADC-output combine (bonus token)
 
         for stage in digital_stages:
             e_per, t_per = digital_costs[stage]
-            _add_knob_digital_stage(
-                acc=additional,
-                stage=stage,
-                macs=macs[stage],
-                energy_per_mac=e_per,
-                latency_per_mac=t_per,
-            )
+            for acc in (draft, verify_drafted, verify_bonus):
+                _add_knob_digital_stage(
+                    acc=acc, stage=stage, macs=macs[stage], energy_per_mac=e_per, latency_per_mac=t_per
+                )
 
-    ctrl_e_tok = model.n_layers * hardware.soc.control.energy_pj_per_token
-    ctrl_t_tok = model.n_layers * hardware.soc.control.latency_ns_per_token
-    additional.add_stage("control", ctrl_e_tok, ctrl_t_tok)
-    additional.add_component("control", ctrl_e_tok, ctrl_t_tok)
+        _add_layer_control(hardware, draft, verify_drafted, verify_bonus)
+        return draft, verify_drafted, verify_bonus
 
-    return additional.to_breakdown()
+    return layer_costs
 
 
-def _max_layer_compute_latencies_ns_knob(
-    *,
-    model: ModelConfig,
-    hardware: HardwareConfig,
-    specs: ResolvedKnobSpecs,
-    l_prompt: int,
-) -> tuple[float, float, float]:
-    assert hardware.analog is not None
+def _layer_costs_legacy(model: ModelConfig, hardware: HardwareConfig, l_prompt: int) -> _LayerCosts:
+    assert hardware.costs is not None
+    costs = hardware.costs
     macs = _mac_counts_per_token(model, l_prompt)
-    digital_costs = _digital_costs_knob(specs)
+    digital_costs = _digital_costs_legacy(hardware)
     digital_stages = DIGITAL_STAGES if hardware.memory is None else tuple(s for s in DIGITAL_STAGES if s != "kv_cache")
-    num_tiles = _tile_counts(model, hardware.analog.xbar_size)
-    num_slices = ceil(model.activation_bits / hardware.analog.dac_bits)
+    analog_outputs = {s: sum(m_out for m_out, _n_in in shapes) for s, shapes in _analog_stage_shapes(model).items()}
     buf_knobs = hardware.soc.buffers_add
 
-    def add_buffers_add(acc: _TokenAccumulator, ops: float) -> None:
-        if ops <= 0.0:
-            return
-        energy = ops * buf_knobs.energy_pj_per_op
-        latency = ops * buf_knobs.latency_ns_per_op
-        acc.add_stage("buffers_add", energy, latency)
-        acc.add_component("buffers_add", energy, latency)
-
-    ctrl_e_tok = hardware.soc.control.energy_pj_per_token
-    ctrl_t_tok = hardware.soc.control.latency_ns_per_token
-    ctrl_e_burst = hardware.soc.control.energy_pj_per_burst
-    ctrl_t_burst = hardware.soc.control.latency_ns_per_burst
-    setup_e_burst = hardware.soc.verify_setup.energy_pj_per_burst
-    setup_t_burst = hardware.soc.verify_setup.latency_ns_per_burst
-
-    max_draft = 0.0
-    max_verify_drafted = 0.0
-    max_verify_bonus = 0.0
-
-    for layer in range(model.n_layers):
-        policy = model.draft_policy.for_layer(layer)
+    def add_macs(acc: _TokenAccumulator, stage: str, energy_per_mac: float, latency_per_mac: float) -> None:
+        m = macs[stage]
+        acc.add_stage(stage, m * energy_per_mac, m * latency_per_mac)
 
+    def layer_costs(policy: BlockDraftPolicy) -> tuple[_TokenAccumulator, _TokenAccumulator, _TokenAccumulator]:
         draft = _TokenAccumulator()
         verify_drafted = _TokenAccumulator()
         verify_bonus = _TokenAccumulator()
 
-        for stage, executed_precision in {"qkv": policy.qkv, "wo": policy.wo, "ffn": policy.ffn}.items():
-            _add_knob_analog_stage(
-                acc=draft,
-                stage=stage,
-                num_tiles=num_tiles[stage],
-                num_slices=num_slices,
-                xbar_size=hardware.analog.xbar_size,
-                adc_steps=hardware.analog.num_columns_per_adc,
-                specs=specs,
-                periphery=hardware.analog.periphery,
-                mode_name="draft_full" if executed_precision == PrecisionMode.full else "draft_default",
+        for block, precision in {"qkv": policy.qkv, "wo": policy.wo, "ffn": policy.ffn}.items():
+            add_macs(draft, block, *_analog_cost_for_block(hardware, precision))
+            add_macs(
+                verify_drafted,
+                block,
+                *_verify_additional_cost_for_block(hardware, precision, token_kind="drafted"),
             )
+            add_macs(verify_bonus, block, costs.analog_full.energy_pj_per_mac, costs.analog_full.latency_ns_per_mac)
 
-            if hardware.reuse_policy == ReusePolicy.reread:
-                verify_mode_name = "verify_full"
-            else:
-                if executed_precision == PrecisionMode.full:
-                    verify_mode_name = "none"
-                else:
-                    verify_mode_name = "verify_residual_only"
-            _add_knob_analog_stage(
-                acc=verify_drafted,
-                stage=stage,
-                num_tiles=num_tiles[stage],
-                num_slices=num_slices,
-                xbar_size=hardware.analog.xbar_size,
-                adc_steps=hardware.analog.num_columns_per_adc,
-                specs=specs,
-                periphery=hardware.analog.periphery,
-                mode_name=verify_mode_name,
+            outputs = float(analog_outputs[block])
+            if hardware.reuse_policy == ReusePolicy.reuse:
+                _add_buffers_add(draft, buf_knobs, outputs)
+            if precision == PrecisionMode.full:
+                _add_buffers_add(draft, buf_knobs, outputs)
+            _add_buffers_add(
+                verify_drafted,
+                buf_knobs,
+                _verify_drafted_buffer_ops(hardware.reuse_policy, precision, outputs),
             )
+            _add_buffers_add(verify_bonus, buf_knobs, outputs)
 
-            _add_knob_analog_stage(
-                acc=verify_bonus,
-                stage=stage,
-                num_tiles=num_tiles[stage],
-                num_slices=num_slices,
-                xbar_size=hardware.analog.xbar_size,
-                adc_steps=hardware.analog.num_columns_per_adc,
-                specs=specs,
-                periphery=hardware.analog.periphery,
-                mode_name="verify_bonus",
-            )
+        for stage in digital_stages:
+            for acc in (draft, verify_drafted, verify_bonus):
+                add_macs(acc, stage, *digital_costs[stage])
 
-            outputs = float(num_tiles[stage] * num_slices * hardware.analog.xbar_size)
+        _add_layer_control(hardware, draft, verify_drafted, verify_bonus)
+        return draft, verify_drafted, verify_bonus
 
-            if hardware.reuse_policy == ReusePolicy.reuse:
-                add_buffers_add(draft, outputs)  # buffer D_reg / full outputs for reuse
-            if executed_precision == PrecisionMode.full:
-                add_buffers_add(draft, outputs)  # ADC-output combine
-            add_buffers_add(verify_bonus, outputs)  # ADC-output combine (bonus token)
+    return layer_costs
 
-            if hardware.reuse_policy == ReusePolicy.reread:
-                add_buffers_add(verify_drafted, outputs)  # ADC-output combine (re-read full)
-            else:
-                if executed_precision == PrecisionMode.full:
-                    add_buffers_add(verify_drafted, outputs)  # buffer read of stored full outputs
-                else:
-                    add_buffers_add(verify_drafted, 2.0 * outputs)  # buffer read + Final = D_reg + C
 
-        for stage in digital_stages:
-            e_per, t_per = digital_costs[stage]
-            _add_knob_digital_stage(
-                acc=draft,
-                stage=stage,
-                macs=macs[stage],
-                energy_per_mac=e_per,
-                latency_per_mac=t_per,
-            )
-            _add_knob_digital_stage(
-                acc=verify_drafted,
-                stage=stage,
-                macs=macs[stage],
-                energy_per_mac=e_per,
-                latency_per_mac=t_per,
-            )
-            _add_knob_digital_stage(
-                acc=verify_bonus,
-                stage=stage,
-                macs=macs[stage],
-                energy_per_mac=e_per,
-                latency_per_mac=t_per,
-            )
+def _legacy_breakdown(acc: _TokenAccumulator) -> Breakdown:
+    # Legacy configs have no knob-level component/activation accounting; components are derived from stages.
+    stages = acc.to_stage_breakdown()
+    return Breakdown.from_stage_breakdown(stages, components=_legacy_components_from_stages(stages))
 
-        for acc in (draft, verify_drafted, verify_bonus):
-            acc.add_stage("control", ctrl_e_tok, ctrl_t_tok)
-            acc.add_component("control", ctrl_e_tok, ctrl_t_tok)
 
-        verify_bonus.add_stage("control", ctrl_e_burst + setup_e_burst, ctrl_t_burst + setup_t_burst)
-        verify_bonus.add_component("control", ctrl_e_burst + setup_e_burst, ctrl_t_burst + setup_t_burst)
+def _baseline_stats() -> SpeculationStats:
+    return SpeculationStats(k=0, histogram={0: 1.0})
 
-        max_draft = max(max_draft, draft.to_breakdown().latency_ns)
-        max_verify_drafted = max(max_verify_drafted, verify_drafted.to_breakdown().latency_ns)
-        max_verify_bonus = max(max_verify_bonus, verify_bonus.to_breakdown().latency_ns)
 
-    return max_draft, max_verify_drafted, max_verify_bonus
+def _check_context_capacity(hardware: HardwareConfig, stats: SpeculationStats, l_prompt: int) -> None:
+    if hardware.memory is None:
+        return
+    max_context_tokens = hardware.memory.kv_cache.max_context_tokens
+    if max_context_tokens is not None and l_prompt + stats.k > max_context_tokens:
+        raise ValueError(
+            "Max context capacity exceeded: "
+            f"L_prompt ({l_prompt}) + K ({stats.k}) = {l_prompt + stats.k} > "
+            f"memory.kv_cache.max_context_tokens ({max_context_tokens})"
+        )
 
 
-def _max_layer_compute_latencies_ns_legacy(
-    *,
-    model: ModelConfig,
-    hardware: HardwareConfig,
-    l_prompt: int,
-) -> tuple[float, float, float]:
-    macs = _mac_counts_per_token(model, l_prompt)
-    digital_costs = _digital_costs_legacy(hardware)
-    digital_stages = DIGITAL_STAGES if hardware.memory is None else tuple(s for s in DIGITAL_STAGES if s != "kv_cache")
-    analog_outputs = {s: sum(m_out for m_out, _n_in in shapes) for s, shapes in _analog_stage_shapes(model).items()}
-    buf_knobs = hardware.soc.buffers_add
+def _layer_costs(model: ModelConfig, hardware: HardwareConfig, l_prompt: int) -> _LayerCosts:
+    if hardware.mode == HardwareMode.legacy:
+        return _layer_costs_legacy(model, hardware, l_prompt)
+    return _layer_costs_knob(model, hardware, hardware.resolve_knob_specs(), l_prompt)
 
-    def stage_energy_latency(stage: str, energy_per_mac: float, latency_per_mac: float) -> tuple[float, float]:
-        m = macs[stage]
-        return (m * energy_per_mac, m * latency_per_mac)
 
-    ctrl_e_tok = hardware.soc.control.energy_pj_per_token
-    ctrl_t_tok = hardware.soc.control.latency_ns_per_token
-    ctrl_e_burst = hardware.soc.control.energy_pj_per_burst
-    ctrl_t_burst = hardware.soc.control.latency_ns_per_burst
-    setup_e_burst = hardware.soc.verify_setup.energy_pj_per_burst
-    setup_t_burst = hardware.soc.verify_setup.latency_ns_per_burst
+def _step_accumulators(model: ModelConfig, hardware: HardwareConfig, l_prompt: int) -> _StepAccumulators:
+    return _fold_layer_groups(model, _layer_costs(model, hardware, l_prompt))
 
-    max_draft = 0.0
-    max_verify_drafted = 0.0
-    max_verify_bonus = 0.0
 
-    for layer in range(model.n_layers):
-        policy = model.draft_policy.for_layer(layer)
+def _token_step_costs(model: ModelConfig, hardware: HardwareConfig, l_prompt: int) -> _TokenStepCosts:
+    draft, verify_drafted, verify_full, maxima = _step_accumulators(model, hardware, l_prompt)
+    to_breakdown = _legacy_breakdown if hardware.mode == HardwareMode.legacy else _TokenAccumulator.to_breakdown
+    return _TokenStepCosts(
+        draft=to_breakdown(draft),
+        verify_full=to_breakdown(verify_full),
+        verify_drafted_additional=to_breakdown(verify_drafted),
+        max_layer_latencies_ns=maxima,
+    )
 
-        draft = StageBreakdown()
-        verify_drafted = StageBreakdown()
-        verify_bonus = StageBreakdown()
 
-        for block, executed_precision in {"qkv": policy.qkv, "wo": policy.wo, "ffn": policy.ffn}.items():
-            e_per, t_per = _analog_cost_for_block(hardware, executed_precision)
-            e, t = stage_energy_latency(block, e_per, t_per)
-            draft = draft.add_energy_latency(block, e, t)
+def _token_step_totals(model: ModelConfig, hardware: HardwareConfig, l_prompt: int) -> dict[str, float]:
+    """Scalar per-token step totals for `detail="metrics"`: no breakdown models are built."""
+    draft, verify_drafted, verify_full, maxima = _step_accumulators(model, hardware, l_prompt)
+    totals: dict[str, float] = {}
+    for phase, acc, max_layer in (
+        ("draft", draft, maxima[0]),
+        ("verify_drafted", verify_drafted, maxima[1]),
+        ("verify_bonus", verify_full, maxima[2]),
+    ):
+        totals[f"{phase}_energy_pj"] = sum(acc.stage_energy)
+        totals[f"{phase}_latency_ns"] = acc.latency_ns()
+        totals[f"{phase}_max_layer_latency_ns"] = max_layer
+    return totals
 
-            assert hardware.costs is not None
-            e_full, t_full = stage_energy_latency(
-                block,
-                hardware.costs.analog_full.energy_pj_per_mac,
-                hardware.costs.analog_full.latency_ns_per_mac,
-            )
-            verify_bonus = verify_bonus.add_energy_latency(block, e_full, t_full)
 
-            e_add, t_add = _verify_additional_cost_for_block(hardware, executed_precision, token_kind="drafted")
-            verify_drafted = verify_drafted.add_energy_latency(block, macs[block] * e_add, macs[block] * t_add)
+@dataclass(frozen=True)
+class AffineFields:
+    """Flat fields modelled exactly as `intercept + slope * l_prompt`.
 
-            outputs = float(analog_outputs[block])
-            if hardware.reuse_policy == ReusePolicy.reuse:
-                draft = draft.add_energy_latency(
-                    "buffers_add",
-                    outputs * buf_knobs.energy_pj_per_op,
-                    outputs * buf_knobs.latency_ns_per_op,
-                )
-            if executed_precision == PrecisionMode.full:
-                draft = draft.add_energy_latency(
-                    "buffers_add",
-                    outputs * buf_knobs.energy_pj_per_op,
-                    outputs * buf_knobs.latency_ns_per_op,
-                )
+    Instances returned by `Estimator` are shared through its caches; treat `intercept` and `slope` as read-only.
+    """
 
-            verify_bonus = verify_bonus.add_energy_latency(
-                "buffers_add",
-                outputs * buf_knobs.energy_pj_per_op,
-                outputs * buf_knobs.latency_ns_per_op,
-            )
+    intercept: dict[str, float]
+    slope: dict[str, float]
 
-            if hardware.reuse_policy == ReusePolicy.reread:
-                verify_drafted = verify_drafted.add_energy_latency(
-                    "buffers_add",
-                    outputs * buf_knobs.energy_pj_per_op,
-                    outputs * buf_knobs.latency_ns_per_op,
-                )
-            else:
-                if executed_precision == PrecisionMode.full:
-                    verify_drafted = verify_drafted.add_energy_latency(
-                        "buffers_add",
-                        outputs * buf_knobs.energy_pj_per_op,
-                        outputs * buf_knobs.latency_ns_per_op,
-                    )
-                else:
-                    verify_drafted = verify_drafted.add_energy_latency(
-                        "buffers_add",
-                        2.0 * outputs * buf_knobs.energy_pj_per_op,
-                        2.0 * outputs * buf_knobs.latency_ns_per_op,
-                    )
+    @classmethod
+    def fit(cls, at_zero: dict[str, float], at_one: dict[str, float]) -> AffineFields:
+        return cls(intercept=at_zero, slope={key: at_one[key] - value for key, value in at_zero.items()})
 
-        for stage in digital_stages:
-            e_per, t_per = digital_costs[stage]
-            e, t = stage_energy_latency(stage, e_per, t_per)
-            draft = draft.add_energy_latency(stage, e, t)
-            verify_drafted = verify_drafted.add_energy_latency(stage, e, t)
-            verify_bonus = verify_bonus.add_energy_latency(stage, e, t)
-
-        draft = draft.add_energy_latency("control", ctrl_e_tok, ctrl_t_tok)
-        verify_drafted = verify_drafted.add_energy_latency("control", ctrl_e_tok, ctrl_t_tok)
-        verify_bonus = verify_bonus.add_energy_latency("control", ctrl_e_tok, ctrl_t_tok)
-        verify_bonus = verify_bonus.add_energy_latency(
-            "control",
-            ctrl_e_burst + setup_e_burst,
-            ctrl_t_burst + setup_t_burst,
+    def at(self, l_prompt: float) -> dict[str, float]:
+        slope = self.slope
+        return {key: value + slope[key] * l_prompt for key, value in self.intercept.items()}
+
+
+@dataclass(frozen=True)
+class CompiledStepCosts:
+    """Per-token step costs (`_TokenStepCosts`) as affine functions of `l_prompt`, compiled once per (model, hardware).
+
+    Every per-token cost term is either independent of `l_prompt` (analog blocks, elementwise, control, setup) or
+    linear in it (`qk`/`pv`/`softmax` MACs), so two evaluations pin the coefficients exactly. The layer-pipelined
+    maxima stay affine because every layer shares the same digital (l_prompt-dependent) cost.
+    """
+
+    draft: AffineFields
+    verify_full: AffineFields
+    verify_drafted_additional: AffineFields
+    max_layer_latencies_ns: AffineFields
+
+    def at(self, l_prompt: float) -> _TokenStepCosts:
+        maxima = self.max_layer_latencies_ns.at(l_prompt)
+        return _TokenStepCosts(
+            draft=Breakdown.from_flat(self.draft.at(l_prompt)),
+            verify_full=Breakdown.from_flat(self.verify_full.at(l_prompt)),
+            verify_drafted_additional=Breakdown.from_flat(self.verify_drafted_additional.at(l_prompt)),
+            max_layer_latencies_ns=(maxima["draft"], maxima["verify_drafted"], maxima["verify_bonus"]),
         )
 
-        max_draft = max(max_draft, Breakdown.from_stage_breakdown(draft).latency_ns)
-        max_verify_drafted = max(max_verify_drafted, Breakdown.from_stage_breakdown(verify_drafted).latency_ns)
-        max_verify_bonus = max(max_verify_bonus, Breakdown.from_stage_breakdown(verify_bonus).latency_ns)
 
-    return max_draft, max_verify_drafted, max_verify_bonus
+def _compile_step_costs(model: ModelConfig, hardware: HardwareConfig) -> CompiledStepCosts:
+    s0 = _token_step_costs(model, hardware, 0)
+    s1 = _token_step_costs(model, hardware, 1)
+    names = ("draft", "verify_drafted", "verify_bonus")
+    return CompiledStepCosts(
+        draft=AffineFields.fit(s0.draft.flatten(), s1.draft.flatten()),
+        verify_full=AffineFields.fit(s0.verify_full.flatten(), s1.verify_full.flatten()),
+        verify_drafted_additional=AffineFields.fit(
+            s0.verify_drafted_additional.flatten(),
+            s1.verify_drafted_additional.flatten(),
+        ),
+        max_layer_latencies_ns=AffineFields.fit(
+            dict(zip(names, s0.max_layer_latencies_ns)),
+            dict(zip(names, s1.max_layer_latencies_ns)),
+        ),
+    )
 
 
-def _baseline_stats() -> SpeculationStats:
-    return SpeculationStats(k=0, histogram={0: 1.0})
+def _compile_kv_memory_traffic(
+    *,
+    model: ModelConfig,
+    hardware: HardwareConfig,
+    stats: SpeculationStats,
+) -> dict[str, AffineFields]:
+    t0 = _kv_memory_traffic_by_phase(model=model, hardware=hardware, stats=stats, l_prompt=0)
+    t1 = _kv_memory_traffic_by_phase(model=model, hardware=hardware, stats=stats, l_prompt=1)
+    return {phase: AffineFields.fit(t0[phase].model_dump(), t1[phase].model_dump()) for phase in t0}
 
 
-def estimate_point(
+def _estimate_from_step_costs(
+    *,
     model: ModelConfig,
     hardware: HardwareConfig,
     stats: SpeculationStats,
     l_prompt: int,
+    steps: _TokenStepCosts,
+    traffic: dict[str, MemoryTraffic] | None = None,
 ) -> tuple[Metrics, PhaseBreakdown]:
-    if hardware.memory is not None:
-        max_context_tokens = hardware.memory.kv_cache.max_context_tokens
-        if max_context_tokens is not None and l_prompt + stats.k > max_context_tokens:
-            raise ValueError(
-                "Max context capacity exceeded: "
-                f"L_prompt ({l_prompt}) + K ({stats.k}) = {l_prompt + stats.k} > "
-                f"memory.kv_cache.max_context_tokens ({max_context_tokens})"
-            )
-
-    if hardware.mode == HardwareMode.legacy:
-        draft_step, verify_full_step = _token_step_costs_legacy(model, hardware, l_prompt)
-        verify_drafted_additional = _verify_drafted_token_additional_stage_legacy(model, hardware, l_prompt)
-    else:
-        specs = hardware.resolve_knob_specs()
-        draft_step, verify_full_step = _token_step_costs_knob(model, hardware, specs, l_prompt)
-        verify_drafted_additional = _verify_drafted_token_additional_stage_knob(model, hardware, specs, l_prompt)
-
-    draft_phase = draft_step.scale(stats.k)
-    verify_drafted_phase = verify_drafted_additional.scale(stats.k)
-    verify_bonus_phase = verify_full_step
+    draft_phase = steps.draft.scale(stats.k)
+    verify_drafted_phase = steps.verify_drafted_additional.scale(stats.k)
+    verify_bonus_phase = steps.verify_full
 
     if hardware.memory is not None:
-        traffic = _kv_memory_traffic_by_phase(model=model, hardware=hardware, stats=stats, l_prompt=l_prompt)
+        if traffic is None:
+            traffic = _kv_memory_traffic_by_phase(model=model, hardware=hardware, stats=stats, l_prompt=l_prompt)
         draft_phase = _add_memory_traffic_costs(breakdown=draft_phase, traffic=traffic["draft"], hardware=hardware)
         verify_drafted_phase = _add_memory_traffic_costs(
             breakdown=verify_drafted_phase,
@@ -1201,40 +1126,58 @@ def estimate_point(
         memory_traffic=total_memory_traffic,
     )
 
-    e_burst = total_phase.energy_pj
-    t_burst = total_phase.latency_ns
+    kv_latency_ns = (0.0, 0.0, 0.0)
+    if hardware.memory is not None:
+        kv_latency_ns = (
+            draft_phase.stages.kv_cache_latency_ns,
+            verify_drafted_phase.stages.kv_cache_latency_ns,
+            verify_bonus_phase.stages.kv_cache_latency_ns,
+        )
+    metrics = _metrics_from_burst(
+        hardware=hardware,
+        stats=stats,
+        energy_pj=total_phase.energy_pj,
+        latency_ns=total_phase.latency_ns,
+        max_layer_latencies_ns=steps.max_layer_latencies_ns,
+        kv_latency_ns=kv_latency_ns,
+    )
+    breakdown = PhaseBreakdown(
+        draft=draft_phase,
+        verify_drafted=verify_drafted_phase,
+        verify_bonus=verify_bonus_phase,
+        total=total_phase,
+    )
+    return metrics, breakdown
 
+
+def _metrics_from_burst(
+    *,
+    hardware: HardwareConfig,
+    stats: SpeculationStats,
+    energy_pj: float,
+    latency_ns: float,
+    max_layer_latencies_ns: tuple[float, float, float],
+    kv_latency_ns: tuple[float, float, float],
+) -> Metrics:
+    """Per-token metrics from burst totals; `kv_latency_ns` is the per-phase KV memory latency of the burst."""
     committed = expected_committed_tokens_per_burst(stats)
     if committed <= 0:
         raise ValueError("Expected committed tokens per burst must be > 0")
 
-    energy_per_token_pj = e_burst / committed
-    latency_per_token_ns = t_burst / committed
+    energy_per_token_pj = energy_pj / committed
+    latency_per_token_ns = latency_ns / committed
 
     if hardware.soc.schedule == ScheduleMode.layer_pipelined:
-        if hardware.mode == HardwareMode.legacy:
-            max_layer_draft, max_layer_verify_drafted, max_layer_verify_bonus = _max_layer_compute_latencies_ns_legacy(
-                model=model,
-                hardware=hardware,
-                l_prompt=l_prompt,
-            )
-        else:
-            specs = hardware.resolve_knob_specs()
-            max_layer_draft, max_layer_verify_drafted, max_layer_verify_bonus = _max_layer_compute_latencies_ns_knob(
-                model=model,
-                hardware=hardware,
-                specs=specs,
-                l_prompt=l_prompt,
-            )
+        max_layer_draft, max_layer_verify_drafted, max_layer_verify_bonus = max_layer_latencies_ns
 
         mem_draft_per_step = 0.0
         mem_verify_drafted_per_step = 0.0
         mem_verify_bonus = 0.0
         if hardware.memory is not None:
             if stats.k > 0:
-                mem_draft_per_step = draft_phase.stages.kv_cache_latency_ns / float(stats.k)
-                mem_verify_drafted_per_step = verify_drafted_phase.stages.kv_cache_latency_ns / float(stats.k)
-            mem_verify_bonus = verify_bonus_phase.stages.kv_cache_latency_ns
+                mem_draft_per_step = kv_latency_ns[0] / float(stats.k)
+                mem_verify_drafted_per_step = kv_latency_ns[1] / float(stats.k)
+            mem_verify_bonus = kv_latency_ns[2]
 
         t_draft = max(max_layer_draft, mem_draft_per_step)
         t_verify_drafted = max(max_layer_verify_drafted, mem_verify_drafted_per_step)
@@ -1246,19 +1189,446 @@ def estimate_point(
     throughput_tokens_per_s = 0.0 if latency_per_token_ns == 0 else 1e9 / latency_per_token_ns
     tokens_per_joule = 0.0 if energy_per_token_pj == 0 else 1e12 / energy_per_token_pj
 
-    breakdown = PhaseBreakdown(
-        draft=draft_phase,
-        verify_drafted=verify_drafted_phase,
-        verify_bonus=verify_bonus_phase,
-        total=total_phase,
-    )
-    metrics = Metrics(
+    return Metrics(
         energy_pj_per_token=energy_per_token_pj,
         latency_ns_per_token=latency_per_token_ns,
         throughput_tokens_per_s=throughput_tokens_per_s,
         tokens_per_joule=tokens_per_joule,
     )
-    return metrics, breakdown
+
+
+def _memory_energy_latency(hardware: HardwareConfig, traffic: Mapping[str, float]) -> tuple[float, float]:
+    assert hardware.memory is not None
+    energy = 0.0
+    latency = 0.0
+    for tech_name in ("sram", "hbm", "fabric"):
+        e, t = memory_energy_latency(
+            tech=getattr(hardware.memory, tech_name),
+            read_bytes=traffic[f"{tech_name}_read_bytes"],
+            write_bytes=traffic[f"{tech_name}_write_bytes"],
+        )
+        energy += e
+        latency += t
+    return energy, latency
+
+
+def _metrics_from_step_totals(
+    *,
+    hardware: HardwareConfig,
+    stats: SpeculationStats,
+    totals: Mapping[str, float],
+    traffic: Mapping[str, Mapping[str, float]] | None,
+) -> Metrics:
+    k = float(stats.k)
+    energy_pj = 0.0
+    latency_ns = 0.0
+    kv_latency_ns = [0.0, 0.0, 0.0]
+    for i, (phase, steps) in enumerate((("draft", k), ("verify_drafted", k), ("verify_bonus", 1.0))):
+        energy_pj += steps * totals[f"{phase}_energy_pj"]
+        latency_ns += steps * totals[f"{phase}_latency_ns"]
+        if traffic is not None:
+            mem_energy, mem_latency = _memory_energy_latency(hardware, traffic[phase])
+            energy_pj += mem_energy
+            latency_ns += mem_latency
+            kv_latency_ns[i] = mem_latency
+    return _metrics_from_burst(
+        hardware=hardware,
+        stats=stats,
+        energy_pj=energy_pj,
+        latency_ns=latency_ns,
+        max_layer_latencies_ns=(
+            totals["draft_max_layer_latency_ns"],
+            totals["verify_drafted_max_layer_latency_ns"],
+            totals["verify_bonus_max_layer_latency_ns"],
+        ),
+        kv_latency_ns=(kv_latency_ns[0], kv_latency_ns[1], kv_latency_ns[2]),
+    )
+
+
+def _check_detail(detail: str) -> None:
+    if detail not in DETAIL_LEVELS:
+        raise ValueError(f"Unknown detail level '{detail}'. Available: {', '.join(DETAIL_LEVELS)}")
+
+
+@overload
+def estimate_point(
+    model: ModelConfig,
+    hardware: HardwareConfig,
+    stats: SpeculationStats,
+    l_prompt: int,
+    detail: Literal["full"] = "full",
+) -> tuple[Metrics, PhaseBreakdown]: ...
+
+
+@overload
+def estimate_point(
+    model: ModelConfig,
+    hardware: HardwareConfig,
+    stats: SpeculationStats,
+    l_prompt: int,
+    detail: Literal["metrics"],
+) -> tuple[Metrics, None]: ...
+
+
+def estimate_point(
+    model: ModelConfig,
+    hardware: HardwareConfig,
+    stats: SpeculationStats,
+    l_prompt: int,
+    detail: Detail = "full",
+) -> tuple[Metrics, PhaseBreakdown | None]:
+    _check_detail(detail)
+    _check_context_capacity(hardware, stats, l_prompt)
+    if detail == "metrics":
+        traffic = None
+        if hardware.memory is not None:
+            by_phase = _kv_memory_traffic_by_phase(model=model, hardware=hardware, stats=stats, l_prompt=l_prompt)
+            traffic = {phase: dict(t) for phase, t in by_phase.items()}
+        totals = _token_step_totals(model, hardware, l_prompt)
+        return _metrics_from_step_totals(hardware=hardware, stats=stats, totals=totals, traffic=traffic), None
+    steps = _token_step_costs(model, hardware, l_prompt)
+    return _estimate_from_step_costs(model=model, hardware=hardware, stats=stats, l_prompt=l_prompt, steps=steps)
+
+
+def _first_crossing(gap: Callable[[float], float], upper: float | None) -> float | None:
+    """Smallest `l_prompt` in [0, upper] with `gap(l_prompt) > 0`, for a `gap` that changes sign at most once.
+
+    The cost functions are affine in `l_prompt` up to a few kinks, so false position lands next to the root; probing
+    a quarter tolerance on either side then closes the bracket, usually in one or two steps. Falls back to bisection
+    whenever a step does not halve the bracket. Returns the upper end of the final bracket.
+    """
+    lo, g_lo = 0.0, gap(0.0)
+    if g_lo > 0:
+        return 0.0
+    hi = _BREAK_EVEN_MAX_L_PROMPT if upper is None else float(upper)
+    if hi <= 0:
+        return None
+    g_hi = gap(hi)
+    if g_hi <= 0:
+        return None
+
+    slow = False
+    while hi - lo > (tolerance := max(BREAK_EVEN_TOLERANCE_TOKENS, 4 * ulp(hi))):
+        width = hi - lo
+        x = 0.5 * (lo + hi) if slow else (lo * g_hi - hi * g_lo) / (g_hi - g_lo)
+        probes = [p for p in (x - 0.25 * tolerance, x + 0.25 * tolerance) if lo < p < hi] or [0.5 * (lo + hi)]
+        for probe in probes:
+            value = gap(probe)
+            if value > 0:
+                hi, g_hi = probe, value
+            else:
+                lo, g_lo = probe, value
+        slow = hi - lo > 0.5 * width
+    return hi
+
+
+class Estimator:
+    """Estimator compiled once for one (model, hardware) pair.
+
+    Construction snapshots both configs, resolves knob specs and groups layers by draft policy; the per-token step
+    costs (as affine functions of `l_prompt`), area and report metadata are compiled on first use. `evaluate` and
+    `evaluate_many` then only do per-point arithmetic. Mutating the original configs afterwards has no effect; build a
+    new `Estimator` instead.
+    """
+
+    def __init__(self, model: ModelConfig, hardware: HardwareConfig) -> None:
+        self.model = model.model_copy(deep=True)
+        self.hardware = hardware.model_copy(deep=True)
+        if self.hardware.mode == HardwareMode.knob_based:
+            self.hardware.resolve_knob_specs()
+        self._config_key = (self.model.fingerprint(), self.hardware.fingerprint())
+        self._step_costs_key = _step_costs_key(self.model, self.hardware)
+        self.baseline_stats = _baseline_stats()
+
+    @cached_property
+    def _steps(self) -> CompiledStepCosts:
+        return STEP_COSTS_CACHE.get_or_compute(
+            self._step_costs_key,
+            lambda: _compile_step_costs(self.model, self.hardware),
+        )
+
+    @cached_property
+    def _totals(self) -> AffineFields:
+        return STEP_TOTALS_CACHE.get_or_compute(
+            self._step_costs_key,
+            lambda: AffineFields.fit(
+                _token_step_totals(self.model, self.hardware, 0),
+                _token_step_totals(self.model, self.hardware, 1),
+            ),
+        )
+
+    @cached_property
+    def _metadata(self) -> dict[str, Any]:
+        return _report_metadata(self.model, self.hardware)
+
+    def _compiled_traffic(self, stats: SpeculationStats) -> dict[str, AffineFields] | None:
+        if self.hardware.memory is None:
+            return None
+        return KV_TRAFFIC_CACHE.get_or_compute(
+            _kv_traffic_key(self.model, self.hardware, stats),
+            lambda: _compile_kv_memory_traffic(model=self.model, hardware=self.hardware, stats=stats),
+        )
+
+    @property
+    def step_costs(self) -> CompiledStepCosts:
+        """Per-token draft / verify step costs (full breakdowns) as exact affine functions of `l_prompt`."""
+        return self._steps
+
+    @property
+    def step_totals(self) -> AffineFields:
+        """Flat per-token step totals (draft / verify / pipelined maxima) as exact affine functions of `l_prompt`."""
+        return self._totals
+
+    def kv_traffic(self, stats: SpeculationStats) -> dict[str, AffineFields] | None:
+        """Per-phase KV memory traffic as affine functions of `l_prompt`; None without a memory hierarchy."""
+        return self._compiled_traffic(stats)
+
+    @property
+    def area_breakdown(self) -> AreaBreakdownMm2:
+        return self._metadata["area_breakdown_mm2"]
+
+    def check_context_capacity(self, l_prompt: int, stats: SpeculationStats) -> None:
+        """Raise `ValueError` if `l_prompt + K` exceeds `memory.kv_cache.max_context_tokens`."""
+        _check_context_capacity(self.hardware, stats, l_prompt)
+
+    def build_report(
+        self,
+        stats: SpeculationStats,
+        points: list[SweepPoint],
+        paths: dict[str, str] | None = None,
+        break_even: bool = False,
+    ) -> Report:
+        """Wrap already evaluated `points` in a report, as `evaluate_many` does."""
+        return _build_report(
+            model=self.model,
+            hardware=self.hardware,
+            stats=stats,
+            points=points,
+            paths=paths,
+            metadata=self._metadata,
+            break_even=self.break_even(stats) if break_even else None,
+        )
+
+    def _full(self, stats: SpeculationStats, l_prompt: int, steps: _TokenStepCosts) -> tuple[Metrics, PhaseBreakdown]:
+        compiled_traffic = self._compiled_traffic(stats)
+        traffic = None
+        if compiled_traffic is not None:
+            traffic = {phase: MemoryTraffic(**t.at(l_prompt)) for phase, t in compiled_traffic.items()}
+        return _estimate_from_step_costs(
+            model=self.model,
+            hardware=self.hardware,
+            stats=stats,
+            l_prompt=l_prompt,
+            steps=steps,
+            traffic=traffic,
+        )
+
+    def _metrics(self, stats: SpeculationStats, l_prompt: int, totals: dict[str, float]) -> Metrics:
+        compiled_traffic = self._compiled_traffic(stats)
+        traffic = None
+        if compiled_traffic is not None:
+            traffic = {phase: t.at(l_prompt) for phase, t in compiled_traffic.items()}
+        return _metrics_from_step_totals(hardware=self.hardware, stats=stats, totals=totals, traffic=traffic)
+
+    @overload
+    def evaluate(
+        self, l_prompt: int, stats: SpeculationStats, detail: Literal["full"] = "full"
+    ) -> tuple[Metrics, PhaseBreakdown]: ...
+
+    @overload
+    def evaluate(self, l_prompt: int, stats: SpeculationStats, detail: Literal["metrics"]) -> tuple[Metrics, None]: ...
+
+    def evaluate(
+        self, l_prompt: int, stats: SpeculationStats, detail: Detail = "full"
+    ) -> tuple[Metrics, PhaseBreakdown | None]:
+        """Same result as `estimate_point(model, hardware, stats, l_prompt, detail)`."""
+        _check_detail(detail)
+        _check_context_capacity(self.hardware, stats, l_prompt)
+        if detail == "metrics":
+            return self._metrics(stats, l_prompt, self._totals.at(l_prompt)), None
+        return self._full(stats, l_prompt, self._steps.at(l_prompt))
+
+    def evaluate_point(self, l_prompt: int, stats: SpeculationStats, detail: Detail = "full") -> SweepPoint:
+        """One sweep point (speculative and baseline metrics, delta, breakdowns), as in `evaluate_many`'s report."""
+        _check_detail(detail)
+        return SweepPoint(**self._point_fields(l_prompt, stats, detail))
+
+    def _point_fields(self, l_prompt: int, stats: SpeculationStats, detail: Detail) -> dict[str, Any]:
+        _check_context_capacity(self.hardware, stats, l_prompt)
+        if detail == "metrics":
+            totals = self._totals.at(l_prompt)
+            speculative = self._metrics(stats, l_prompt, totals)
+            baseline = self._metrics(self.baseline_stats, l_prompt, totals)
+            return {
+                "l_prompt": l_prompt,
+                "speculative": speculative,
+                "baseline": baseline,
+                "delta": BaselineDelta.from_metrics(speculative, baseline),
+            }
+
+        steps = self._steps.at(l_prompt)
+        speculative_metrics, speculative_breakdown = self._full(stats, l_prompt, steps)
+        baseline_metrics, baseline_breakdown = BASELINE_CACHE.get_or_compute(
+            (*self._config_key, l_prompt),
+            lambda: self._full(self.baseline_stats, l_prompt, steps),
+        )
+        return {
+            "l_prompt": l_prompt,
+            "speculative": speculative_metrics,
+            "baseline": baseline_metrics,
+            "delta": BaselineDelta.from_metrics(speculative_metrics, baseline_metrics),
+            "breakdown": speculative_breakdown,
+            "baseline_breakdown": baseline_breakdown,
+        }
+
+    def evaluate_many(
+        self,
+        prompt_lengths: Iterable[int],
+        stats: SpeculationStats,
+        detail: Detail = "full",
+        paths: dict[str, str] | None = None,
+        executor: ProcessSweepExecutor | None = None,
+        journal: SweepJournal | None = None,
+        cache: ResultCache | None = None,
+        break_even: bool = False,
+    ) -> Report:
+        """Same report as `estimate_sweep(model, hardware, stats, prompt_lengths, paths, detail)`.
+
+        The report's exact `break_even` prompt lengths (see `Estimator.break_even`) are solved only with
+        `break_even=True`; they cost a root-finder run per report, which sweeps over many configurations skip.
+
+        With an `executor` (`parallel.ProcessSweepExecutor`) the points are evaluated on its worker processes. With a
+        `journal` (`checkpoint.SweepJournal`) points already journaled for this configuration are reused and the others
+        are journaled in batches as they complete. With a `cache` (`cache.ResultCache`) cached points are reused and
+        the others are evaluated and stored. The report is the same either way.
+        """
+        _check_detail(detail)
+        if journal is None:
+            points = self._evaluate_points(prompt_lengths, stats, detail, executor, cache)
+        else:
+            lengths = list(prompt_lengths)
+            fingerprint = sweep_fingerprint(self.model, self.hardware, stats, detail)
+            done = journal.completed(fingerprint)
+            todo = [l_prompt for l_prompt in dict.fromkeys(lengths) if l_prompt not in done]
+            batch = journal.flush_every * (1 if executor is None else executor.jobs)
+            for start in range(0, len(todo), batch):
+                for point in self._evaluate_points(todo[start : start + batch], stats, detail, executor, cache):
+                    journal.append(fingerprint, point)
+                    done[point.l_prompt] = point
+                journal.flush()
+            points = [done[l_prompt] for l_prompt in lengths]
+        return self.build_report(stats, points, paths=paths, break_even=break_even)
+
+    def _evaluate_points(
+        self,
+        prompt_lengths: Iterable[int],
+        stats: SpeculationStats,
+        detail: Detail,
+        executor: ProcessSweepExecutor | None,
+        cache: ResultCache | None = None,
+    ) -> list[SweepPoint]:
+        if cache is not None:
+            lengths = list(prompt_lengths)
+            key = result_key(self.model, self.hardware, stats, detail)
+            found = cache.get_many(key, lengths)
+            todo = [l_prompt for l_prompt in dict.fromkeys(lengths) if l_prompt not in found]
+            if todo:
+                computed = self._evaluate_points(todo, stats, detail, executor)
+                cache.put_many(key, computed)
+                found.update((point.l_prompt, point) for point in computed)
+            return [found[l_prompt] for l_prompt in lengths]
+        if executor is None:
+            return [SweepPoint(**self._point_fields(l_prompt, stats, detail)) for l_prompt in prompt_lengths]
+        return executor.map_points(self.model, self.hardware, stats, prompt_lengths, detail)
+
+    def evaluate_batch(
+        self,
+        prompt_lengths: Iterable[int],
+        stats: Mapping[str, SpeculationStats] | Sequence[SpeculationStats],
+        detail: Detail = "full",
+    ) -> BatchReport:
+        """Evaluate many acceptance histograms against the same compiled step costs.
+
+        `stats` maps stats ids to stats (a plain sequence is numbered "0", "1", ...). The per-token step costs are
+        compiled once; per entry only the histogram-dependent terms (committed tokens, KV commit traffic) change.
+        Points are ordered by stats id (in the order given), then by prompt length.
+        """
+        _check_detail(detail)
+        by_id = dict(stats) if isinstance(stats, Mapping) else {str(i): s for i, s in enumerate(stats)}
+        if not by_id:
+            raise ValueError("evaluate_batch needs at least one SpeculationStats")
+        lengths = list(prompt_lengths)
+        points = [
+            StatsPoint(stats_id=stats_id, k=entry.k, **self._point_fields(l_prompt, entry, detail))
+            for stats_id, entry in by_id.items()
+            for l_prompt in lengths
+        ]
+        return BatchReport(
+            generated_at=datetime.now(timezone.utc).isoformat(),
+            stats_ids=list(by_id),
+            points=points,
+            **deepcopy(self._metadata),
+        )
+
+    def break_even(self, stats: SpeculationStats) -> BreakEven:
+        """Exact break-even prompt lengths for `stats`, without a prompt-length grid.
+
+        Stage costs are affine in `l_prompt` and KV memory traffic only grows with it, so the attention-minus-linear
+        gap is non-decreasing and has a single crossing; the speculative-vs-baseline crossovers are affine up to the
+        memory and pipelining terms. All four are solved on the compiled cost functions (see `_first_crossing`).
+        """
+        upper = None
+        if self.hardware.memory is not None and self.hardware.memory.kv_cache.max_context_tokens is not None:
+            upper = self.hardware.memory.kv_cache.max_context_tokens - stats.k
+            if upper < 0:
+                return BreakEven()
+
+        steps = self._steps
+        compiled_traffic = self._compiled_traffic(stats)
+        k = float(stats.k)
+        phases = ((steps.draft, k, "draft"), (steps.verify_drafted_additional, k, "verify_drafted"))
+        phases += ((steps.verify_full, 1.0, "verify_bonus"),)
+
+        def stage_gap(unit: str, index: int) -> Callable[[float], float]:
+            intercept = 0.0
+            slope = 0.0
+            for fields, factor, _phase in phases:
+                for stages, sign in ((ATTENTION_STAGES, 1.0), (ANALOG_STAGES, -1.0)):
+                    for stage in stages:
+                        intercept += sign * factor * fields.intercept[f"stages.{stage}_{unit}"]
+                        slope += sign * factor * fields.slope[f"stages.{stage}_{unit}"]
+
+            def gap(l_prompt: float) -> float:
+                value = intercept + slope * l_prompt
+                if compiled_traffic is not None:
+                    for _fields, _factor, phase in phases:
+                        value += _memory_energy_latency(self.hardware, compiled_traffic[phase].at(l_prompt))[index]
+                return value
+
+            return gap
+
+        def metrics_at(l_prompt: float) -> tuple[Metrics, Metrics]:
+            totals = self._totals.at(l_prompt)
+            return self._metrics(stats, l_prompt, totals), self._metrics(self.baseline_stats, l_prompt, totals)
+
+        def energy_gain(l_prompt: float) -> float:
+            speculative, baseline = metrics_at(l_prompt)
+            return baseline.energy_pj_per_token - speculative.energy_pj_per_token
+
+        def latency_gain(l_prompt: float) -> float:
+            speculative, baseline = metrics_at(l_prompt)
+            return baseline.latency_ns_per_token - speculative.latency_ns_per_token
+
+        def crossover(gain: Callable[[float], float]) -> float | None:
+            # Speculation may win below or above the crossover; solve for the first sign change either way.
+            return _first_crossing(gain if gain(0.0) <= 0 else (lambda l_prompt: -gain(l_prompt)), upper)
+
+        return BreakEven(
+            latency_l_prompt=_first_crossing(stage_gap("latency_ns", 1), upper),
+            energy_l_prompt=_first_crossing(stage_gap("energy_pj", 0), upper),
+            tokens_per_joule_l_prompt=crossover(energy_gain),
+            throughput_l_prompt=crossover(latency_gain),
+        )
 
 
 def estimate_sweep(
@@ -1267,33 +1637,41 @@ def estimate_sweep(
     stats: SpeculationStats,
     prompt_lengths: list[int],
     paths: dict[str, str] | None = None,
+    detail: Detail = "full",
+    executor: ProcessSweepExecutor | None = None,
+    journal: SweepJournal | None = None,
+    cache: ResultCache | None = None,
+    break_even: bool = False,
 ) -> Report:
-    paths_obj = None
-    if paths is not None:
-        paths_obj = InputPaths(**paths)
+    estimator = Estimator(model, hardware)
+    return estimator.evaluate_many(
+        prompt_lengths,
+        stats,
+        detail=detail,
+        paths=paths,
+        executor=executor,
+        journal=journal,
+        cache=cache,
+        break_even=break_even,
+    )
 
-    points: list[SweepPoint] = []
-    for l_prompt in prompt_lengths:
-        speculative_metrics, speculative_breakdown = estimate_point(model, hardware, stats, l_prompt)
-        baseline_metrics, baseline_breakdown = estimate_point(model, hardware, _baseline_stats(), l_prompt)
-        delta = BaselineDelta.from_metrics(speculative_metrics, baseline_metrics)
-        points.append(
-            SweepPoint(
-                l_prompt=l_prompt,
-                speculative=speculative_metrics,
-                baseline=baseline_metrics,
-                delta=delta,
-                breakdown=speculative_breakdown,
-                baseline_breakdown=baseline_breakdown,
-            )
-        )
 
-    break_even = None
-    for p in sorted(points, key=lambda sp: sp.l_prompt):
-        if p.delta.tokens_per_joule_ratio is not None and p.delta.tokens_per_joule_ratio > 1.0:
-            break_even = p.l_prompt
-            break
+def estimate_batch(
+    model: ModelConfig,
+    hardware: HardwareConfig,
+    stats: Mapping[str, SpeculationStats] | Sequence[SpeculationStats],
+    prompt_lengths: list[int],
+    detail: Detail = "full",
+) -> BatchReport:
+    return Estimator(model, hardware).evaluate_batch(prompt_lengths, stats, detail=detail)
+
 
+def _report_metadata(model: ModelConfig, hardware: HardwareConfig) -> dict[str, Any]:
+    """Report fields that depend only on the configuration (not on stats or prompt lengths)."""
+    area, area_breakdown = AREA_CACHE.get_or_compute(
+        _area_key(model, hardware),
+        lambda: (_area_mm2(model, hardware), _area_breakdown_mm2(model, hardware)),
+    )
     resolved_library = hardware.resolved_library_payload()
     model_knobs: dict[str, Any] = {
         "activation_bits": model.activation_bits,
@@ -1348,22 +1726,52 @@ def estimate_sweep(
     ):
         hardware_knobs["soc"] = hardware.soc.model_dump(mode="json")
 
+    return {
+        "reuse_policy": hardware.reuse_policy.value,
+        "hardware_mode": hardware.mode.value,
+        "resolved_library": resolved_library,
+        "model_knobs": model_knobs,
+        "hardware_knobs": hardware_knobs,
+        "area": area,
+        "area_breakdown_mm2": area_breakdown,
+        "notes": [
+            "Analytical calculator (closed-form activation counts, no event simulation).",
+            "No early-stop on mismatch; verifier suffix work is still charged.",
+            "Breakdown latencies are serialized sums; `soc.schedule` affects how latency/token is reported.",
+        ],
+    }
+
+
+def _build_report(
+    *,
+    model: ModelConfig,
+    hardware: HardwareConfig,
+    stats: SpeculationStats,
+    points: list[SweepPoint],
+    paths: dict[str, str] | None = None,
+    metadata: dict[str, Any] | None = None,
+    break_even: BreakEven | None = None,
+) -> Report:
+    paths_obj = None
+    if paths is not None:
+        paths_obj = InputPaths(**paths)
+
+    break_even_l_prompt = None
+    for p in sorted(points, key=lambda sp: sp.l_prompt):
+        if p.delta.tokens_per_joule_ratio is not None and p.delta.tokens_per_joule_ratio > 1.0:
+            break_even_l_prompt = p.l_prompt
+            break
+
+    if metadata is None:
+        metadata = _report_metadata(model, hardware)
+    # Reports own their nested values; the metadata may be shared by every report of one Estimator.
+    metadata = deepcopy(metadata)
     return Report(
         generated_at=datetime.now(timezone.utc).isoformat(),
         k=stats.k,
-        reuse_policy=hardware.reuse_policy.value,
-        hardware_mode=hardware.mode.value,
-        resolved_library=resolved_library,
-        model_knobs=model_knobs,
-        hardware_knobs=hardware_knobs,
         paths=paths_obj,
         points=points,
-        break_even_tokens_per_joule_l_prompt=break_even,
-        area=_area_mm2(model, hardware),
-        area_breakdown_mm2=_area_breakdown_mm2(model, hardware),
-        notes=[
-            "Analytical calculator (closed-form activation counts, no event simulation).",
-            "No early-stop on mismatch; verifier suffix work is still charged.",
-            "Breakdown latencies are serialized sums; `soc.schedule` affects how latency/token is reported.",
-        ],
+        break_even_tokens_per_joule_l_prompt=break_even_l_prompt,
+        break_even=break_even,
+        **metadata,
     )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .config import HardwareConfig, ModelConfig
+from .depth import _check_alpha, _check_prompt_lengths, _DepthModel
+from .report import Metrics
+
+HEATMAP_METRICS = ("tokens_per_joule", "latency_ns_per_token")
+SIDECAR_NAME = "heatmap.json"
+K_VALUES_NAME = "k_values.npy"
+PROMPT_LENGTHS_NAME = "prompt_lengths.npy"
+
+
+def write_heatmap(
+    model: ModelConfig,
+    hardware: HardwareConfig,
+    out_dir: str | Path,
+    *,
+    k_values: np.ndarray | list[int],
+    prompt_lengths: np.ndarray | list[int],
+    alpha: float,
+    metrics: tuple[str, ...] | list[str] = HEATMAP_METRICS,
+    chunk_size: int = 8192,
+) -> dict[str, Any]:
+    """Write K x l_prompt metric grids to `out_dir` as `<metric>.npy` files, plus axis arrays and a JSON sidecar.
+
+    Acceptance follows the truncated-geometric model with per-token probability `alpha` (see `depth.sweep_depth`).
+    Rows are K, columns are prompt lengths. The grids are filled `chunk_size` prompt lengths at a time straight into
+    memory-mapped `.npy` files, so peak memory is O(len(k_values) * chunk_size) whatever the grid size; read them
+    back with `np.load(path, mmap_mode="r")`. Pairs whose context exceeds the KV capacity are NaN. Returns the sidecar.
+    """
+    unknown = [name for name in metrics if name not in Metrics.model_fields]
+    if unknown or not metrics:
+        raise ValueError(f"Unknown metrics {unknown}. Available: {', '.join(Metrics.model_fields)}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1 (got {chunk_size})")
+    _check_alpha(alpha)
+    lengths = _check_prompt_lengths(prompt_lengths)
+    ks = np.asarray(k_values, dtype=np.int64)
+    depth = _DepthModel(model, hardware, ks, alpha)
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    np.save(out / K_VALUES_NAME, ks)
+    np.save(out / PROMPT_LENGTHS_NAME, lengths)
+    shape = (int(ks.size), int(lengths.size))
+    grids = {
+        name: np.lib.format.open_memmap(out / f"{name}.npy", mode="w+", dtype=np.float64, shape=shape)
+        for name in metrics
+    }
+    for start in range(0, lengths.size, chunk_size):
+        stop = min(start + chunk_size, lengths.size)
+        chunk = depth.metrics(lengths[start:stop])
+        for name, grid in grids.items():
+            grid[:, start:stop] = chunk[name]
+    for grid in grids.values():
+        grid.flush()
+    del grids
+
+    sidecar: dict[str, Any] = {
+        "alpha": alpha,
+        "shape": list(shape),
+        "rows": {"axis": "k", "file": K_VALUES_NAME, "values": ks.tolist()},
+        "columns": {
+            "axis": "l_prompt",
+            "file": PROMPT_LENGTHS_NAME,
+            "count": shape[1],
+            "min": int(lengths.min()) if lengths.size else None,
+            "max": int(lengths.max()) if lengths.size else None,
+        },
+        "arrays": {name: f"{name}.npy" for name in metrics},
+        "nan": "context (l_prompt + K) exceeds memory.kv_cache.max_context_tokens",
+    }
+    (out / SIDECAR_NAME).write_text(json.dumps(sidecar, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return sidecar
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import math
+import operator
+import re
+from typing import Any, Callable, Mapping
+
+from pydantic import BaseModel
+
+from .config import HardwareConfig, ModelConfig
+from .dse import split_target, apply_overrides
+from .estimator import Estimator
+from .report import MAXIMIZED_METRICS, Metrics
+from .stats import SpeculationStats
+
+DESIGN_QUANTITIES = (*Metrics.model_fields, "on_chip_mm2")
+_OPERATORS: dict[str, Callable[[float, float], bool]] = {">=": operator.ge, "<=": operator.le}
+_CONSTRAINT_RE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(>=|<=)\s*(\S+)\s*$")
+
+# Library-table field behind each quantity for the ADC-bit axes, with the direction the quantity follows the field.
+# ADC bits only change per-conversion costs (conversion counts do not depend on them), and per-token energy/latency
+# are sums and maxima of non-negative terms, so a monotone table column makes the metric monotone too.
+_ADC_TABLE_FIELDS = {
+    "on_chip_mm2": ("area_mm2_per_unit", 1),
+    "energy_pj_per_token": ("energy_pj_per_conversion", 1),
+    "tokens_per_joule": ("energy_pj_per_conversion", -1),
+    "latency_ns_per_token": ("latency_ns_per_conversion", 1),
+    "throughput_tokens_per_s": ("latency_ns_per_conversion", -1),
+}
+
+
+class Constraint(BaseModel):
+    quantity: str
+    op: str
+    value: float
+
+    def __str__(self) -> str:
+        return f"{self.quantity}{self.op}{self.value:g}"
+
+    def satisfied_by(self, value: float) -> bool:
+        return _OPERATORS[self.op](value, self.value)
+
+
+class InverseDesignResult(BaseModel):
+    objective: str
+    constraints: list[str]
+    best_overrides: dict[str, Any] | None
+    best: dict[str, float] | None
+    candidates: int
+    evaluated: int
+    pruned: int
+    invalid: int
+    infeasible: int
+
+
+def parse_constraint(text: str) -> Constraint:
+    """Parse `quantity>=value` / `quantity<=value`, e.g. `throughput_tokens_per_s>=2e6`."""
+    match = _CONSTRAINT_RE.match(text)
+    if match is None:
+        raise ValueError(f"Invalid constraint '{text}' (expected quantity>=value or quantity<=value)")
+    quantity, op, value = match.groups()
+    if quantity not in DESIGN_QUANTITIES:
+        raise ValueError(f"Unknown quantity '{quantity}'. Available: {', '.join(DESIGN_QUANTITIES)}")
+    return Constraint(quantity=quantity, op=op, value=float(value))
+
+
+def _direction(values: list[float]) -> int | None:
+    pairs = list(zip(values, values[1:]))
+    if all(a <= b for a, b in pairs):
+        return 1
+    if all(a >= b for a, b in pairs):
+        return -1
+    return None
+
+
+def default_monotonicity(hardware_raw: dict[str, Any], axes: list[tuple[str, list[Any]]]) -> dict[str, dict[str, int]]:
+    """Monotonicity facts that hold by construction of the cost model, for the axes being searched.
+
+    Returns `{axis_path: {quantity: +1 | -1}}`: the quantity never decreases (+1) / never increases (-1) along the
+    axis values in the order given. Covered: ADC bits (area, energy, latency via the selected library's tables), DAC
+    bits (area), and columns per ADC (area; fewer ADCs per tile). Table-based facts are skipped when the library
+    itself is an axis.
+    """
+    targets = {split_target(path): path for path, _values in axes}
+    hints: dict[str, dict[str, int]] = {}
+    if ("hardware", "library") in targets:
+        return hints
+    library = HardwareConfig.LIBRARIES.get(hardware_raw.get("library") or HardwareConfig.DEFAULT_LIBRARY)
+
+    for path, values in axes:
+        _target, dotted = split_target(path)
+        if dotted == "analog.num_columns_per_adc" and all(isinstance(v, int) for v in values):
+            direction = _direction(values)
+            if direction is not None:
+                hints[path] = {"on_chip_mm2": -direction}
+            continue
+        if library is None:
+            continue
+        if dotted in ("analog.adc.draft_bits", "analog.adc.residual_bits"):
+            table, fields = library["adc"], _ADC_TABLE_FIELDS
+        elif dotted == "analog.dac_bits":
+            table, fields = library["dac"], {"on_chip_mm2": _ADC_TABLE_FIELDS["on_chip_mm2"]}
+        else:
+            continue
+        if not all(v in table for v in values):
+            continue
+        for quantity, (field, sign) in fields.items():
+            direction = _direction([float(table[v].get(field, 0.0)) for v in values])
+            if direction is not None:
+                hints.setdefault(path, {})[quantity] = sign * direction
+    return hints
+
+
+def inverse_design(
+    *,
+    model_raw: dict[str, Any],
+    hardware_raw: dict[str, Any],
+    stats: SpeculationStats,
+    l_prompt: int,
+    axes: list[tuple[str, list[Any]]],
+    constraints: list[Constraint | str],
+    objective: str = "on_chip_mm2",
+    monotone: Mapping[str, Mapping[str, int]] | None = None,
+) -> InverseDesignResult:
+    """Best knob combination (by `objective`) that satisfies every constraint, via branch and bound.
+
+    Axes are fixed depth-first in the order given. At each subtree, the "corner" combination that is best for a
+    quantity along every remaining axis bounds that quantity over the whole subtree, provided the quantity is monotone
+    in each of those axes (`default_monotonicity`, extended/overridden by `monotone`). A subtree is discarded when its
+    objective bound cannot beat the incumbent or a constraint bound already fails. Every candidate is counted as
+    either evaluated or pruned; corner evaluations are candidates too and are never repeated.
+    """
+    if objective not in DESIGN_QUANTITIES:
+        raise ValueError(f"Unknown objective '{objective}'. Available: {', '.join(DESIGN_QUANTITIES)}")
+    if not axes:
+        raise ValueError("inverse_design needs at least one axis")
+    parsed = [c if isinstance(c, Constraint) else parse_constraint(c) for c in constraints]
+    paths = [path for path, _values in axes]
+    if len(set(paths)) != len(paths):
+        raise ValueError(f"Duplicate axis paths: {sorted(p for p in set(paths) if paths.count(p) > 1)}")
+
+    hints = default_monotonicity(hardware_raw, axes)
+    for path, quantities in (monotone or {}).items():
+        hints.setdefault(path, {}).update(quantities)
+
+    values = [list(v) for _path, v in axes]
+    sizes = [len(v) for v in values]
+    evaluations: dict[tuple[int, ...], dict[str, float] | None] = {}
+
+    def evaluate(combo: tuple[int, ...]) -> dict[str, float] | None:
+        if combo not in evaluations:
+            overrides = {path: values[d][i] for d, (path, i) in enumerate(zip(paths, combo))}
+            try:
+                model_cfg, hardware_cfg = apply_overrides(model_raw, hardware_raw, overrides)
+                estimator = Estimator(
+                    ModelConfig.model_validate(model_cfg), HardwareConfig.model_validate(hardware_cfg)
+                )
+                metrics, _ = estimator.evaluate(l_prompt, stats, detail="metrics")
+                result = metrics.model_dump()
+                result["on_chip_mm2"] = estimator.area_breakdown.on_chip_mm2
+            except ValueError:  # includes pydantic ValidationError
+                result = None
+            evaluations[combo] = result
+        return evaluations[combo]
+
+    def key(quantity: str, value: float) -> float:
+        # Smaller is better for the objective.
+        return -value if quantity in MAXIMIZED_METRICS else value
+
+    def best_index(depth: int, quantity: str, larger: bool) -> int | None:
+        direction = hints.get(paths[depth], {}).get(quantity)
+        if direction is None:
+            return None
+        return sizes[depth] - 1 if (direction > 0) == larger else 0
+
+    def corner(prefix: tuple[int, ...], quantity: str, larger: bool) -> float | None:
+        """Largest (`larger`) or smallest value of `quantity` over the subtree, if monotonicity pins it down."""
+        rest = [best_index(d, quantity, larger) for d in range(len(prefix), len(axes))]
+        if any(i is None for i in rest):
+            return None
+        result = evaluate((*prefix, *rest))
+        return None if result is None else result[quantity]
+
+    def feasible(result: dict[str, float] | None) -> bool:
+        return result is not None and all(c.satisfied_by(result[c.quantity]) for c in parsed)
+
+    best: tuple[float, tuple[int, ...]] | None = None
+
+    def visit(prefix: tuple[int, ...]) -> None:
+        nonlocal best
+        depth = len(prefix)
+        if depth == len(axes):
+            result = evaluate(prefix)
+            if feasible(result) and (best is None or key(objective, result[objective]) < best[0]):
+                best = (key(objective, result[objective]), prefix)
+            return
+
+        if best is not None:
+            bound = corner(prefix, objective, objective in MAXIMIZED_METRICS)
+            if bound is not None and key(objective, bound) >= best[0]:
+                return
+        for c in parsed:
+            bound = corner(prefix, c.quantity, c.op == ">=")
+            if bound is not None and not c.satisfied_by(bound):
+                return
+
+        order = list(range(sizes[depth]))
+        if best_index(depth, objective, objective in MAXIMIZED_METRICS) == sizes[depth] - 1:
+            order.reverse()  # most promising branch first, for an early incumbent
+        for i in order:
+            visit((*prefix, i))
+
+    visit(())
+    candidates = math.prod(sizes)
+    best_overrides = None
+    best_values = None
+    if best is not None:
+        best_overrides = {path: values[d][i] for d, (path, i) in enumerate(zip(paths, best[1]))}
+        best_values = evaluations[best[1]]
+    return InverseDesignResult(
+        objective=objective,
+        constraints=[str(c) for c in parsed],
+        best_overrides=best_overrides,
+        best=best_values,
+        candidates=candidates,
+        evaluated=len(evaluations),
+        pruned=candidates - len(evaluations),
+        invalid=sum(result is None for result in evaluations.values()),
+        infeasible=sum(result is not None and not feasible(result) for result in evaluations.values()),
+    )
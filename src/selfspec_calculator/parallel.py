@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import gc
+import itertools
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar
+
+from .config import HardwareConfig, ModelConfig
+from .estimator import Detail, Estimator
+from .report import SweepPoint
+from .stats import SpeculationStats
+
+T = TypeVar("T")
+
+# At most this many chunks per worker are in flight: inputs are consumed lazily and pending results stay bounded.
+_CHUNKS_PER_JOB = 4
+
+# Per-process state of `ProcessSweepExecutor.map_points`, installed once per worker by `_init_worker`.
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(model: ModelConfig, hardware: HardwareConfig, stats: SpeculationStats, detail: Detail) -> None:
+    _WORKER.clear()
+    _WORKER.update(estimator=Estimator(model, hardware), stats=stats, detail=detail)
+
+
+def _evaluate_length(l_prompt: int) -> SweepPoint:
+    estimator: Estimator = _WORKER["estimator"]
+    return estimator.evaluate_point(l_prompt, _WORKER["stats"], _WORKER["detail"])
+
+
+def _run_chunk(fn: Callable[[Any], T], chunk: Sequence[Any]) -> list[T]:
+    return [fn(item) for item in chunk]
+
+
+def guided_chunks(n: int, workers: int, min_chunk: int = 1) -> list[tuple[int, int]]:
+    """Split `range(n)` into contiguous `(start, stop)` chunks of decreasing size.
+
+    Each chunk takes `1 / (2 * workers)` of what remains (at least `min_chunk`): the large early chunks amortize the
+    per-task overhead, the small late ones keep every worker busy until the end.
+    """
+    chunks: list[tuple[int, int]] = []
+    start = 0
+    while start < n:
+        size = max(min_chunk, -(-(n - start) // (2 * workers)))
+        chunks.append((start, min(start + size, n)))
+        start += size
+    return chunks
+
+
+class ProcessSweepExecutor:
+    """Evaluates sweep tasks on a pool of worker processes; the one process-pool layer behind `--jobs`.
+
+    Workers are set up once through the pool initializer, so tasks carry only their own inputs (prompt lengths,
+    knob overrides). `imap` chunks the inputs (`guided_chunks` when their length is known, `min_chunk` at a time for
+    iterators), keeps at most `4 * jobs` chunks in flight and yields results in input order. The pool is reused across
+    calls with the same initializer and arguments, and restarted when they change; use the executor as a context
+    manager (or call `shutdown()`) to stop it. `jobs == 1` evaluates in-process.
+    """
+
+    def __init__(self, jobs: int | None = None, *, min_chunk: int = 8) -> None:
+        self.jobs = jobs if jobs is not None else os.cpu_count() or 1
+        if self.jobs < 1:
+            raise ValueError(f"jobs must be >= 1 (got {self.jobs})")
+        if min_chunk < 1:
+            raise ValueError(f"min_chunk must be >= 1 (got {min_chunk})")
+        self.min_chunk = min_chunk
+        self._pool: ProcessPoolExecutor | None = None
+        self._context: tuple[Callable[..., None], tuple[Any, ...]] | None = None
+
+    def __enter__(self) -> ProcessSweepExecutor:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        self._pool = None
+        self._context = None
+
+    def imap(
+        self,
+        fn: Callable[[Any], T],
+        items: Iterable[Any],
+        *,
+        initializer: Callable[..., None],
+        initargs: tuple[Any, ...],
+    ) -> Iterator[T]:
+        """Lazily yield `fn(item)` for every item, in input order, on workers set up by `initializer(*initargs)`.
+
+        `fn` and `initializer` must be module-level functions. Run one `imap` at a time per executor.
+        """
+        if self.jobs == 1:
+            initializer(*initargs)
+            yield from map(fn, items)
+            return
+        context = (initializer, initargs)
+        if self._pool is None or self._context != context:
+            self.shutdown()
+            self._pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=initializer, initargs=initargs)
+            self._context = context
+        pending: deque[Future[list[T]]] = deque()
+        try:
+            for chunk in self._chunks(items):
+                pending.append(self._pool.submit(_run_chunk, fn, chunk))
+                if len(pending) >= _CHUNKS_PER_JOB * self.jobs:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _chunks(self, items: Iterable[Any]) -> Iterator[Sequence[Any]]:
+        if isinstance(items, Sequence):
+            for start, stop in guided_chunks(len(items), self.jobs, self.min_chunk):
+                yield items[start:stop]
+        else:
+            iterator = iter(items)
+            yield from iter(lambda: list(itertools.islice(iterator, self.min_chunk)), [])
+
+    def map_points(
+        self,
+        model: ModelConfig,
+        hardware: HardwareConfig,
+        stats: SpeculationStats,
+        prompt_lengths: Iterable[int],
+        detail: Detail = "full",
+    ) -> list[SweepPoint]:
+        context = (model.model_copy(deep=True), hardware.model_copy(deep=True), stats.model_copy(deep=True), detail)
+        # The returned points are many small objects without garbage cycles; pausing the cyclic GC while collecting
+        # (unpickling) them roughly halves the parent-side cost, which bounds the speedup for full-detail sweeps.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return list(
+                self.imap(_evaluate_length, list(prompt_lengths), initializer=_init_worker, initargs=context)
+            )
+        finally:
+            if gc_enabled:
+                gc.enable()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Generic, Iterator, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+# Front size from which the dominance scans of three or more objectives are vectorized.
+_VECTORIZE_FROM = 64
+
+
+def dominates(a: tuple[float, ...], b: tuple[float, ...]) -> bool:
+    """`a` is no worse than `b` in every objective and better in at least one (all objectives minimized)."""
+    return all(x <= y for x, y in zip(a, b)) and a != b
+
+
+class ParetoFront(Generic[T]):
+    """Incrementally maintained non-dominated set (all objectives minimized).
+
+    Members are kept in lexicographic objective order, so a candidate only has to be checked against members that sort
+    before it (potential dominators) and only members that sort after it can be evicted. With two objectives the front
+    is a staircase (the second objective strictly decreases), so each `add` is a bisection plus the evicted run:
+    O(log n + evicted). With more, the prefix and suffix are scanned, O(n) per candidate; from `_VECTORIZE_FROM`
+    members on the scans run in NumPy over the members' objective columns, so fronts of many thousands of members
+    (e.g. when most knob combinations trade off against each other) stay cheap next to evaluating a candidate. Memory
+    is bounded by the front size, not by the number of candidates offered. Exact duplicates of a member are rejected
+    (first one wins).
+    """
+
+    def __init__(self) -> None:
+        self._objectives: list[tuple[float, ...]] = []
+        self._items: list[T] = []
+        self._columns: np.ndarray | None = None  # `_objectives` transposed, once the front is large
+        self.offered = 0
+
+    def __len__(self) -> int:
+        return len(self._objectives)
+
+    def __iter__(self) -> Iterator[tuple[tuple[float, ...], T]]:
+        return iter(zip(self._objectives, self._items))
+
+    def add(self, objectives: tuple[float, ...], item: T) -> bool:
+        """Offer a candidate; returns whether it joined the front."""
+        self.offered += 1
+        objectives = tuple(objectives)
+        members = self._objectives
+        pos = bisect_right(members, objectives)
+        if len(objectives) == 2:
+            # The predecessor has the lowest second objective of the prefix; dominated members follow `pos` in a run.
+            if pos and members[pos - 1][1] <= objectives[1]:
+                return False
+            end = pos
+            while end < len(members) and members[end][1] >= objectives[1]:
+                end += 1
+            members[pos:end] = [objectives]
+            self._items[pos:end] = [item]
+            return True
+
+        if self._columns is None and len(members) >= _VECTORIZE_FROM:
+            self._columns = np.array(members, dtype=np.float64).T.copy()
+        # Members after `pos` differ from the candidate, so weak dominance is dominance there.
+        if self._columns is None:
+            if any(all(x <= y for x, y in zip(members[i], objectives)) for i in range(pos)):
+                return False
+            evicted = [i for i in range(pos, len(members)) if all(x >= y for x, y in zip(members[i], objectives))]
+        else:
+            candidate = np.asarray(objectives, dtype=np.float64)[:, None]
+            if pos and bool(np.logical_and.reduce(self._columns[:, :pos] <= candidate).any()):
+                return False
+            evicted = (pos + np.flatnonzero(np.logical_and.reduce(self._columns[:, pos:] >= candidate))).tolist()
+            columns = np.delete(self._columns, evicted, axis=1) if evicted else self._columns
+            self._columns = np.insert(columns, pos, candidate[:, 0], axis=1)
+        for i in reversed(evicted):
+            del members[i]
+            del self._items[i]
+        members.insert(pos, objectives)
+        self._items.insert(pos, item)
+        return True
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Mapping
 
 from pydantic import BaseModel, Field
 
@@ -14,6 +14,10 @@ class Metrics(BaseModel):
     tokens_per_joule: float = Field(..., ge=0.0)
 
 
+# `Metrics` fields where larger is better; the others are minimized.
+MAXIMIZED_METRICS = frozenset({"throughput_tokens_per_s", "tokens_per_joule"})
+
+
 class BaselineDelta(BaseModel):
     energy_pj_per_token_ratio: float | None = None
     latency_ns_per_token_ratio: float | None = None
@@ -256,6 +260,37 @@ class Breakdown(BaseModel):
             memory_traffic=memory_traffic,
         )
 
+    def flatten(self) -> dict[str, float]:
+        """Flat ``{"stages.qkv_energy_pj": ...}`` view of every leaf field (totals excluded; see `from_flat`)."""
+        flat: dict[str, float] = {}
+        for name in ["stages", "components", "activation_counts", "memory_traffic"]:
+            sub = getattr(self, name)
+            if sub is None:
+                continue
+            for field in type(sub).model_fields:
+                if name == "stages" and field.endswith("_mm2"):
+                    continue
+                flat[f"{name}.{field}"] = getattr(sub, field)
+        return flat
+
+    @classmethod
+    def from_flat(cls, flat: Mapping[str, float]) -> "Breakdown":
+        """Inverse of `flatten`; sub-models without any key in `flat` stay `None`, totals are recomputed."""
+        parts: dict[str, dict[str, float]] = {}
+        for key, value in flat.items():
+            name, field = key.split(".", 1)
+            parts.setdefault(name, {})[field] = value
+        return cls.from_stage_breakdown(
+            StageBreakdown.model_construct(**parts.get("stages", {})),
+            components=ComponentBreakdown.model_construct(**parts["components"]) if "components" in parts else None,
+            activation_counts=(
+                AnalogActivationCounts.model_construct(**parts["activation_counts"])
+                if "activation_counts" in parts
+                else None
+            ),
+            memory_traffic=MemoryTraffic.model_construct(**parts["memory_traffic"]) if "memory_traffic" in parts else None,
+        )
+
     def scale(self, factor: float) -> "Breakdown":
         components = None
         if self.components is not None:
@@ -309,8 +344,28 @@ class SweepPoint(BaseModel):
     speculative: Metrics
     baseline: Metrics
     delta: BaselineDelta
-    breakdown: PhaseBreakdown
-    baseline_breakdown: PhaseBreakdown
+    breakdown: PhaseBreakdown | None = None
+    baseline_breakdown: PhaseBreakdown | None = None
+
+
+class StatsPoint(SweepPoint):
+    stats_id: str
+    k: int = Field(..., ge=0)
+
+
+class BreakEven(BaseModel):
+    """Break-even prompt lengths solved on the continuous cost functions (`None`: no crossing within the context).
+
+    `latency_l_prompt` / `energy_l_prompt` (Roadmap §5.3.2 L*_latency / L*_energy): where attention-related cost (qk,
+    pv, softmax, kv_cache) exceeds the analog linear cost (qkv, wo, ffn) per committed token; latency uses serialized
+    stage latencies. `tokens_per_joule_l_prompt` / `throughput_l_prompt`: where the speculative-vs-baseline ratio first
+    crosses 1 (speculation may win on either side; a point's `delta` tells which).
+    """
+
+    latency_l_prompt: float | None = None
+    energy_l_prompt: float | None = None
+    tokens_per_joule_l_prompt: float | None = None
+    throughput_l_prompt: float | None = None
 
 
 class Report(BaseModel):
@@ -324,6 +379,23 @@ class Report(BaseModel):
     paths: InputPaths | None = None
     points: list[SweepPoint]
     break_even_tokens_per_joule_l_prompt: int | None = None
+    break_even: BreakEven | None = None
+    area: StageBreakdown
+    area_breakdown_mm2: AreaBreakdownMm2
+    notes: list[str] = Field(default_factory=list)
+
+
+class BatchReport(BaseModel):
+    """One (model, hardware) pair evaluated against many speculation stats: one point per (stats_id, l_prompt)."""
+
+    generated_at: str
+    reuse_policy: str
+    hardware_mode: str
+    resolved_library: dict[str, Any] | None = None
+    model_knobs: dict[str, Any] | None = None
+    hardware_knobs: dict[str, Any] | None = None
+    stats_ids: list[str]
+    points: list[StatsPoint]
     area: StageBreakdown
     area_breakdown_mm2: AreaBreakdownMm2
     notes: list[str] = Field(default_factory=list)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import yaml
+
+from .config import HardwareConfig
+
+SAMPLERS = ("random", "lhs", "halton")
+_RANGE_RE = re.compile(r"^\s*(\S+?)\s*\.\.\s*(\S+)\s*$")
+
+
+@dataclass(frozen=True)
+class SampleAxis:
+    """One sampled knob: a list of choices, or an inclusive `low..high` range (integer if both ends are integers)."""
+
+    path: str
+    choices: tuple[Any, ...] | None = None
+    low: float | None = None
+    high: float | None = None
+    integer: bool = False
+
+    def value(self, u: float) -> Any:
+        """Map a unit-interval coordinate `u` in [0, 1) to a knob value."""
+        if self.choices is not None:
+            return self.choices[min(int(u * len(self.choices)), len(self.choices) - 1)]
+        assert self.low is not None and self.high is not None
+        if self.integer:
+            span = int(self.high) - int(self.low) + 1
+            return int(self.low) + min(int(u * span), span - 1)
+        return self.low + u * (self.high - self.low)
+
+
+def parse_sample_axis(text: str) -> SampleAxis:
+    """Parse `dotted.path=LOW..HIGH` (range) or `dotted.path=v1,v2,...` (choices, YAML scalars as in `--sweep`)."""
+    path, sep, spec = text.partition("=")
+    path = path.strip()
+    if not sep or not path or not spec.strip():
+        raise ValueError(f"Invalid sampled axis '{text}' (expected dotted.path=LOW..HIGH or dotted.path=v1,v2,...)")
+    match = _RANGE_RE.match(spec)
+    if match is None:
+        return SampleAxis(path=path, choices=tuple(yaml.safe_load(v.strip()) for v in spec.split(",")))
+
+    low, high = (yaml.safe_load(v) for v in match.groups())
+    if any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in (low, high)) or low > high:
+        raise ValueError(f"Invalid range in '{text}' (expected numeric LOW..HIGH with LOW <= HIGH)")
+    integer = isinstance(low, int) and isinstance(high, int)
+    return SampleAxis(path=path, low=low, high=high, integer=integer)
+
+
+def _first_primes(n: int) -> list[int]:
+    primes: list[int] = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def _radical_inverse(indices: np.ndarray, base: int) -> np.ndarray:
+    result = np.zeros(indices.shape, dtype=np.float64)
+    scale = 1.0 / base
+    rest = indices.copy()
+    while rest.any():
+        rest, digit = np.divmod(rest, base)
+        result += digit * scale
+        scale /= base
+    return result
+
+
+def unit_samples(n: int, dims: int, method: str = "lhs", seed: int | None = None) -> np.ndarray:
+    """`n` points in the unit hypercube [0, 1)^dims, shape `(n, dims)`.
+
+    `random` draws uniformly; `lhs` (Latin hypercube) puts exactly one point in each of the `n` equal strata of every
+    dimension; `halton` is the low-discrepancy Halton sequence (prime bases per dimension), randomly shifted modulo 1
+    when a seed is given.
+    """
+    if method not in SAMPLERS:
+        raise ValueError(f"Unknown sampler '{method}'. Available: {', '.join(SAMPLERS)}")
+    if n < 1:
+        raise ValueError(f"number of samples must be >= 1 (got {n})")
+    rng = np.random.default_rng(seed)
+    if method == "random":
+        return rng.random((n, dims))
+    if method == "lhs":
+        strata = np.argsort(rng.random((dims, n)), axis=1).T
+        return (strata + rng.random((n, dims))) / n
+    indices = np.arange(1, n + 1, dtype=np.int64)
+    points = np.column_stack([_radical_inverse(indices, base) for base in _first_primes(dims)]).reshape(n, dims)
+    if seed is not None:
+        points = (points + rng.random(dims)) % 1.0
+    return points
+
+
+def sample_overrides(
+    axes: list[SampleAxis], n: int, *, method: str = "lhs", seed: int | None = None
+) -> list[dict[str, Any]]:
+    """`n` override dicts (as for `apply_overrides`) drawn over the declared axes."""
+    paths = [axis.path for axis in axes]
+    if not axes:
+        raise ValueError("sampling needs at least one axis")
+    if len(set(paths)) != len(paths):
+        raise ValueError(f"Duplicate sampled paths: {sorted(p for p in set(paths) if paths.count(p) > 1)}")
+    points = unit_samples(n, len(axes), method, seed)
+    return [{axis.path: axis.value(float(u)) for axis, u in zip(axes, row)} for row in points]
+
+
+def _get(raw: dict[str, Any], *keys: str) -> Any:
+    node: Any = raw
+    for key in keys:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(key)
+    return node
+
+
+def precheck(hardware_raw: dict[str, Any], k: int, prompt_lengths: list[int]) -> str | None:
+    """Reason a raw hardware config is infeasible under cheap rules, or None if it passes them.
+
+    Checks, without building a `HardwareConfig`: `analog.xbar_size % analog.num_columns_per_adc`, that the DAC/ADC bit
+    widths exist in the selected library, and the `memory.kv_cache.max_context_tokens` capacity for the longest prompt.
+    Passing does not guarantee the full validation succeeds.
+    """
+    analog = _get(hardware_raw, "analog")
+    if isinstance(analog, dict):
+        xbar, columns = analog.get("xbar_size"), analog.get("num_columns_per_adc")
+        if isinstance(xbar, int) and isinstance(columns, int) and columns > 0 and xbar % columns:
+            return f"analog.xbar_size ({xbar}) must be divisible by analog.num_columns_per_adc ({columns})"
+        library_name = hardware_raw.get("library") or HardwareConfig.DEFAULT_LIBRARY
+        library = HardwareConfig.LIBRARIES.get(library_name)
+        if library is None:
+            available = ", ".join(sorted(HardwareConfig.LIBRARIES))
+            return f"Unknown hardware library '{library_name}'. Available: {available}"
+        for dotted, table in (
+            ("analog.dac_bits", "dac"),
+            ("analog.adc.draft_bits", "adc"),
+            ("analog.adc.residual_bits", "adc"),
+        ):
+            bits = _get(hardware_raw, *dotted.split("."))
+            if bits is not None and bits not in library[table]:
+                return (
+                    f"Requested {dotted}={bits} is not available in library '{library_name}'. "
+                    f"Available {table.upper()} bits: {sorted(library[table])}"
+                )
+
+    capacity = _get(hardware_raw, "memory", "kv_cache", "max_context_tokens")
+    if isinstance(capacity, int) and prompt_lengths and max(prompt_lengths) + k > capacity:
+        return (
+            f"Max context capacity exceeded: L_prompt ({max(prompt_lengths)}) + K ({k}) = {max(prompt_lengths) + k} > "
+            f"memory.kv_cache.max_context_tokens ({capacity})"
+        )
+    return None
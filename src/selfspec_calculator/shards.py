@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .config import HardwareConfig, ModelConfig
+from .dse import _report_row, evaluate_overrides, expand_grid
+from .estimator import DETAIL_LEVELS, Detail, Estimator
+from .stats import SpeculationStats
+
+SPEC_NAME = "spec.json"
+PENDING_DIR = "pending"
+CLAIMED_DIR = "claimed"
+RESULTS_DIR = "results"
+_CLAIM_SEP = "@"
+
+# Layout of a shard directory (any filesystem with atomic rename within a directory tree, e.g. a local disk or NFS):
+#   spec.json              sweep spec: raw configs, stats, prompt lengths, sweep axes, detail and the shard names
+#   pending/<shard>.json   unclaimed shards: lists of (combination, prompt-length slice) tasks
+#   claimed/<shard>@<id>   shards being evaluated by worker <id> (claimed by renaming out of pending/)
+#   results/<shard>.jsonl  one row per task, written to a temporary name and renamed into place
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{socket.gethostname()}-{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _load_spec(shard_dir: Path) -> dict[str, Any]:
+    path = shard_dir / SPEC_NAME
+    if not path.exists():
+        raise ValueError(f"No sharded sweep in {shard_dir} (missing {SPEC_NAME})")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def plan_shards(
+    shard_dir: str | Path,
+    *,
+    model_raw: dict[str, Any],
+    hardware_raw: dict[str, Any],
+    stats: SpeculationStats,
+    prompt_lengths: list[int],
+    sweeps: list[tuple[str, list[Any]]],
+    detail: Detail = "full",
+    shard_size: int = 256,
+    paths: dict[str, str] | None = None,
+) -> int:
+    """Split a sweep into shard files under `shard_dir` and return the number of shards.
+
+    The (combination, prompt length) evaluations are taken in grid order and cut into shards of `shard_size`
+    evaluations, so a single configuration with many prompt lengths is split as well as a large knob grid. The spec
+    embeds the raw configs, so workers need only the shard directory. `paths` are recorded as the report's input paths
+    when there are no sweep axes.
+    """
+    out = Path(shard_dir)
+    if detail not in DETAIL_LEVELS:
+        raise ValueError(f"Unknown detail '{detail}'. Available: {', '.join(DETAIL_LEVELS)}")
+    if shard_size < 1:
+        raise ValueError(f"shard_size must be >= 1 (got {shard_size})")
+    if not prompt_lengths:
+        raise ValueError("prompt_lengths must not be empty")
+    if (out / SPEC_NAME).exists():
+        raise ValueError(f"{out} already holds a sharded sweep ({SPEC_NAME} exists)")
+    combinations = list(expand_grid(sweeps))
+    for name in (PENDING_DIR, CLAIMED_DIR, RESULTS_DIR):
+        (out / name).mkdir(parents=True, exist_ok=True)
+
+    names: list[str] = []
+    total = len(combinations) * len(prompt_lengths)
+    for first in range(0, total, shard_size):
+        tasks: list[dict[str, Any]] = []
+        for flat in range(first, min(first + shard_size, total)):
+            index, j = divmod(flat, len(prompt_lengths))
+            if tasks and tasks[-1]["index"] == index:
+                tasks[-1]["stop"] = j + 1
+            else:
+                tasks.append({"index": index, "overrides": combinations[index], "start": j, "stop": j + 1})
+        name = f"shard-{len(names):06d}"
+        _write_atomic(out / PENDING_DIR / f"{name}.json", json.dumps({"tasks": tasks}))
+        names.append(name)
+
+    spec = {
+        "model_raw": model_raw,
+        "hardware_raw": hardware_raw,
+        "stats": stats.model_dump(mode="json"),
+        "prompt_lengths": list(prompt_lengths),
+        "sweeps": [[path, values] for path, values in sweeps],
+        "detail": detail,
+        "paths": paths,
+        "shards": names,
+    }
+    # Written last: workers refuse to start until the spec (and so every shard) exists. Key order is kept, so the
+    # configs are rebuilt (and any validation error reported) exactly as from the original files.
+    _write_atomic(out / SPEC_NAME, json.dumps(spec, indent=2) + "\n")
+    return len(names)
+
+
+def _claim(shard_dir: Path, owner: str) -> tuple[str, Path] | None:
+    for path in sorted((shard_dir / PENDING_DIR).glob("shard-*.json")):
+        target = shard_dir / CLAIMED_DIR / f"{path.stem}{_CLAIM_SEP}{owner}"
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            continue  # claimed by another worker first
+        try:
+            os.utime(target)  # claim age for `requeue_stale` (rename keeps the planning-time mtime)
+        except FileNotFoundError:
+            continue  # requeued in between
+        return path.stem, target
+    return None
+
+
+def requeue_stale(shard_dir: str | Path, older_than_s: float) -> list[str]:
+    """Move claims older than `older_than_s` seconds (e.g. from a crashed worker) back to pending; returns their names.
+
+    A worker that still finishes a requeued shard just rewrites the same result file.
+    """
+    root = Path(shard_dir)
+    cutoff = time.time() - older_than_s
+    requeued: list[str] = []
+    for path in sorted((root / CLAIMED_DIR).iterdir()):
+        name = path.name.partition(_CLAIM_SEP)[0]
+        try:
+            if path.stat().st_mtime > cutoff or (root / RESULTS_DIR / f"{name}.jsonl").exists():
+                continue
+            os.rename(path, root / PENDING_DIR / f"{name}.json")
+        except FileNotFoundError:
+            continue  # finished or requeued meanwhile
+        requeued.append(name)
+    return requeued
+
+
+def work_shards(shard_dir: str | Path, *, worker_id: str | None = None, max_shards: int | None = None) -> int:
+    """Claim and evaluate pending shards until none are left (or `max_shards` are done); returns the count done.
+
+    Any number of workers, on any host that sees `shard_dir`, can run this concurrently: a shard is claimed by an atomic
+    rename out of `pending/`, and its results are renamed into `results/` once complete.
+    """
+    root = Path(shard_dir)
+    spec = _load_spec(root)
+    owner = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    if _CLAIM_SEP in owner or "/" in owner:
+        raise ValueError(f"worker_id must not contain '{_CLAIM_SEP}' or '/' (got '{owner}')")
+    stats = SpeculationStats.model_validate(spec["stats"])
+    done = 0
+    while max_shards is None or done < max_shards:
+        claim = _claim(root, owner)
+        if claim is None:
+            break
+        name, claimed = claim
+        try:
+            tasks = json.loads(claimed.read_text(encoding="utf-8"))["tasks"]
+        except FileNotFoundError:
+            continue  # requeued in between; another worker will take it
+        rows = []
+        for task in tasks:
+            row = {"index": task["index"], "overrides": task["overrides"], "start": task["start"]}
+            try:
+                report = evaluate_overrides(
+                    model_raw=spec["model_raw"],
+                    hardware_raw=spec["hardware_raw"],
+                    overrides=task["overrides"],
+                    stats=stats,
+                    prompt_lengths=spec["prompt_lengths"][task["start"] : task["stop"]],
+                    detail=spec["detail"],
+                )
+            except ValueError as exc:  # includes pydantic ValidationError
+                row["error"] = str(exc)
+            else:
+                row.update(_report_row(task["index"], task["overrides"], report))
+            rows.append(json.dumps(row, sort_keys=True) + "\n")
+        _write_atomic(root / RESULTS_DIR / f"{name}.jsonl", "".join(rows))
+        claimed.unlink(missing_ok=True)
+        done += 1
+    return done
+
+
+def shard_status(shard_dir: str | Path) -> dict[str, int]:
+    root = Path(shard_dir)
+    spec = _load_spec(root)
+    done = sum((root / RESULTS_DIR / f"{name}.jsonl").exists() for name in spec["shards"])
+    return {
+        "shards": len(spec["shards"]),
+        "pending": len(list((root / PENDING_DIR).glob("shard-*.json"))),
+        "claimed": len(list((root / CLAIMED_DIR).iterdir())),
+        "done": done,
+    }
+
+
+def merge_shards(shard_dir: str | Path) -> list[dict[str, Any]]:
+    """Reassemble the sweep rows (as `dse.run_sweep` yields them, in grid order) from every shard's results.
+
+    A combination split across shards gets its points concatenated back in prompt-length order; if any part failed,
+    the row carries the first part's error, as an unsharded evaluation would stop there.
+    """
+    root = Path(shard_dir)
+    spec = _load_spec(root)
+    missing = [name for name in spec["shards"] if not (root / RESULTS_DIR / f"{name}.jsonl").exists()]
+    if missing:
+        raise ValueError(f"{len(missing)} of {len(spec['shards'])} shards have no results yet (first: {missing[0]})")
+
+    parts: dict[int, list[dict[str, Any]]] = {}
+    for name in spec["shards"]:
+        with (root / RESULTS_DIR / f"{name}.jsonl").open(encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                parts.setdefault(row["index"], []).append(row)
+
+    rows: list[dict[str, Any]] = []
+    for index in sorted(parts):
+        chunks = sorted(parts[index], key=lambda row: row["start"])
+        overrides = chunks[0]["overrides"]
+        failed = next((row for row in chunks if "error" in row), None)
+        if failed is not None:
+            rows.append({"index": index, "overrides": overrides, "error": failed["error"]})
+            continue
+        report = chunks[0]["report"]
+        report["points"] = [point for row in chunks for point in row["report"]["points"]]
+        report["break_even_tokens_per_joule_l_prompt"] = next(
+            (
+                point["l_prompt"]
+                for point in sorted(report["points"], key=lambda point: point["l_prompt"])
+                if (point["delta"]["tokens_per_joule_ratio"] or 0.0) > 1.0
+            ),
+            None,
+        )
+        rows.append({"index": index, "overrides": overrides, "report": report})
+    return rows
+
+
+def merge_report(shard_dir: str | Path) -> dict[str, Any]:
+    """The single report (as `estimate_sweep(..., break_even=True)` dumps it) of a sharded sweep without sweep axes.
+
+    Workers skip the break-even solve; it is done once here, on the spec's configs.
+    """
+    root = Path(shard_dir)
+    spec = _load_spec(root)
+    if spec["sweeps"]:
+        raise ValueError("merge_report needs a sweep without sweep axes; use merge_shards for knob sweeps")
+    (row,) = merge_shards(root)
+    if "error" in row:
+        raise ValueError(row["error"])
+    estimator = Estimator(
+        ModelConfig.model_validate(spec["model_raw"]), HardwareConfig.model_validate(spec["hardware_raw"])
+    )
+    break_even = estimator.break_even(SpeculationStats.model_validate(spec["stats"]))
+    return {
+        **row["report"],
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "paths": spec["paths"],
+        "break_even": break_even.model_dump(mode="json"),
+    }
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from typing import Mapping
+from fractions import Fraction
+from typing import Any, Mapping
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import Field, field_validator
 
+from .config import _ConfigModel
 
-class SpeculationStats(BaseModel):
+
+class SpeculationStats(_ConfigModel):
     k: int = Field(..., ge=0)
     histogram: dict[int, float] = Field(default_factory=dict)
 
@@ -26,6 +29,13 @@ class SpeculationStats(BaseModel):
             raise ValueError("histogram sum must be > 0")
         return v
 
+    def _canonical(self) -> Any:
+        # Only the acceptance distribution matters: exactly proportional histograms and zero bins are equivalent. The
+        # shares are exact rationals, so no rounding can merge distinct distributions.
+        total = sum(Fraction(v) for v in self.histogram.values())
+        shares = ((a, Fraction(v) / total) for a, v in sorted(self.histogram.items()))
+        return {"k": self.k, "histogram": [[a, f"{p.numerator}/{p.denominator}"] for a, p in shares if p > 0]}
+
 
 def normalize_histogram(hist: Mapping[int, float]) -> dict[int, float]:
     total = float(sum(hist.values()))
@@ -46,3 +56,45 @@ def expected_wasted_verifier_steps(stats: SpeculationStats) -> float:
 
 def verifier_steps_per_burst(stats: SpeculationStats) -> int:
     return stats.k + 1
+
+
+def truncated_geometric_histogram(alpha: float, k: int) -> dict[int, float]:
+    """Accepted-prefix distribution when each drafted token is accepted independently with probability `alpha`.
+
+    P(a) = alpha^a * (1 - alpha) for a < K, and P(K) = alpha^K (every drafted token accepted).
+    """
+    if not 0.0 <= alpha <= 1.0:
+        raise ValueError(f"acceptance probability must be in [0, 1] (got {alpha})")
+    if k < 0:
+        raise ValueError(f"K must be >= 0 (got {k})")
+    hist = {a: alpha**a * (1.0 - alpha) for a in range(k)}
+    hist[k] = alpha**k
+    return hist
+
+
+def truncated_geometric_stats(alpha: float, k: int) -> SpeculationStats:
+    return SpeculationStats(k=k, histogram=truncated_geometric_histogram(alpha, k))
+
+
+def fit_acceptance_probability(stats: SpeculationStats) -> float:
+    """Maximum-likelihood per-token acceptance probability of a truncated-geometric model for `stats.histogram`.
+
+    A burst with a < K accepted tokens contributes a successes and one rejection; a burst with a = K contributes K
+    successes and no rejection.
+    """
+    hist = normalize_histogram(stats.histogram)
+    accepted = sum(a * p for a, p in hist.items())
+    rejected = sum(p for a, p in hist.items() if a < stats.k)
+    if accepted + rejected <= 0:
+        raise ValueError("Cannot fit an acceptance probability for K=0 (no drafted tokens)")
+    return accepted / (accepted + rejected)
+
+
+def expected_committed_tokens_geometric(alpha: float, k: Any) -> Any:
+    """`expected_committed_tokens_per_burst` of `truncated_geometric_stats(alpha, k)`: sum_{i=0..K} alpha^i.
+
+    `k` may be an int or a numpy array of K values (the result then has its shape).
+    """
+    if alpha == 1.0:
+        return k + 1.0
+    return (1.0 - alpha ** (k + 1)) / (1.0 - alpha)
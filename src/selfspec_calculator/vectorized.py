@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .config import HardwareConfig, ModelConfig, ScheduleMode
+from .estimator import STAGES, AffineFields, Estimator, memory_energy_latency
+from .report import BaselineDelta, Breakdown, Metrics, PhaseBreakdown, Report, SweepPoint
+from .stats import SpeculationStats, expected_committed_tokens_per_burst
+
+
+PHASES = ("draft", "verify_drafted", "verify_bonus", "total")
+
+
+def _affine_column(intercept: float, slope: float, l_prompt: np.ndarray) -> np.ndarray:
+    # l_prompt-independent terms share one read-only broadcast view instead of a materialized column.
+    if slope == 0.0:
+        return np.broadcast_to(np.float64(intercept), l_prompt.shape)
+    return intercept + slope * l_prompt
+
+
+def _add_memory_columns(
+    *,
+    cols: dict[str, np.ndarray],
+    traffic: AffineFields,
+    hardware: HardwareConfig,
+    l_prompt: np.ndarray,
+) -> None:
+    assert hardware.memory is not None
+    bytes_cols = {field: _affine_column(a, traffic.slope[field], l_prompt) for field, a in traffic.intercept.items()}
+
+    mem_energy = 0.0
+    mem_latency = 0.0
+    for tech_name in ("sram", "hbm", "fabric"):
+        energy, latency = memory_energy_latency(
+            tech=getattr(hardware.memory, tech_name),
+            read_bytes=bytes_cols[f"{tech_name}_read_bytes"],
+            write_bytes=bytes_cols[f"{tech_name}_write_bytes"],
+        )
+        cols[f"components.{tech_name}_energy_pj"] = cols[f"components.{tech_name}_energy_pj"] + energy
+        cols[f"components.{tech_name}_latency_ns"] = cols[f"components.{tech_name}_latency_ns"] + latency
+        mem_energy = mem_energy + energy
+        mem_latency = mem_latency + latency
+
+    cols["stages.kv_cache_energy_pj"] = cols["stages.kv_cache_energy_pj"] + mem_energy
+    cols["stages.kv_cache_latency_ns"] = cols["stages.kv_cache_latency_ns"] + mem_latency
+    for field, col in bytes_cols.items():
+        cols[f"memory_traffic.{field}"] = col
+
+
+def _add_totals(cols: dict[str, np.ndarray]) -> None:
+    cols["energy_pj"] = np.sum([cols[f"stages.{s}_energy_pj"] for s in STAGES], axis=0)
+    cols["latency_ns"] = np.sum([cols[f"stages.{s}_latency_ns"] for s in STAGES], axis=0)
+
+
+def _evaluate_columns(
+    *,
+    estimator: Estimator,
+    stats: SpeculationStats,
+    l_prompt: np.ndarray,
+) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    hardware = estimator.hardware
+    compiled = estimator.step_costs
+    k = float(stats.k)
+    by_phase: dict[str, dict[str, np.ndarray]] = {}
+    for phase, fields, factor in (
+        ("draft", compiled.draft, k),
+        ("verify_drafted", compiled.verify_drafted_additional, k),
+        ("verify_bonus", compiled.verify_full, 1.0),
+    ):
+        by_phase[phase] = {
+            key: _affine_column(a * factor, fields.slope[key] * factor, l_prompt) for key, a in fields.intercept.items()
+        }
+
+    traffic = estimator.kv_traffic(stats)
+    if traffic is not None:
+        for phase, fields in traffic.items():
+            _add_memory_columns(cols=by_phase[phase], traffic=fields, hardware=hardware, l_prompt=l_prompt)
+
+    total = {
+        key: by_phase["draft"][key] + by_phase["verify_drafted"][key] + by_phase["verify_bonus"][key]
+        for key in by_phase["draft"]
+    }
+    by_phase["total"] = total
+    for cols in by_phase.values():
+        _add_totals(cols)
+
+    committed = expected_committed_tokens_per_burst(stats)
+    if committed <= 0:
+        raise ValueError("Expected committed tokens per burst must be > 0")
+
+    energy_per_token_pj = np.asarray(total["energy_pj"] / committed, dtype=np.float64)
+    latency_per_token_ns = np.asarray(total["latency_ns"] / committed, dtype=np.float64)
+
+    if hardware.soc.schedule == ScheduleMode.layer_pipelined:
+        max_layer = {
+            phase: _affine_column(a, compiled.max_layer_latencies_ns.slope[phase], l_prompt)
+            for phase, a in compiled.max_layer_latencies_ns.intercept.items()
+        }
+        mem_per_step: dict[str, Any] = {"draft": 0.0, "verify_drafted": 0.0, "verify_bonus": 0.0}
+        if hardware.memory is not None:
+            if stats.k > 0:
+                mem_per_step["draft"] = by_phase["draft"]["stages.kv_cache_latency_ns"] / k
+                mem_per_step["verify_drafted"] = by_phase["verify_drafted"]["stages.kv_cache_latency_ns"] / k
+            mem_per_step["verify_bonus"] = by_phase["verify_bonus"]["stages.kv_cache_latency_ns"]
+
+        t_draft = np.maximum(max_layer["draft"], mem_per_step["draft"])
+        t_verify_drafted = np.maximum(max_layer["verify_drafted"], mem_per_step["verify_drafted"])
+        t_verify_bonus = np.maximum(max_layer["verify_bonus"], mem_per_step["verify_bonus"])
+        latency_per_token_ns = (k * t_draft + k * t_verify_drafted + t_verify_bonus) / committed
+
+    with np.errstate(divide="ignore"):
+        throughput = np.where(latency_per_token_ns == 0, 0.0, 1e9 / latency_per_token_ns)
+        tokens_per_joule = np.where(energy_per_token_pj == 0, 0.0, 1e12 / energy_per_token_pj)
+
+    metrics = {
+        "energy_pj_per_token": energy_per_token_pj,
+        "latency_ns_per_token": np.asarray(latency_per_token_ns, dtype=np.float64),
+        "throughput_tokens_per_s": throughput,
+        "tokens_per_joule": tokens_per_joule,
+    }
+    breakdown = {f"{phase}.{key}": col for phase, cols in by_phase.items() for key, col in cols.items()}
+    return metrics, breakdown
+
+
+def _row_breakdown(columns: dict[str, np.ndarray], i: int) -> PhaseBreakdown:
+    flat: dict[str, dict[str, float]] = {phase: {} for phase in PHASES}
+    for name, col in columns.items():
+        phase, key = name.split(".", 1)
+        if key in {"energy_pj", "latency_ns"}:
+            continue
+        flat[phase][key] = float(col[i])
+    return PhaseBreakdown(**{phase: Breakdown.from_flat(flat[phase]) for phase in PHASES})
+
+
+@dataclass(frozen=True)
+class SweepArrays:
+    """Array-backed sweep results: one NumPy column per metric/breakdown field, one row per prompt length.
+
+    Breakdown columns are keyed `"<phase>.<section>.<field>"` (e.g. `"total.stages.qk_energy_pj"`) plus the
+    `"<phase>.energy_pj"` / `"<phase>.latency_ns"` totals. Columns that do not depend on `l_prompt` are read-only
+    broadcast views.
+    """
+
+    model: ModelConfig
+    hardware: HardwareConfig
+    stats: SpeculationStats
+    prompt_lengths: np.ndarray
+    speculative: dict[str, np.ndarray]
+    baseline: dict[str, np.ndarray]
+    breakdown: dict[str, np.ndarray]
+    baseline_breakdown: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return int(self.prompt_lengths.shape[0])
+
+    def to_report(self, paths: dict[str, str] | None = None, break_even: bool = False) -> Report:
+        points: list[SweepPoint] = []
+        for i, l_prompt in enumerate(self.prompt_lengths.tolist()):
+            speculative = Metrics(**{name: float(col[i]) for name, col in self.speculative.items()})
+            baseline = Metrics(**{name: float(col[i]) for name, col in self.baseline.items()})
+            points.append(
+                SweepPoint(
+                    l_prompt=l_prompt,
+                    speculative=speculative,
+                    baseline=baseline,
+                    delta=BaselineDelta.from_metrics(speculative, baseline),
+                    breakdown=_row_breakdown(self.breakdown, i),
+                    baseline_breakdown=_row_breakdown(self.baseline_breakdown, i),
+                )
+            )
+        return Estimator(self.model, self.hardware).build_report(self.stats, points, paths=paths, break_even=break_even)
+
+
+def estimate_sweep_array(
+    model: ModelConfig,
+    hardware: HardwareConfig,
+    stats: SpeculationStats,
+    prompt_lengths: np.ndarray,
+) -> SweepArrays:
+    lengths = np.asarray(prompt_lengths, dtype=np.int64)
+    if lengths.ndim != 1:
+        raise ValueError(f"prompt_lengths must be one-dimensional (got shape {lengths.shape})")
+    if lengths.size and int(lengths.min()) < 0:
+        raise ValueError(f"prompt_lengths must be non-negative (got {int(lengths.min())})")
+
+    estimator = Estimator(model, hardware)
+    if hardware.memory is not None and hardware.memory.kv_cache.max_context_tokens is not None:
+        over = np.flatnonzero(lengths + stats.k > hardware.memory.kv_cache.max_context_tokens)
+        if over.size:
+            estimator.check_context_capacity(int(lengths[over[0]]), stats)
+
+    l_prompt = lengths.astype(np.float64)
+    speculative, breakdown = _evaluate_columns(estimator=estimator, stats=stats, l_prompt=l_prompt)
+    baseline, baseline_breakdown = _evaluate_columns(
+        estimator=estimator, stats=estimator.baseline_stats, l_prompt=l_prompt
+    )
+    return SweepArrays(
+        model=model,
+        hardware=hardware,
+        stats=stats,
+        prompt_lengths=lengths,
+        speculative=speculative,
+        baseline=baseline,
+        breakdown=breakdown,
+        baseline_breakdown=baseline_breakdown,
+    )
@@ -127,3 +127,38 @@ def test_reuse_with_full_precision_draft_has_zero_verify_analog_reads() -> None:
     assert components.dac_energy_pj == pytest.approx(0.0)
     assert components.adc_draft_energy_pj == pytest.approx(0.0)
     assert components.adc_residual_energy_pj == pytest.approx(0.0)
+
+
+def test_layers_with_identical_policies_are_grouped_and_costs_stay_additive() -> None:
+    from selfspec_calculator.estimator import _layer_policy_groups
+
+    full_qkv = {"qkv": "full"}
+    model = ModelConfig.model_validate(
+        {
+            **BASE_MODEL,
+            "n_layers": 5,
+            "draft_policy": {"per_layer": {1: full_qkv, 3: full_qkv, 4: {"qkv": "draft"}}},
+        }
+    )
+    groups = _layer_policy_groups(model)
+    assert [count for _policy, count in groups] == [3, 2]
+
+    stats = SpeculationStats(k=2, histogram={0: 1.0, 2: 1.0})
+    hardware = _knob_hardware(reuse_policy="reuse")
+    _, grouped = estimate_point(model=model, hardware=hardware, stats=stats, l_prompt=64)
+
+    single_default = ModelConfig.model_validate(BASE_MODEL)
+    single_full = ModelConfig.model_validate({**BASE_MODEL, "draft_policy": {"default": full_qkv}})
+    _, b_default = estimate_point(model=single_default, hardware=hardware, stats=stats, l_prompt=64)
+    _, b_full = estimate_point(model=single_full, hardware=hardware, stats=stats, l_prompt=64)
+
+    for phase in ["draft", "verify_drafted", "verify_bonus", "total"]:
+        expected = 3.0 * getattr(b_default, phase).energy_pj + 2.0 * getattr(b_full, phase).energy_pj
+        assert getattr(grouped, phase).energy_pj == pytest.approx(expected)
+    assert grouped.total.activation_counts is not None
+    assert b_default.total.activation_counts is not None
+    assert b_full.total.activation_counts is not None
+    assert grouped.total.activation_counts.adc_residual_conversions == pytest.approx(
+        3.0 * b_default.total.activation_counts.adc_residual_conversions
+        + 2.0 * b_full.total.activation_counts.adc_residual_conversions
+    )
@@ -0,0 +1,65 @@
+import math
+from pathlib import Path
+
+import pytest
+
+from selfspec_calculator.config import HardwareConfig, ModelConfig
+from selfspec_calculator.estimator import (
+    ANALOG_STAGES,
+    ATTENTION_STAGES,
+    BREAK_EVEN_TOLERANCE_TOKENS,
+    Estimator,
+    _first_crossing,
+    estimate_point,
+    estimate_sweep,
+)
+from selfspec_calculator.io import load_speculation_stats
+from selfspec_calculator.stats import SpeculationStats
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def _stage_gap(model, hardware, stats, l_prompt: int, unit: str) -> float:
+    _metrics, breakdown = estimate_point(model, hardware, stats, l_prompt)
+    stages = breakdown.total.stages
+    attention = sum(getattr(stages, f"{stage}_{unit}") for stage in ATTENTION_STAGES)
+    return attention - sum(getattr(stages, f"{stage}_{unit}") for stage in ANALOG_STAGES)
+
+
+@pytest.mark.parametrize("hardware_file", ["hardware.yaml", "hardware_legacy.yaml", "hardware_soc_memory.yaml"])
+def test_stage_break_even_brackets_the_sign_change(hardware_file: str) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / hardware_file)
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    break_even = Estimator(model, hardware).break_even(stats)
+
+    for value, unit in ((break_even.latency_l_prompt, "latency_ns"), (break_even.energy_l_prompt, "energy_pj")):
+        assert value is not None and value > 0
+        assert _stage_gap(model, hardware, stats, math.floor(value), unit) <= 0
+        assert _stage_gap(model, hardware, stats, math.ceil(value), unit) > 0
+
+    report = estimate_sweep(model, hardware, stats, [64], detail="metrics", break_even=True)
+    assert report.break_even == break_even
+    assert estimate_sweep(model, hardware, stats, [64], detail="metrics").break_even is None
+
+
+def test_speculative_vs_baseline_crossover() -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_legacy.yaml")
+    stats = SpeculationStats(k=4, histogram={4: 1.0})
+    crossover = Estimator(model, hardware).break_even(stats).tokens_per_joule_l_prompt
+
+    assert crossover is not None
+    report = estimate_sweep(model, hardware, stats, [math.floor(crossover), math.ceil(crossover)], detail="metrics")
+    before, after = (point.delta.tokens_per_joule_ratio for point in report.points)
+    assert before > 1.0 >= after
+
+
+def test_first_crossing_solves_to_tolerance() -> None:
+    assert _first_crossing(lambda l: 2.0 * l - 7.0, None) == pytest.approx(3.5, abs=BREAK_EVEN_TOLERANCE_TOKENS)
+    kinked = _first_crossing(lambda l: max(l - 100.0, 3.0 * l - 1000.0), None)
+    assert kinked == pytest.approx(100.0, abs=BREAK_EVEN_TOLERANCE_TOKENS)
+    assert _first_crossing(lambda l: 1.0, None) == 0.0
+    assert _first_crossing(lambda l: -1.0, None) is None
+    assert _first_crossing(lambda l: l - 50.0, 40) is None
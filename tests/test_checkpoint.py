@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from selfspec_calculator.checkpoint import SweepJournal, sweep_fingerprint
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import HardwareConfig, ModelConfig
+from selfspec_calculator.estimator import Estimator, estimate_sweep
+from selfspec_calculator.io import load_speculation_stats
+from selfspec_calculator.report import Report
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+LENGTHS = [64, 0, 128, 256, 512, 1024, 2048, 4096, 128]
+
+
+def _payload(report: Report) -> dict:
+    payload = report.model_dump(mode="json")
+    payload.pop("generated_at")
+    return payload
+
+
+def test_resume_after_interruption_matches_uninterrupted_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    expected = _payload(estimate_sweep(model, hardware, stats, LENGTHS))
+    journal_path = tmp_path / "sweep.journal.jsonl"
+
+    point_fields = Estimator._point_fields
+    calls: list[int] = []
+
+    def crash_after_five(self: Estimator, l_prompt: int, *args: object) -> dict:
+        calls.append(l_prompt)
+        if len(calls) > 5:
+            raise KeyboardInterrupt
+        return point_fields(self, l_prompt, *args)
+
+    monkeypatch.setattr(Estimator, "_point_fields", crash_after_five)
+    with pytest.raises(KeyboardInterrupt):
+        with SweepJournal(journal_path, flush_every=2) as journal:
+            estimate_sweep(model, hardware, stats, LENGTHS, journal=journal)
+    assert len(journal_path.read_text(encoding="utf-8").splitlines()) == 4  # two full batches were flushed
+
+    calls.clear()
+    with pytest.raises(ValueError, match="already exists"):
+        SweepJournal(journal_path)
+    with SweepJournal(journal_path, resume=True, flush_every=2) as journal:
+        fingerprint = sweep_fingerprint(model, hardware, stats, "full")
+        assert sorted(journal.completed(fingerprint)) == [0, 64, 128, 256]
+        monkeypatch.setattr(Estimator, "_point_fields", point_fields)
+        resumed = estimate_sweep(model, hardware, stats, LENGTHS, journal=journal)
+    assert _payload(resumed) == expected
+
+    with SweepJournal(journal_path, resume=True) as journal:
+        again = estimate_sweep(model, hardware, stats, LENGTHS, journal=journal)
+        other = estimate_sweep(model, hardware, stats, LENGTHS[:2], detail="metrics", journal=journal)
+    assert _payload(again) == expected
+    assert other.points[0].breakdown is None  # a different detail level is a different fingerprint
+    assert len(journal_path.read_text(encoding="utf-8").splitlines()) == 10
+
+
+def test_resume_drops_a_torn_last_line(tmp_path: Path) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware.yaml")
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    journal_path = tmp_path / "journal.jsonl"
+    with SweepJournal(journal_path) as journal:
+        estimate_sweep(model, hardware, stats, [64, 128], detail="metrics", journal=journal)
+    with journal_path.open("a", encoding="utf-8") as f:
+        f.write('{"fingerprint": "abc", "l_prompt": 2')
+
+    with SweepJournal(journal_path, resume=True) as journal:
+        fingerprint = sweep_fingerprint(model, hardware, stats, "metrics")
+        assert sorted(journal.completed(fingerprint)) == [64, 128]
+        estimate_sweep(model, hardware, stats, [64, 256], detail="metrics", journal=journal)
+    lines = journal_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["l_prompt"] for line in lines] == [64, 128, 256]
+
+
+def test_cli_checkpoint_and_resume(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    journal = tmp_path / "journal.jsonl"
+    args = [
+        "--model",
+        str(EXAMPLES / "model.yaml"),
+        "--hardware",
+        str(EXAMPLES / "hardware.yaml"),
+        "--stats",
+        str(EXAMPLES / "stats.json"),
+        "--prompt-lengths",
+        "64",
+        "128",
+        "--checkpoint",
+        str(journal),
+        "--output",
+    ]
+    assert main([*args, str(tmp_path / "first.json")]) == 0
+    assert main([*args, str(tmp_path / "again.json")]) == 2  # existing journal without --resume
+    assert main([*args, str(tmp_path / "resumed.json"), "--resume"]) == 0
+    first = json.loads((tmp_path / "first.json").read_text(encoding="utf-8"))
+    resumed = json.loads((tmp_path / "resumed.json").read_text(encoding="utf-8"))
+    first.pop("generated_at")
+    resumed.pop("generated_at")
+    assert resumed == first
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 2
+
+    with pytest.raises(SystemExit):
+        main([*args[:-3], "--resume"])
+    assert "--resume requires --checkpoint" in capsys.readouterr().err
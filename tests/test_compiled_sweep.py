@@ -0,0 +1,109 @@
+import pytest
+
+from selfspec_calculator.config import HardwareConfig, ModelConfig, ScheduleMode
+from selfspec_calculator.estimator import BASELINE_CACHE, estimate_point, estimate_sweep
+from selfspec_calculator.stats import SpeculationStats
+
+
+MODEL = {
+    "n_layers": 3,
+    "d_model": 64,
+    "n_heads": 8,
+    "activation_bits": 12,
+    "ffn_type": "swiglu",
+    "ffn_expansion": 4.0,
+    "draft_policy": {"per_layer": {1: {"qkv": "full", "ffn": "full"}}},
+}
+
+KNOB_HARDWARE = {
+    "reuse_policy": "reuse",
+    "library": "science_soc_v1",
+    "soc": {"schedule": "layer-pipelined"},
+    "memory": {"kv_cache": {"hbm": {"value_bytes_per_elem": 1}}},
+    "analog": {
+        "xbar_size": 128,
+        "num_columns_per_adc": 16,
+        "dac_bits": 4,
+        "adc": {"draft_bits": 4, "residual_bits": 12},
+    },
+}
+
+LEGACY_HARDWARE = {
+    "reuse_policy": "reread",
+    "soc": {"schedule": "layer-pipelined", "control": {"energy_pj_per_token": 1.0, "latency_ns_per_token": 2.0}},
+    "costs": {
+        "analog_draft": {"energy_pj_per_mac": 0.001, "latency_ns_per_mac": 0.001},
+        "analog_full": {"energy_pj_per_mac": 0.002, "latency_ns_per_mac": 0.0015},
+        "analog_verify_reuse": {"energy_pj_per_mac": 0.0006, "latency_ns_per_mac": 0.0008},
+        "digital_attention": {"energy_pj_per_mac": 0.0004, "latency_ns_per_mac": 0.0007},
+        "digital_softmax": {"energy_pj_per_mac": 0.00005, "latency_ns_per_mac": 0.00005},
+        "digital_elementwise": {"energy_pj_per_mac": 0.00002, "latency_ns_per_mac": 0.00002},
+        "kv_cache": {"energy_pj_per_mac": 0.0001, "latency_ns_per_mac": 0.0001},
+        "analog_weight_area": {"area_mm2_per_weight": 1e-9},
+    },
+    "memory": {"hbm": {"read_energy_pj_per_byte": 1.0, "read_bandwidth_GBps": 100.0, "read_latency_ns": 50.0}},
+}
+
+
+def _assert_payload_close(actual, expected) -> None:  # noqa: ANN001
+    if isinstance(expected, dict):
+        assert set(actual) == set(expected)
+        for key in expected:
+            _assert_payload_close(actual[key], expected[key])
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9)
+    else:
+        assert actual == expected
+
+
+@pytest.mark.parametrize("hardware_raw", [KNOB_HARDWARE, LEGACY_HARDWARE], ids=["knob", "legacy"])
+def test_compiled_sweep_matches_per_point_estimates(hardware_raw) -> None:  # noqa: ANN001
+    model = ModelConfig.model_validate(MODEL)
+    hardware = HardwareConfig.model_validate(hardware_raw)
+    stats = SpeculationStats(k=3, histogram={0: 1.0, 1: 2.0, 3: 4.0})
+    prompt_lengths = [0, 1, 17, 4096]
+
+    report = estimate_sweep(model=model, hardware=hardware, stats=stats, prompt_lengths=prompt_lengths)
+
+    for point, l_prompt in zip(report.points, prompt_lengths):
+        metrics, breakdown = estimate_point(model, hardware, stats, l_prompt)
+        _assert_payload_close(point.speculative.model_dump(), metrics.model_dump())
+        _assert_payload_close(point.breakdown.model_dump(), breakdown.model_dump())
+
+        baseline_metrics, baseline_breakdown = estimate_point(
+            model, hardware, SpeculationStats(k=0, histogram={0: 1.0}), l_prompt
+        )
+        _assert_payload_close(point.baseline.model_dump(), baseline_metrics.model_dump())
+        _assert_payload_close(point.baseline_breakdown.model_dump(), baseline_breakdown.model_dump())
+
+
+def test_compiled_sweep_still_enforces_context_capacity() -> None:
+    model = ModelConfig.model_validate(MODEL)
+    hardware = HardwareConfig.model_validate(
+        {**KNOB_HARDWARE, "memory": {"kv_cache": {"max_context_tokens": 64}}}
+    )
+    stats = SpeculationStats(k=3, histogram={0: 1.0})
+
+    with pytest.raises(ValueError, match=r"max_context_tokens"):
+        estimate_sweep(model=model, hardware=hardware, stats=stats, prompt_lengths=[32, 62])
+
+
+def test_baseline_is_shared_across_stats_for_the_same_configuration() -> None:
+    model = ModelConfig.model_validate(MODEL)
+    hardware = HardwareConfig.model_validate(KNOB_HARDWARE)
+    prompt_lengths = [8, 256]
+    BASELINE_CACHE.clear()
+
+    first = estimate_sweep(model, hardware, SpeculationStats(k=3, histogram={0: 1.0, 3: 1.0}), prompt_lengths)
+    assert (BASELINE_CACHE.hits, BASELINE_CACHE.misses) == (0, 2)
+
+    second = estimate_sweep(model, hardware, SpeculationStats(k=2, histogram={1: 1.0}), prompt_lengths)
+    assert (BASELINE_CACHE.hits, BASELINE_CACHE.misses) == (2, 2)
+    assert second.points[0].baseline_breakdown is first.points[0].baseline_breakdown  # shared, not copied
+    for point, l_prompt in zip(second.points, prompt_lengths):
+        baseline_metrics, _ = estimate_point(model, hardware, SpeculationStats(k=0, histogram={0: 1.0}), l_prompt)
+        _assert_payload_close(point.baseline.model_dump(), baseline_metrics.model_dump())
+
+    hardware.soc.schedule = ScheduleMode.serialized
+    estimate_sweep(model, hardware, SpeculationStats(k=2, histogram={1: 1.0}), prompt_lengths)
+    assert BASELINE_CACHE.misses == 4
@@ -0,0 +1,109 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import HardwareConfig, ModelConfig, ScheduleMode, _load_yaml
+from selfspec_calculator.depth import sweep_depth
+from selfspec_calculator.estimator import estimate_point
+from selfspec_calculator.stats import (
+    SpeculationStats,
+    expected_committed_tokens_geometric,
+    expected_committed_tokens_per_burst,
+    fit_acceptance_probability,
+    truncated_geometric_stats,
+)
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def test_truncated_geometric_model_and_fit() -> None:
+    for alpha in (0.0, 0.35, 0.9, 1.0):
+        for k in (0, 1, 4):
+            stats = truncated_geometric_stats(alpha, k)
+            assert expected_committed_tokens_per_burst(stats) == pytest.approx(
+                expected_committed_tokens_geometric(alpha, k)
+            )
+            if k > 0:
+                assert fit_acceptance_probability(stats) == pytest.approx(alpha)
+
+    assert fit_acceptance_probability(SpeculationStats(k=2, histogram={0: 1.0, 2: 1.0})) == pytest.approx(2.0 / 3.0)
+    with pytest.raises(ValueError, match="K=0"):
+        fit_acceptance_probability(SpeculationStats(k=0, histogram={0: 1.0}))
+    with pytest.raises(ValueError, match=r"\[0, 1\]"):
+        truncated_geometric_stats(1.5, 2)
+
+
+@pytest.mark.parametrize("hardware_file", ["hardware.yaml", "hardware_soc_memory.yaml", "hardware_legacy.yaml"])
+@pytest.mark.parametrize("schedule", ["serialized", "layer-pipelined"])
+def test_depth_sweep_matches_pointwise_estimates(hardware_file: str, schedule: str) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / hardware_file)
+    hardware = hardware.model_copy(
+        update={"soc": hardware.soc.model_copy(update={"schedule": ScheduleMode(schedule)})}
+    )
+    depth = sweep_depth(model, hardware, [0, 64, 2048], k_max=6, alpha=0.8)
+
+    for i, k in enumerate(depth.k_values):
+        for j, l_prompt in enumerate(depth.prompt_lengths):
+            metrics, _ = estimate_point(model, hardware, truncated_geometric_stats(0.8, int(k)), int(l_prompt))
+            for name, value in metrics.model_dump().items():
+                assert depth.metrics[name][i, j] == pytest.approx(value, rel=1e-9)
+
+    best = depth.best_k("throughput_tokens_per_s")
+    assert best.tolist() == (np.nanargmax(depth.metrics["throughput_tokens_per_s"], axis=0) + 1).tolist()
+    assert [row["throughput_tokens_per_s_optimal_k"] for row in depth.to_rows()] == best.tolist()
+
+
+def test_depth_sweep_with_certain_acceptance() -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    k_values = np.arange(1, 5)[:, None]
+    assert (expected_committed_tokens_geometric(1.0, k_values) == k_values + 1).all()
+
+    depth = sweep_depth(model, hardware, [0, 512], k_max=4, alpha=1.0)
+    for i, k in enumerate(depth.k_values):
+        metrics, _ = estimate_point(model, hardware, truncated_geometric_stats(1.0, int(k)), 512)
+        assert depth.metrics["energy_pj_per_token"][i, 1] == pytest.approx(metrics.energy_pj_per_token, rel=1e-9)
+
+
+def test_depth_sweep_skips_k_beyond_context_capacity() -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    raw = _load_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    raw["memory"].setdefault("kv_cache", {})["max_context_tokens"] = capacity = 256
+    hardware = HardwareConfig.model_validate(raw)
+    depth = sweep_depth(model, hardware, [capacity - 2, capacity], k_max=4, alpha=0.9)
+
+    assert np.isnan(depth.metrics["energy_pj_per_token"][2:, 0]).all()
+    assert depth.best_k("tokens_per_joule")[0] in (1, 2)
+    assert depth.to_rows()[1]["tokens_per_joule_optimal_k"] is None
+
+
+def test_cli_optimize_k(tmp_path: Path) -> None:
+    out = tmp_path / "depth.json"
+    args = [
+        "--model",
+        str(EXAMPLES / "model.yaml"),
+        "--hardware",
+        str(EXAMPLES / "hardware.yaml"),
+        "--stats",
+        str(EXAMPLES / "stats.json"),
+        "--prompt-lengths",
+        "64",
+        "1024",
+        "--optimize-k",
+        "8",
+        "--output",
+        str(out),
+    ]
+    assert main(args) == 0
+    payload = json.loads(out.read_text(encoding="utf-8"))
+    assert payload["alpha_source"] == "fitted" and 0.0 < payload["alpha"] < 1.0
+    assert [point["l_prompt"] for point in payload["points"]] == [64, 1024]
+    assert all(1 <= point["tokens_per_joule_optimal_k"] <= 8 for point in payload["points"])
+
+    assert main([*args, "--acceptance", "0.5"]) == 0
+    assert json.loads(out.read_text(encoding="utf-8"))["alpha"] == 0.5
@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import HardwareConfig, ModelConfig
+from selfspec_calculator.estimator import estimate_point, estimate_sweep
+from selfspec_calculator.stats import SpeculationStats
+
+
+MODEL = {
+    "n_layers": 4,
+    "d_model": 64,
+    "n_heads": 8,
+    "activation_bits": 12,
+    "ffn_type": "swiglu",
+    "ffn_expansion": 4.0,
+    "draft_policy": {"per_layer": {0: {"ffn": "full"}, 3: {"qkv": "full"}}},
+}
+
+KNOB = {
+    "reuse_policy": "reuse",
+    "library": "science_soc_v1",
+    "analog": {
+        "xbar_size": 128,
+        "num_columns_per_adc": 16,
+        "dac_bits": 4,
+        "adc": {"draft_bits": 4, "residual_bits": 12},
+    },
+}
+
+LEGACY = {
+    "reuse_policy": "reread",
+    "costs": {
+        "analog_draft": {"energy_pj_per_mac": 0.001, "latency_ns_per_mac": 0.001},
+        "analog_full": {"energy_pj_per_mac": 0.002, "latency_ns_per_mac": 0.0015},
+        "analog_verify_reuse": {"energy_pj_per_mac": 0.0006, "latency_ns_per_mac": 0.0008},
+        "digital_attention": {"energy_pj_per_mac": 0.0004, "latency_ns_per_mac": 0.0007},
+        "digital_softmax": {"energy_pj_per_mac": 0.00005, "latency_ns_per_mac": 0.00005},
+        "digital_elementwise": {"energy_pj_per_mac": 0.00002, "latency_ns_per_mac": 0.00002},
+        "kv_cache": {"energy_pj_per_mac": 0.0001, "latency_ns_per_mac": 0.0001},
+        "analog_weight_area": {"area_mm2_per_weight": 1e-9},
+    },
+}
+
+MEMORY = {"hbm": {"read_energy_pj_per_byte": 1.0, "read_bandwidth_GBps": 20.0, "read_latency_ns": 50.0}}
+
+
+@pytest.mark.parametrize("schedule", ["serialized", "layer-pipelined"])
+@pytest.mark.parametrize("memory", [None, MEMORY], ids=["no-memory", "memory"])
+@pytest.mark.parametrize("base", [KNOB, LEGACY], ids=["knob", "legacy"])
+def test_metrics_detail_matches_full_breakdown_path(base, memory, schedule) -> None:  # noqa: ANN001
+    model = ModelConfig.model_validate(MODEL)
+    raw = {**base, "soc": {"schedule": schedule}}
+    if memory is not None:
+        raw["memory"] = memory
+    hardware = HardwareConfig.model_validate(raw)
+    stats = SpeculationStats(k=3, histogram={0: 1.0, 2: 2.0, 3: 3.0})
+    prompt_lengths = [0, 7, 2048]
+
+    for l_prompt in prompt_lengths:
+        full, breakdown = estimate_point(model, hardware, stats, l_prompt)
+        lean, none = estimate_point(model, hardware, stats, l_prompt, detail="metrics")
+        assert breakdown is not None and none is None
+        for name, value in full.model_dump().items():
+            assert getattr(lean, name) == pytest.approx(value, rel=1e-12)
+
+    full_report = estimate_sweep(model, hardware, stats, prompt_lengths)
+    lean_report = estimate_sweep(model, hardware, stats, prompt_lengths, detail="metrics")
+    assert lean_report.break_even_tokens_per_joule_l_prompt == full_report.break_even_tokens_per_joule_l_prompt
+    for full_point, lean_point in zip(full_report.points, lean_report.points):
+        assert lean_point.breakdown is None and lean_point.baseline_breakdown is None
+        for section in ("speculative", "baseline", "delta"):
+            expected = getattr(full_point, section).model_dump()
+            actual = getattr(lean_point, section).model_dump()
+            assert actual == pytest.approx(expected, rel=1e-9)
+
+
+def test_unknown_detail_is_rejected() -> None:
+    model = ModelConfig.model_validate(MODEL)
+    hardware = HardwareConfig.model_validate(KNOB)
+    with pytest.raises(ValueError, match="detail level"):
+        estimate_point(model, hardware, SpeculationStats(k=1, histogram={1: 1.0}), 8, detail="stages")  # type: ignore[call-overload]
+
+
+def test_cli_metrics_detail_omits_breakdowns(tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    out = tmp_path / "report.json"
+    code = main(
+        [
+            "--model",
+            str(repo_root / "examples" / "model.yaml"),
+            "--hardware",
+            str(repo_root / "examples" / "hardware.yaml"),
+            "--stats",
+            str(repo_root / "examples" / "stats.json"),
+            "--prompt-lengths",
+            "64",
+            "128",
+            "--detail",
+            "metrics",
+            "--output",
+            str(out),
+        ]
+    )
+    assert code == 0
+    payload = json.loads(out.read_text(encoding="utf-8"))
+    assert [p["breakdown"] for p in payload["points"]] == [None, None]
+    assert payload["points"][0]["speculative"]["tokens_per_joule"] > 0
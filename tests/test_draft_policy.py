@@ -0,0 +1,89 @@
+import itertools
+
+import pytest
+
+from selfspec_calculator.config import HardwareConfig, ModelConfig
+from selfspec_calculator.draft_policy import BLOCKS, optimize_draft_policy
+from selfspec_calculator.estimator import estimate_point
+from selfspec_calculator.stats import SpeculationStats
+
+
+MODEL = {"n_layers": 3, "d_model": 64, "n_heads": 8, "activation_bits": 12, "ffn_type": "mlp", "ffn_expansion": 4.0}
+
+
+def _hardware(schedule: str) -> HardwareConfig:
+    return HardwareConfig.model_validate(
+        {
+            "reuse_policy": "reuse",
+            "library": "puma_like_v1",
+            "soc": {"schedule": schedule},
+            "memory": {"hbm": {"read_bandwidth_GBps": 200.0}},
+            "analog": {
+                "xbar_size": 128,
+                "num_columns_per_adc": 16,
+                "dac_bits": 4,
+                "adc": {"draft_bits": 4, "residual_bits": 12},
+            },
+        }
+    )
+
+
+def _with_full_blocks(model: ModelConfig, full: set[tuple[int, str]]) -> ModelConfig:
+    per_layer = {
+        layer: {block: "full" if (layer, block) in full else "draft" for block in BLOCKS}
+        for layer in {layer for layer, _block in full}
+    }
+    return ModelConfig.model_validate({**MODEL, "draft_policy": {"per_layer": per_layer}})
+
+
+@pytest.mark.parametrize("objective", ["energy_pj_per_token", "latency_ns_per_token"])
+@pytest.mark.parametrize("schedule", ["serialized", "layer-pipelined"])
+def test_plan_is_feasible_and_matches_full_estimate(schedule: str, objective: str) -> None:
+    model = ModelConfig.model_validate(MODEL)
+    hardware = _hardware(schedule)
+    stats = SpeculationStats(k=4, histogram={1: 1.0, 4: 2.0})
+    sensitivity = {0: {"qkv": 5.0, "ffn": 1.0}, 1: {"wo": 3.0}, 2: {"qkv": 0.5, "wo": 0.2, "ffn": 4.0}}
+    base, _ = estimate_point(model, hardware, stats, 256)
+    budget = getattr(base, objective) * 1.02
+
+    plan = optimize_draft_policy(model, hardware, stats, 256, sensitivity=sensitivity, budget=budget, objective=objective)
+
+    assert plan.all_draft_value == pytest.approx(getattr(base, objective), rel=1e-9)
+    metrics, _ = estimate_point(plan.apply_to(model), hardware, stats, 256)
+    assert plan.value == pytest.approx(getattr(metrics, objective), rel=1e-9)
+    assert plan.value <= budget
+    assert plan.sensitivity == pytest.approx(sum(sensitivity[layer][block] for layer, block in plan.full_blocks))
+    assert set(plan.draft_policy["per_layer"]) == {layer for layer, _block in plan.full_blocks}
+
+
+def test_energy_plan_is_optimal_for_uniform_scores_on_small_model() -> None:
+    model = ModelConfig.model_validate(MODEL)
+    hardware = _hardware("serialized")
+    stats = SpeculationStats(k=3, histogram={0: 1.0, 3: 1.0})
+    sensitivity = {layer: {block: 1.0 for block in BLOCKS} for layer in range(MODEL["n_layers"])}
+    base, _ = estimate_point(model, hardware, stats, 64)
+    budget = base.energy_pj_per_token * 1.05
+
+    plan = optimize_draft_policy(model, hardware, stats, 64, sensitivity=sensitivity, budget=budget)
+
+    pairs = [(layer, block) for layer in range(MODEL["n_layers"]) for block in BLOCKS]
+    best = 0
+    for r in range(len(pairs) + 1):
+        for subset in itertools.combinations(pairs, r):
+            metrics, _ = estimate_point(_with_full_blocks(model, set(subset)), hardware, stats, 64)
+            if metrics.energy_pj_per_token <= budget:
+                best = max(best, r)
+                break
+    assert len(plan.full_blocks) == best
+
+
+def test_infeasible_budget_and_bad_sensitivity_are_rejected() -> None:
+    model = ModelConfig.model_validate(MODEL)
+    hardware = _hardware("serialized")
+    stats = SpeculationStats(k=2, histogram={2: 1.0})
+    with pytest.raises(ValueError, match="exceeds the budget"):
+        optimize_draft_policy(model, hardware, stats, 64, sensitivity={}, budget=0.0)
+    with pytest.raises(ValueError, match="invalid layer index"):
+        optimize_draft_policy(model, hardware, stats, 64, sensitivity={3: {"qkv": 1.0}}, budget=1e12)
+    with pytest.raises(ValueError, match="unknown block"):
+        optimize_draft_policy(model, hardware, stats, 64, sensitivity={0: {"attn": 1.0}}, budget=1e12)
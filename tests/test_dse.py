@@ -0,0 +1,125 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import _load_yaml
+from selfspec_calculator.dse import apply_overrides, expand_grid, parse_sweep_arg, run_sweep
+from selfspec_calculator.io import load_speculation_stats
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+EXAMPLES = REPO_ROOT / "examples"
+
+
+def test_parse_and_expand_sweep_axes() -> None:
+    assert parse_sweep_arg("analog.adc.draft_bits=3, 4,5") == ("analog.adc.draft_bits", [3, 4, 5])
+    assert parse_sweep_arg("reuse_policy=reuse,reread") == ("reuse_policy", ["reuse", "reread"])
+    with pytest.raises(ValueError, match="--sweep"):
+        parse_sweep_arg("analog.dac_bits")
+
+    grid = list(expand_grid([("a", [1, 2]), ("model.b", ["x", "y", "z"])]))
+    assert len(grid) == 6
+    assert grid[:2] == [{"a": 1, "model.b": "x"}, {"a": 1, "model.b": "y"}]
+    with pytest.raises(ValueError, match="Duplicate"):
+        list(expand_grid([("a", [1]), ("a", [2])]))
+
+
+def test_apply_overrides_targets_model_or_hardware_without_mutating_base() -> None:
+    model_raw = {"n_layers": 2, "draft_policy": {"per_layer": {1: {"wo": "full"}}}}
+    hardware_raw = {"analog": {"adc": {"draft_bits": 4}}}
+
+    model, hardware = apply_overrides(
+        model_raw,
+        hardware_raw,
+        {
+            "model.n_layers": 8,
+            "model.draft_policy.per_layer.1.wo": "draft",
+            "analog.adc.draft_bits": 3,
+            "memory.hbm.read_bandwidth_GBps": 9.0,
+        },
+    )
+
+    assert model == {"n_layers": 8, "draft_policy": {"per_layer": {1: {"wo": "draft"}}}}
+    assert hardware == {"analog": {"adc": {"draft_bits": 3}}, "memory": {"hbm": {"read_bandwidth_GBps": 9.0}}}
+    assert model_raw["n_layers"] == 2 and hardware_raw["analog"]["adc"]["draft_bits"] == 4
+
+
+def test_parallel_sweep_streams_rows_in_grid_order() -> None:
+    kwargs = {
+        "model_raw": _load_yaml(EXAMPLES / "model.yaml"),
+        "hardware_raw": _load_yaml(EXAMPLES / "hardware.yaml"),
+        "stats": load_speculation_stats(EXAMPLES / "stats.json"),
+        "prompt_lengths": [64, 256],
+        "sweeps": [("analog.dac_bits", [1, 2, 3]), ("reuse_policy", ["reuse", "reread"])],
+        "detail": "metrics",
+    }
+
+    serial = list(run_sweep(**kwargs))
+    parallel = list(run_sweep(**kwargs, jobs=2))
+
+    assert [row["index"] for row in parallel] == list(range(6))
+    assert parallel == serial
+    assert all("dac_bits=3" in row["error"] for row in serial[4:])
+    assert all(row["report"]["break_even"] is None for row in serial[:4])  # not solved per combination
+    metrics = {tuple(row["overrides"].values()): row["report"]["points"][0]["speculative"] for row in serial[:4]}
+    assert metrics[(1, "reuse")] != metrics[(2, "reuse")]
+
+
+def test_parallel_sweep_consumes_combinations_lazily() -> None:
+    consumed = []
+
+    def samples():
+        for i in range(1000):
+            consumed.append(i)
+            yield {"analog.dac_bits": 4}
+
+    rows = run_sweep(
+        model_raw=_load_yaml(EXAMPLES / "model.yaml"),
+        hardware_raw=_load_yaml(EXAMPLES / "hardware.yaml"),
+        stats=load_speculation_stats(EXAMPLES / "stats.json"),
+        prompt_lengths=[64],
+        sweeps=[],
+        detail="metrics",
+        jobs=2,
+        samples=samples(),
+    )
+    first = [next(rows) for _ in range(3)]
+    assert [row["index"] for row in first] == [0, 1, 2]
+    assert len(consumed) <= 2 * 4 * 4 + 4  # the in-flight window, not the whole stream
+    rows.close()
+    assert len(consumed) < 1000
+
+
+def test_cli_sweep_writes_one_json_line_per_combination(tmp_path: Path) -> None:
+    out = tmp_path / "sweep.jsonl"
+    code = main(
+        [
+            "--model",
+            str(EXAMPLES / "model.yaml"),
+            "--hardware",
+            str(EXAMPLES / "hardware.yaml"),
+            "--stats",
+            str(EXAMPLES / "stats.json"),
+            "--prompt-lengths",
+            "128",
+            "--sweep",
+            "analog.adc.draft_bits=3,4",
+            "--sweep",
+            "model.n_layers=2,4",
+            "--output",
+            str(out),
+        ]
+    )
+
+    assert code == 0
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [row["overrides"] for row in rows] == [
+        {"analog.adc.draft_bits": 3, "model.n_layers": 2},
+        {"analog.adc.draft_bits": 3, "model.n_layers": 4},
+        {"analog.adc.draft_bits": 4, "model.n_layers": 2},
+        {"analog.adc.draft_bits": 4, "model.n_layers": 4},
+    ]
+    assert rows[1]["report"]["model_knobs"]["n_layers"] == 4
+    assert rows[0]["report"]["points"][0]["breakdown"] is not None
@@ -0,0 +1,107 @@
+import pytest
+
+from selfspec_calculator import Estimator
+from selfspec_calculator.config import HardwareConfig, ModelConfig, ScheduleMode
+from selfspec_calculator import estimator as estimator_module
+from selfspec_calculator.estimator import AffineFields, estimate_point, estimate_sweep
+from selfspec_calculator.stats import SpeculationStats
+
+
+MODEL = {
+    "n_layers": 3,
+    "d_model": 64,
+    "n_heads": 8,
+    "activation_bits": 12,
+    "ffn_type": "mlp",
+    "ffn_expansion": 4.0,
+    "draft_policy": {"per_layer": {1: {"wo": "full"}}},
+}
+
+HARDWARE = {
+    "reuse_policy": "reuse",
+    "library": "science_soc_v1",
+    "soc": {"schedule": "layer-pipelined"},
+    "memory": {"hbm": {"read_bandwidth_GBps": 40.0}},
+    "analog": {
+        "xbar_size": 128,
+        "num_columns_per_adc": 16,
+        "dac_bits": 4,
+        "adc": {"draft_bits": 4, "residual_bits": 12},
+    },
+}
+
+
+def test_estimator_evaluate_matches_estimate_point() -> None:
+    model = ModelConfig.model_validate(MODEL)
+    hardware = HardwareConfig.model_validate(HARDWARE)
+    estimator = Estimator(model, hardware)
+
+    for stats in (SpeculationStats(k=4, histogram={0: 1.0, 4: 3.0}), SpeculationStats(k=1, histogram={1: 1.0})):
+        for l_prompt in (0, 33, 8192):
+            expected_metrics, expected_breakdown = estimate_point(model, hardware, stats, l_prompt)
+            metrics, breakdown = estimator.evaluate(l_prompt, stats)
+            assert metrics.model_dump() == pytest.approx(expected_metrics.model_dump(), rel=1e-9)
+            assert breakdown.total.energy_pj == pytest.approx(expected_breakdown.total.energy_pj, rel=1e-9)
+            assert breakdown.verify_bonus.memory_traffic == expected_breakdown.verify_bonus.memory_traffic
+
+            lean, none = estimator.evaluate(l_prompt, stats, detail="metrics")
+            assert none is None
+            assert lean.model_dump() == pytest.approx(expected_metrics.model_dump(), rel=1e-9)
+
+
+def test_estimator_evaluate_many_matches_estimate_sweep_and_snapshots_configs() -> None:
+    model = ModelConfig.model_validate(MODEL)
+    hardware = HardwareConfig.model_validate(HARDWARE)
+    stats = SpeculationStats(k=2, histogram={0: 1.0, 2: 1.0})
+    estimator = Estimator(model, hardware)
+    expected = estimate_sweep(model, hardware, stats, [16, 512]).model_dump(mode="json")
+
+    hardware.soc.schedule = ScheduleMode.serialized
+    actual = estimator.evaluate_many([16, 512], stats).model_dump(mode="json")
+
+    for payload in (expected, actual):
+        payload.pop("generated_at")
+    assert actual == expected
+
+    for detail in ("full", "metrics"):
+        report = estimator.evaluate_many([16, 512], stats, detail=detail)
+        assert [estimator.evaluate_point(l_prompt, stats, detail) for l_prompt in (16, 512)] == report.points
+    with pytest.raises(ValueError, match="Unknown detail"):
+        estimator.evaluate_point(16, stats, "nope")
+
+
+def test_compiled_cost_accessors_are_affine_in_prompt_length() -> None:
+    estimator = Estimator(ModelConfig.model_validate(MODEL), HardwareConfig.model_validate(HARDWARE))
+    stats = SpeculationStats(k=2, histogram={0: 1.0, 2: 1.0})
+    assert isinstance(estimator.step_totals, AffineFields)
+    traffic = estimator.kv_traffic(stats)
+    _metrics, breakdown = estimator.evaluate(300, stats)
+    assert traffic["verify_bonus"].at(300) == pytest.approx(breakdown.verify_bonus.memory_traffic.model_dump())
+
+    no_memory = HardwareConfig.model_validate({key: value for key, value in HARDWARE.items() if key != "memory"})
+    assert Estimator(ModelConfig.model_validate(MODEL), no_memory).kv_traffic(stats) is None
+
+
+def test_partial_caches_reuse_unchanged_factors_across_configs() -> None:
+    model = ModelConfig.model_validate(MODEL)
+    stats = SpeculationStats(k=2, histogram={0: 1.0, 2: 1.0})
+    estimator_module.clear_caches()
+
+    reports = []
+    for bandwidth in (10.0, 40.0, 160.0):
+        raw = {**HARDWARE, "memory": {"hbm": {"read_bandwidth_GBps": bandwidth}}}
+        hardware = HardwareConfig.model_validate(raw)
+        reports.append(estimate_sweep(model, hardware, stats, [256], detail="metrics"))
+        expected, _ = estimate_point(model, hardware, stats, 256)
+        assert reports[-1].points[0].speculative.model_dump() == pytest.approx(expected.model_dump(), rel=1e-9)
+
+    assert (estimator_module.STEP_TOTALS_CACHE.misses, estimator_module.STEP_TOTALS_CACHE.hits) == (1, 2)
+    assert estimator_module.KV_TRAFFIC_CACHE.misses == 2  # speculative + baseline stats
+    assert estimator_module.AREA_CACHE.misses == 1
+    latencies = [r.points[0].speculative.latency_ns_per_token for r in reports]
+    assert latencies[0] > latencies[1] > latencies[2]
+
+    tweaked = HardwareConfig.model_validate({**HARDWARE, "analog": {**HARDWARE["analog"], "dac_bits": 2}})
+    estimate_sweep(model, tweaked, stats, [256], detail="metrics")
+    assert estimator_module.STEP_TOTALS_CACHE.misses == 2
+    assert estimator_module.KV_TRAFFIC_CACHE.misses == 2
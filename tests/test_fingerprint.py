@@ -0,0 +1,103 @@
+from pathlib import Path
+
+from selfspec_calculator.config import HardwareConfig, ModelConfig
+from selfspec_calculator.estimator import Estimator
+from selfspec_calculator.io import load_speculation_stats
+from selfspec_calculator.stats import SpeculationStats
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def _model_raw() -> dict:
+    return {
+        "name": "toy",
+        "n_layers": 2,
+        "d_model": 64,
+        "n_heads": 8,
+        "activation_bits": 12,
+        "ffn_expansion": 4.0,
+        "draft_policy": {"default": {"qkv": "draft"}, "per_layer": {0: {"qkv": "full"}}},
+    }
+
+
+def test_model_fingerprint_ignores_name_ffn_spelling_and_default_per_layer_entries() -> None:
+    base = ModelConfig.model_validate(_model_raw())
+    renamed = ModelConfig.model_validate({**_model_raw(), "name": "other"})
+    explicit_d_ff = ModelConfig.model_validate({**_model_raw(), "ffn_expansion": None, "d_ff": 256})
+    redundant = _model_raw()
+    redundant["draft_policy"]["per_layer"][1] = {"qkv": "draft", "wo": "draft", "ffn": "draft"}
+    assert base.fingerprint() == renamed.fingerprint() == explicit_d_ff.fingerprint()
+    assert base.fingerprint() == ModelConfig.model_validate(redundant).fingerprint()
+
+    wider = ModelConfig.model_validate({**_model_raw(), "d_ff": 512})
+    no_override = ModelConfig.model_validate({**_model_raw(), "draft_policy": {}})
+    assert len({base.fingerprint(), wider.fingerprint(), no_override.fingerprint()}) == 3
+
+
+def test_hardware_fingerprint_matches_after_library_defaults_are_spelled_out() -> None:
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    explicit = hardware.model_dump(mode="json")
+    explicit["memory"]["kv_cache"]["sram"] = explicit["memory"]["kv_cache"]["hbm"]
+    assert HardwareConfig.model_validate(explicit).fingerprint() == hardware.fingerprint()
+
+    other_library = {**explicit, "library": "puma_like_v1"}
+    assert HardwareConfig.model_validate(other_library).fingerprint() != hardware.fingerprint()
+
+    legacy = HardwareConfig.from_yaml(EXAMPLES / "hardware_legacy.yaml")
+    relabelled = HardwareConfig.model_validate({**legacy.model_dump(mode="json"), "library": "puma_like_v1"})
+    assert relabelled.fingerprint() == legacy.fingerprint()
+
+
+def test_stats_fingerprint_normalizes_histograms() -> None:
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    scaled = SpeculationStats(k=5, histogram={0: 4.0, 1: 4.0, 2: 2.0, 5: 18.0})
+    assert scaled.fingerprint() == stats.fingerprint()
+    assert SpeculationStats(k=6, histogram=scaled.histogram).fingerprint() != stats.fingerprint()
+    assert SpeculationStats(k=2, histogram={0: 3, 1: 6, 2: 9}).fingerprint() == (
+        SpeculationStats(k=2, histogram={0: 1, 1: 2, 2: 3}).fingerprint()
+    )
+    assert SpeculationStats(k=1, histogram={0: -0.0, 1: 1.0}).fingerprint() == (
+        SpeculationStats(k=1, histogram={1: 2.0}).fingerprint()
+    )
+
+
+def test_near_equal_configs_get_different_fingerprints() -> None:
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    nudged = hardware.model_copy(deep=True)
+    nudged.memory.hbm.read_energy_pj_per_byte = hardware.memory.hbm.read_energy_pj_per_byte + 1e-13
+    assert nudged != hardware
+    assert nudged.fingerprint() != hardware.fingerprint()
+
+    stats = SpeculationStats(k=4, histogram={0: 1, 4: 2})
+    assert SpeculationStats(k=4, histogram={0: 1.0000000000001, 4: 2}).fingerprint() != stats.fingerprint()
+    # 0.1 : 0.2 : 0.3 is not exactly 1 : 2 : 3 in binary floating point.
+    assert SpeculationStats(k=2, histogram={0: 0.1, 1: 0.2, 2: 0.3}).fingerprint() != (
+        SpeculationStats(k=2, histogram={0: 1, 1: 2, 2: 3}).fingerprint()
+    )
+
+
+def test_fingerprint_is_memoized_and_invalidated_by_edits() -> None:
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    before = hardware.fingerprint()
+    hardware.memory.hbm.read_bandwidth_GBps *= 2
+    after = hardware.fingerprint()
+    assert after != before
+    hardware.memory.hbm.read_bandwidth_GBps /= 2
+    assert hardware.fingerprint() == before
+    assert hardware.fingerprint() is hardware.fingerprint()  # memoized
+    assert hardware == HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")  # the memo is not content
+
+    stats = SpeculationStats(k=2, histogram={0: 1.0, 2: 1.0})
+    before = stats.fingerprint()
+    stats.histogram[1] = 1.0
+    assert stats.fingerprint() != before
+    del stats.histogram[1]
+    assert stats.fingerprint() == before
+
+
+def test_estimator_baseline_cache_shares_equivalent_configs() -> None:
+    model = ModelConfig.model_validate(_model_raw())
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    renamed = ModelConfig.model_validate({**_model_raw(), "name": "other"})
+    assert Estimator(model, hardware)._config_key == Estimator(renamed, hardware)._config_key
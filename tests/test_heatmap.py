@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import HardwareConfig, ModelConfig, _load_yaml
+from selfspec_calculator.depth import sweep_depth
+from selfspec_calculator.heatmap import write_heatmap
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def test_heatmap_matches_depth_sweep(tmp_path: Path) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    raw = _load_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    raw["memory"].setdefault("kv_cache", {})["max_context_tokens"] = 300
+    hardware = HardwareConfig.model_validate(raw)
+    lengths = np.arange(0, 301, 7)
+    sidecar = write_heatmap(
+        model,
+        hardware,
+        tmp_path,
+        k_values=range(1, 9),
+        prompt_lengths=lengths,
+        alpha=0.7,
+        metrics=["tokens_per_joule", "energy_pj_per_token"],
+        chunk_size=5,
+    )
+
+    depth = sweep_depth(model, hardware, lengths, k_max=8, alpha=0.7)
+    for name, file in sidecar["arrays"].items():
+        grid = np.load(tmp_path / file, mmap_mode="r")
+        assert isinstance(grid, np.memmap) and grid.shape == (8, lengths.size)
+        np.testing.assert_allclose(grid, depth.metrics[name], rtol=1e-12)
+        assert np.isnan(grid[-1, -1])
+    assert np.load(tmp_path / sidecar["rows"]["file"]).tolist() == list(range(1, 9))
+    assert np.load(tmp_path / sidecar["columns"]["file"]).tolist() == lengths.tolist()
+    assert json.loads((tmp_path / "heatmap.json").read_text(encoding="utf-8")) == sidecar
+    assert sidecar["shape"] == [8, lengths.size] and sidecar["columns"]["max"] == 294
+
+    with pytest.raises(ValueError, match="Unknown metrics"):
+        write_heatmap(model, hardware, tmp_path, k_values=[1], prompt_lengths=[0], alpha=0.7, metrics=["nope"])
+
+
+@pytest.mark.parametrize("alpha", [0.0, 0.5, 0.99, 1.0])
+def test_heatmap_over_acceptance_range(tmp_path: Path, alpha: float) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    lengths = [0, 64, 1024]
+    sidecar = write_heatmap(model, hardware, tmp_path, k_values=range(1, 5), prompt_lengths=lengths, alpha=alpha)
+
+    depth = sweep_depth(model, hardware, lengths, k_max=4, alpha=alpha)
+    for name, file in sidecar["arrays"].items():
+        np.testing.assert_allclose(np.load(tmp_path / file), depth.metrics[name], rtol=1e-12)
+
+
+def test_cli_heatmap(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    args = [
+        "heatmap",
+        "--model",
+        str(EXAMPLES / "model.yaml"),
+        "--hardware",
+        str(EXAMPLES / "hardware.yaml"),
+        "--k-max",
+        "4",
+        "--prompt-range",
+        "0",
+        "1000",
+        "100",
+        "--output-dir",
+        str(tmp_path),
+    ]
+    assert main([*args, "--acceptance", "0.6"]) == 0
+    assert json.loads(capsys.readouterr().out) == {
+        "latency_ns_per_token": "latency_ns_per_token.npy",
+        "tokens_per_joule": "tokens_per_joule.npy",
+    }
+    assert np.load(tmp_path / "tokens_per_joule.npy").shape == (4, 10)
+    assert json.loads((tmp_path / "heatmap.json").read_text(encoding="utf-8"))["alpha"] == 0.6
+    assert main([*args, "--acceptance", "1.0"]) == 0
+    capsys.readouterr()
+
+    with pytest.raises(SystemExit):
+        main(args)
+    assert "exactly one of --stats or --acceptance" in capsys.readouterr().err
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import pytest
+
+from selfspec_calculator.config import HardwareConfig, ModelConfig, _load_yaml
+from selfspec_calculator.dse import apply_overrides, expand_grid
+from selfspec_calculator.estimator import Estimator
+from selfspec_calculator.inverse import default_monotonicity, inverse_design, parse_constraint
+from selfspec_calculator.io import load_speculation_stats
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+AXES = [
+    ("analog.xbar_size", [64, 128]),
+    ("analog.num_columns_per_adc", [4, 8, 16]),
+    ("analog.dac_bits", [2, 4, 8]),
+    ("analog.adc.draft_bits", [3, 4, 8]),
+    ("analog.adc.residual_bits", [8, 12, 16]),
+]
+
+
+def _brute_force(model_raw: dict, hardware_raw: dict, stats, l_prompt: int) -> list[dict[str, float]]:
+    rows = []
+    for overrides in expand_grid(AXES):
+        model_cfg, hardware_cfg = apply_overrides(model_raw, hardware_raw, overrides)
+        estimator = Estimator(ModelConfig.model_validate(model_cfg), HardwareConfig.model_validate(hardware_cfg))
+        metrics, _ = estimator.evaluate(l_prompt, stats, detail="metrics")
+        rows.append({**metrics.model_dump(), "on_chip_mm2": estimator._metadata["area_breakdown_mm2"].on_chip_mm2})
+    return rows
+
+
+def test_inverse_design_matches_brute_force_and_prunes() -> None:
+    model_raw = _load_yaml(EXAMPLES / "model.yaml")
+    hardware_raw = _load_yaml(EXAMPLES / "hardware.yaml")
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    rows = _brute_force(model_raw, hardware_raw, stats, 256)
+    throughputs = sorted(row["throughput_tokens_per_s"] for row in rows)
+    areas = sorted(row["on_chip_mm2"] for row in rows)
+
+    cases = [
+        ("on_chip_mm2", [f"throughput_tokens_per_s>={throughputs[len(rows) * 3 // 4]}"], min),
+        ("energy_pj_per_token", [f"on_chip_mm2<={areas[len(rows) // 3]}"], min),
+        ("throughput_tokens_per_s", [f"on_chip_mm2<={areas[len(rows) // 2]}"], max),
+    ]
+    for objective, constraints, pick in cases:
+        result = inverse_design(
+            model_raw=model_raw,
+            hardware_raw=hardware_raw,
+            stats=stats,
+            l_prompt=256,
+            axes=AXES,
+            constraints=constraints,
+            objective=objective,
+        )
+        parsed = [parse_constraint(c) for c in constraints]
+        expected = pick(row[objective] for row in rows if all(c.satisfied_by(row[c.quantity]) for c in parsed))
+        assert result.best is not None
+        assert result.best[objective] == pytest.approx(expected)
+        assert all(c.satisfied_by(result.best[c.quantity]) for c in parsed)
+        assert result.candidates == len(rows)
+        assert result.evaluated + result.pruned == result.candidates
+        assert result.pruned > 0
+
+    infeasible = inverse_design(
+        model_raw=model_raw,
+        hardware_raw=hardware_raw,
+        stats=stats,
+        l_prompt=256,
+        axes=AXES,
+        constraints=[f"throughput_tokens_per_s>={throughputs[-1] * 2}"],
+    )
+    assert infeasible.best is None and infeasible.best_overrides is None
+
+
+def test_default_monotonicity_and_constraint_parsing() -> None:
+    hints = default_monotonicity({"library": "puma_like_v1"}, AXES)
+    assert "analog.xbar_size" not in hints
+    assert hints["analog.num_columns_per_adc"] == {"on_chip_mm2": -1}
+    assert hints["analog.adc.residual_bits"]["energy_pj_per_token"] == 1
+    assert hints["analog.adc.residual_bits"]["throughput_tokens_per_s"] == -1
+    assert default_monotonicity({}, [*AXES, ("library", ["puma_like_v1", "puma_like_v2"])]) == {}
+
+    assert str(parse_constraint("throughput_tokens_per_s >= 2e6")) == "throughput_tokens_per_s>=2e+06"
+    with pytest.raises(ValueError, match="Unknown quantity"):
+        parse_constraint("area>=1")
+    with pytest.raises(ValueError, match="Invalid constraint"):
+        parse_constraint("on_chip_mm2==1")
@@ -0,0 +1,126 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import HardwareConfig, ModelConfig, _load_yaml
+from selfspec_calculator.estimator import estimate_sweep
+from selfspec_calculator.io import load_speculation_stats
+from selfspec_calculator.parallel import ProcessSweepExecutor, guided_chunks
+from selfspec_calculator.report import Report
+from selfspec_calculator.stats import SpeculationStats
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def _payload(report: Report) -> dict:
+    payload = report.model_dump(mode="json")
+    payload.pop("generated_at")
+    return payload
+
+
+def test_guided_chunks_cover_the_range_with_shrinking_chunks() -> None:
+    chunks = guided_chunks(1000, 4)
+    assert chunks[0] == (0, 125)
+    assert [start for start, _stop in chunks[1:]] == [stop for _start, stop in chunks[:-1]]
+    assert chunks[-1][1] == 1000
+    sizes = [stop - start for start, stop in chunks]
+    assert sizes == sorted(sizes, reverse=True)
+    assert all(size >= 16 for size in [stop - start for start, stop in guided_chunks(1000, 4, 16)][:-1])
+    assert guided_chunks(0, 4) == []
+
+
+@pytest.mark.parametrize("detail", ["full", "metrics"])
+def test_executor_matches_serial_sweep_in_order(detail: str) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    lengths = [512, 0, 64, 4096, 7, 1000, 2048, 3, 256, 128, 33]
+
+    serial = estimate_sweep(model, hardware, stats, lengths, detail=detail)
+    with ProcessSweepExecutor(2, min_chunk=1) as executor:
+        parallel = estimate_sweep(model, hardware, stats, lengths, detail=detail, executor=executor)
+        pool = executor._pool
+        again = estimate_sweep(model, hardware, stats, lengths[:3], detail=detail, executor=executor)
+        assert executor._pool is pool  # same configs: workers are reused
+        other = SpeculationStats(k=2, histogram={0: 1.0, 2: 1.0})
+        estimate_sweep(model, hardware, other, lengths[:3], detail=detail, executor=executor)
+        assert executor._pool is not pool
+    assert executor._pool is None
+
+    assert [point.l_prompt for point in parallel.points] == lengths
+    assert _payload(parallel) == _payload(serial)
+    assert _payload(again)["points"] == _payload(serial)["points"][:3]
+
+
+def test_imap_streams_in_order_and_restarts_for_a_new_initializer() -> None:
+    with ProcessSweepExecutor(2, min_chunk=3) as executor:
+        assert list(executor.imap(abs, (-i for i in range(50)), initializer=int, initargs=())) == list(range(50))
+        pool = executor._pool
+        assert list(executor.imap(abs, [-1, -2], initializer=int, initargs=())) == [1, 2]
+        assert executor._pool is pool
+        assert list(executor.imap(abs, [-3], initializer=float, initargs=())) == [3]
+        assert executor._pool is not pool
+
+
+def test_executor_propagates_evaluation_errors() -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    raw = _load_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    raw["memory"].setdefault("kv_cache", {})["max_context_tokens"] = 100
+    hardware = HardwareConfig.model_validate(raw)
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    with ProcessSweepExecutor(2, min_chunk=1) as executor:
+        with pytest.raises(ValueError, match="Max context capacity exceeded"):
+            estimate_sweep(model, hardware, stats, [0, 10, 200, 20], executor=executor)
+    with pytest.raises(ValueError, match="jobs"):
+        ProcessSweepExecutor(0)
+
+
+def test_cli_jobs_matches_serial(tmp_path: Path) -> None:
+    args = [
+        "--model",
+        str(EXAMPLES / "model.yaml"),
+        "--hardware",
+        str(EXAMPLES / "hardware.yaml"),
+        "--stats",
+        str(EXAMPLES / "stats.json"),
+        "--prompt-lengths",
+        "64",
+        "128",
+        "256",
+        "--output",
+    ]
+    assert main([*args, str(tmp_path / "serial.json")]) == 0
+    assert main([*args, str(tmp_path / "parallel.json"), "--jobs", "2"]) == 0
+    serial = json.loads((tmp_path / "serial.json").read_text(encoding="utf-8"))
+    parallel = json.loads((tmp_path / "parallel.json").read_text(encoding="utf-8"))
+    serial.pop("generated_at")
+    parallel.pop("generated_at")
+    assert parallel == serial
+
+
+@pytest.mark.parametrize(
+    ("extra", "message"),
+    [
+        (["--jobs", "0"], "--jobs must be >= 1"),
+        (["--jobs", "0", "--sweep", "analog.dac_bits=1,2"], "--jobs must be >= 1"),
+        (["--jobs", "2", "--stats", str(EXAMPLES / "stats*.json")], "--jobs applies to"),  # a batch
+        (["--jobs", "2", "--optimize-k", "4"], "--jobs applies to"),
+    ],
+)
+def test_cli_rejects_jobs_it_would_ignore(extra: list[str], message: str, capsys: pytest.CaptureFixture[str]) -> None:
+    args = [
+        "--model",
+        str(EXAMPLES / "model.yaml"),
+        "--hardware",
+        str(EXAMPLES / "hardware.yaml"),
+        "--stats",
+        str(EXAMPLES / "stats.json"),
+        "--prompt-lengths",
+        "64",
+    ]
+    with pytest.raises(SystemExit):
+        main([*args, *extra])
+    assert message in capsys.readouterr().err
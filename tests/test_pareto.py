@@ -0,0 +1,99 @@
+import json
+import random
+from pathlib import Path
+
+from selfspec_calculator.cli import main
+from selfspec_calculator.dse import pareto_front_rows
+from selfspec_calculator.pareto import ParetoFront, dominates
+
+
+def test_incremental_front_matches_brute_force() -> None:
+    rng = random.Random(7)
+    for _ in range(50):
+        points = [tuple(float(rng.randint(0, 8)) for _ in range(3)) for _ in range(80)]
+        front: ParetoFront[int] = ParetoFront()
+        for i, point in enumerate(points):
+            front.add(point, i)
+
+        expected = {p for p in points if not any(dominates(q, p) for q in points)}
+        members = list(front)
+        assert {objectives for objectives, _ in members} == expected
+        assert len(members) == len(expected)  # duplicates are kept once
+        assert all(points[i] == objectives for objectives, i in members)
+        assert front.offered == len(points)
+
+
+def test_two_objective_and_large_fronts_match_brute_force() -> None:
+    rng = random.Random(11)
+    two = [(float(rng.randint(0, 50)), float(rng.randint(0, 50))) for _ in range(400)]
+    # Near a plane most points trade off against each other, so the front grows past the vectorization threshold.
+    pairs = [(rng.randint(0, 30), rng.randint(0, 30)) for _ in range(400)]
+    plane = [(float(a), float(b), float(60 - a - b + rng.randint(0, 2))) for a, b in pairs]
+    for points in (two, plane):
+        front: ParetoFront[int] = ParetoFront()
+        for i, point in enumerate(points):
+            front.add(point, i)
+        expected = {p for p in points if not any(dominates(q, p) for q in points)}
+        members = list(front)
+        assert [objectives for objectives, _ in members] == sorted(expected)
+        assert all(points[i] == objectives for objectives, i in members)
+    assert len(front) > 64
+
+
+def test_pareto_front_rows_is_per_prompt_length_and_skips_errors() -> None:
+    def row(index: int, area: float, per_l: dict[int, tuple[float, float]]) -> dict:
+        points = [
+            {"l_prompt": l, "speculative": {"energy_pj_per_token": e, "latency_ns_per_token": t}}
+            for l, (e, t) in per_l.items()
+        ]
+        return {
+            "index": index,
+            "overrides": {"analog.dac_bits": index},
+            "report": {"area_breakdown_mm2": {"on_chip_mm2": area}, "points": points},
+        }
+
+    rows = [
+        row(0, 1.0, {64: (10.0, 10.0), 512: (30.0, 30.0)}),
+        {"index": 1, "overrides": {"analog.dac_bits": 3}, "error": "not in library"},
+        row(2, 1.0, {64: (9.0, 9.0), 512: (31.0, 29.0)}),
+        row(3, 0.5, {64: (50.0, 50.0), 512: (50.0, 50.0)}),
+    ]
+
+    front = list(pareto_front_rows(iter(rows)))
+
+    assert [(r["l_prompt"], r["index"]) for r in front] == [(64, 2), (64, 3), (512, 0), (512, 2), (512, 3)]
+    assert front[0]["objectives"] == {"energy_pj_per_token": 9.0, "latency_ns_per_token": 9.0, "on_chip_mm2": 1.0}
+
+
+def test_cli_pareto_emits_only_non_dominated_rows(tmp_path: Path) -> None:
+    examples = Path(__file__).resolve().parents[1] / "examples"
+    argv = [
+        "--model",
+        str(examples / "model.yaml"),
+        "--hardware",
+        str(examples / "hardware.yaml"),
+        "--stats",
+        str(examples / "stats.json"),
+        "--prompt-lengths",
+        "128",
+        "--sweep",
+        "analog.dac_bits=1,2,4",
+        "--sweep",
+        "analog.xbar_size=64,128",
+    ]
+    all_out = tmp_path / "all.jsonl"
+    front_out = tmp_path / "front.jsonl"
+    assert main([*argv, "--detail", "metrics", "--output", str(all_out)]) == 0
+    assert main([*argv, "--pareto", "--output", str(front_out)]) == 0
+
+    candidates = {}
+    for line in all_out.read_text(encoding="utf-8").splitlines():
+        r = json.loads(line)
+        metrics = r["report"]["points"][0]["speculative"]
+        area = r["report"]["area_breakdown_mm2"]["on_chip_mm2"]
+        candidates[r["index"]] = (metrics["energy_pj_per_token"], metrics["latency_ns_per_token"], area)
+    expected = {i for i, c in candidates.items() if not any(dominates(o, c) for o in candidates.values())}
+
+    front = [json.loads(line) for line in front_out.read_text(encoding="utf-8").splitlines()]
+    assert {r["index"] for r in front} == expected
+    assert 0 < len(front) < len(candidates)
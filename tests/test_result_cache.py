@@ -0,0 +1,157 @@
+import itertools
+import json
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from selfspec_calculator import cache as cache_module
+from selfspec_calculator.cache import ResultCache, result_key
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import HardwareConfig, ModelConfig, _load_yaml
+from selfspec_calculator.dse import parse_sweep_arg, run_sweep
+from selfspec_calculator.estimator import estimate_sweep
+from selfspec_calculator.io import load_speculation_stats
+from selfspec_calculator.report import Report
+from selfspec_calculator.stats import SpeculationStats
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+LENGTHS = [512, 0, 64, 4096, 128, 64]
+
+
+def _payload(report: Report) -> dict:
+    payload = report.model_dump(mode="json")
+    payload.pop("generated_at")
+    return payload
+
+
+@pytest.mark.parametrize("detail", ["full", "metrics"])
+def test_cached_sweep_matches_uncached_and_counts_hits(tmp_path: Path, detail: str) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    expected = _payload(estimate_sweep(model, hardware, stats, LENGTHS, detail=detail))
+
+    with ResultCache(tmp_path) as cache:
+        cold = estimate_sweep(model, hardware, stats, LENGTHS, detail=detail, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 5)
+        warm = estimate_sweep(model, hardware, stats, LENGTHS, detail=detail, cache=cache)
+        assert (cache.hits, cache.misses) == (5, 5)
+        other = SpeculationStats(k=2, histogram={0: 1.0, 2: 1.0})
+        estimate_sweep(model, hardware, other, LENGTHS[:2], detail=detail, cache=cache)
+        assert (cache.hits, cache.misses) == (5, 7)
+        assert len(cache) == 7
+    assert _payload(cold) == expected
+    assert _payload(warm) == expected
+
+    with ResultCache(tmp_path) as reopened:  # persists across instances
+        assert _payload(estimate_sweep(model, hardware, stats, LENGTHS, detail=detail, cache=reopened)) == expected
+        assert (reopened.hits, reopened.misses) == (5, 0)
+
+
+def test_keys_separate_detail_levels_and_package_versions(monkeypatch: pytest.MonkeyPatch) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware.yaml")
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    key = result_key(model, hardware, stats, "full")
+    assert result_key(model, hardware, stats, "metrics") != key
+    renamed = ModelConfig.model_validate({**model.model_dump(), "name": "renamed"})
+    assert result_key(renamed, hardware, stats, "full") == key
+    monkeypatch.setattr(cache_module, "PACKAGE_VERSION", "0.0.0-other")
+    assert result_key(model, hardware, stats, "full") != key
+
+
+def test_size_cap_evicts_least_recently_used_points(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware.yaml")
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    points = estimate_sweep(model, hardware, stats, [0, 1, 2, 3], detail="metrics").points
+    size = max(len(point.model_dump_json()) for point in points)
+    clock = itertools.count(1000.0, cache_module._TOUCH_INTERVAL_S)  # every hit is old enough to be refreshed
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+
+    with ResultCache(tmp_path, max_bytes=3 * size) as cache:
+        for point in points[:3]:
+            cache.put_many("key", [point])
+        assert sorted(cache.get_many("key", [0])) == [0]  # refreshes 0: 1 is now the least recently used
+        cache.put_many("key", [points[3]])
+        assert sorted(cache.get_many("key", [0, 1, 2, 3])) == [0, 2, 3]
+        assert cache.size_bytes <= 3 * size
+        cache.clear()
+        assert len(cache) == 0 and cache.size_bytes == 0
+
+
+def test_hits_refresh_recency_coarsely_and_never_wait_for_writers(tmp_path: Path) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware.yaml")
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    points = estimate_sweep(model, hardware, stats, [0, 1], detail="metrics").points
+
+    with ResultCache(tmp_path, timeout_s=30) as cache:
+        cache.put_many("key", points)
+        db = cache._connection()
+        db.execute("UPDATE points SET last_used = 0")
+        assert sorted(cache.get_many("key", [0])) == [0]  # stale: refreshed
+        assert db.execute("SELECT last_used FROM points WHERE l_prompt = 0").fetchone()[0] > 0
+
+        other = sqlite3.connect(cache.path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")  # another process is writing
+        started = time.monotonic()
+        assert sorted(cache.get_many("key", [0, 1])) == [0, 1]
+        assert time.monotonic() - started < 5  # skipped the refresh of 1 instead of waiting up to `timeout_s`
+        other.execute("ROLLBACK")
+        other.close()
+        assert db.execute("SELECT last_used FROM points WHERE l_prompt = 1").fetchone()[0] == 0
+        assert db.execute("PRAGMA busy_timeout").fetchone()[0] == 30_000  # writes still wait up to `timeout_s`
+
+
+def test_concurrent_workers_share_one_cache(tmp_path: Path) -> None:
+    common = {
+        "model_raw": _load_yaml(EXAMPLES / "model.yaml"),
+        "hardware_raw": _load_yaml(EXAMPLES / "hardware_soc_memory.yaml"),
+        "stats": load_speculation_stats(EXAMPLES / "stats.json"),
+        "prompt_lengths": [0, 64, 128],
+        "sweeps": [parse_sweep_arg("analog.dac_bits=1,2,4"), parse_sweep_arg("analog.xbar_size=128,256")],
+        "detail": "metrics",
+    }
+    expected = list(run_sweep(**common))
+    cache = ResultCache(tmp_path)
+    assert pickle.loads(pickle.dumps(cache)).path == cache.path
+    assert list(run_sweep(**common, jobs=3, cache=cache)) == expected
+    assert len(cache) == 6 * 3
+    assert list(run_sweep(**common, jobs=3, cache=cache)) == expected
+    assert len(cache) == 6 * 3
+    cache.close()
+
+
+def test_cli_cache_dir_reports_hits_and_misses(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    args = [
+        "--model",
+        str(EXAMPLES / "model.yaml"),
+        "--hardware",
+        str(EXAMPLES / "hardware.yaml"),
+        "--stats",
+        str(EXAMPLES / "stats.json"),
+        "--prompt-lengths",
+        "64",
+        "128",
+        "--cache-dir",
+        str(tmp_path / "cache"),
+        "--output",
+    ]
+    assert main([*args, str(tmp_path / "first.json")]) == 0
+    assert "cache: 0 hits, 2 misses" in capsys.readouterr().err
+    assert main([*args, str(tmp_path / "second.json")]) == 0
+    assert "cache: 2 hits, 0 misses" in capsys.readouterr().err
+    first = json.loads((tmp_path / "first.json").read_text(encoding="utf-8"))
+    second = json.loads((tmp_path / "second.json").read_text(encoding="utf-8"))
+    first.pop("generated_at")
+    second.pop("generated_at")
+    assert second == first
+
+    with pytest.raises(SystemExit):
+        main([*args[:-3], "--cache-max-mb", "10", "--output", str(tmp_path / "x.json")])
+    assert "--cache-max-mb requires --cache-dir" in capsys.readouterr().err
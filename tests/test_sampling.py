@@ -0,0 +1,138 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import _load_yaml
+from selfspec_calculator.dse import evaluate_overrides, run_sweep
+from selfspec_calculator.io import load_speculation_stats
+from selfspec_calculator.sampling import parse_sample_axis, precheck, sample_overrides, unit_samples
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def test_parse_sample_axis() -> None:
+    axis = parse_sample_axis("analog.adc.residual_bits=6..12")
+    assert (axis.low, axis.high, axis.integer) == (6, 12, True)
+    assert [axis.value(u) for u in (0.0, 0.5, 0.999)] == [6, 9, 12]
+    assert parse_sample_axis("memory.hbm.read_bandwidth_GBps=100..400.0").value(0.5) == pytest.approx(250.0)
+    assert parse_sample_axis("reuse_policy=reuse,reread").choices == ("reuse", "reread")
+    for bad in ("analog.dac_bits", "analog.dac_bits=4..2", "analog.dac_bits=a..b"):
+        with pytest.raises(ValueError):
+            parse_sample_axis(bad)
+
+
+@pytest.mark.parametrize("method", ["random", "lhs", "halton"])
+def test_unit_samples_are_reproducible_and_in_range(method: str) -> None:
+    points = unit_samples(64, 3, method, seed=7)
+    assert points.shape == (64, 3) and ((points >= 0) & (points < 1)).all()
+    np.testing.assert_array_equal(points, unit_samples(64, 3, method, seed=7))
+    if method == "lhs":
+        for column in points.T:
+            assert sorted(np.floor(column * 64).astype(int).tolist()) == list(range(64))
+
+
+def test_halton_sequence() -> None:
+    np.testing.assert_allclose(unit_samples(3, 2, "halton"), [[1 / 2, 1 / 3], [1 / 4, 2 / 3], [3 / 4, 1 / 9]])
+    with pytest.raises(ValueError, match="Unknown sampler"):
+        unit_samples(3, 2, "sobol")
+
+
+def test_precheck_rules() -> None:
+    hardware_raw = _load_yaml(EXAMPLES / "hardware.yaml")
+    assert precheck(hardware_raw, 4, [64]) is None
+
+    bad_columns = {**hardware_raw, "analog": {**hardware_raw["analog"], "num_columns_per_adc": 24}}
+    assert "divisible" in precheck(bad_columns, 4, [64])
+    bad_bits = {**hardware_raw, "analog": {**hardware_raw["analog"], "dac_bits": 7}}
+    assert "analog.dac_bits=7" in precheck(bad_bits, 4, [64])
+    assert "Unknown hardware library" in precheck({**hardware_raw, "library": "nope"}, 4, [64])
+    capped = {**hardware_raw, "memory": {"kv_cache": {"max_context_tokens": 66}}}
+    assert precheck(capped, 2, [64]) is None
+    assert "capacity" in precheck(capped, 4, [32, 64])
+
+
+def test_sampled_sweep_rejects_infeasible_samples_before_validation() -> None:
+    model_raw = _load_yaml(EXAMPLES / "model.yaml")
+    hardware_raw = _load_yaml(EXAMPLES / "hardware.yaml")
+    stats = load_speculation_stats(EXAMPLES / "stats.json")
+    axes = [
+        parse_sample_axis("analog.num_columns_per_adc=8,16,24,32"),
+        parse_sample_axis("analog.adc.residual_bits=6..16"),
+    ]
+    samples = sample_overrides(axes, 24, method="lhs", seed=3)
+    rows = list(
+        run_sweep(
+            model_raw=model_raw,
+            hardware_raw=hardware_raw,
+            stats=stats,
+            prompt_lengths=[64],
+            sweeps=[],
+            samples=samples,
+            detail="metrics",
+        )
+    )
+
+    assert [row["overrides"] for row in rows] == samples
+    rejected = [row for row in rows if row.get("rejected")]
+    assert rejected and any("report" in row for row in rows)
+    for row in rows:
+        kwargs = {"model_raw": model_raw, "hardware_raw": hardware_raw, "overrides": row["overrides"]}
+        if row.get("rejected"):
+            with pytest.raises(ValueError):
+                evaluate_overrides(**kwargs, stats=stats, prompt_lengths=[64], detail="metrics")
+        elif "report" in row:
+            report = evaluate_overrides(**kwargs, stats=stats, prompt_lengths=[64], detail="metrics")
+            assert row["report"]["points"] == report.model_dump(mode="json")["points"]
+
+    with pytest.raises(ValueError, match="either sweeps or samples"):
+        next(
+            run_sweep(
+                model_raw=model_raw,
+                hardware_raw=hardware_raw,
+                stats=stats,
+                prompt_lengths=[64],
+                sweeps=[("analog.dac_bits", [1])],
+                samples=samples,
+            )
+        )
+
+
+def test_cli_sample(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    out = tmp_path / "sample.jsonl"
+    args = [
+        "--model",
+        str(EXAMPLES / "model.yaml"),
+        "--hardware",
+        str(EXAMPLES / "hardware.yaml"),
+        "--stats",
+        str(EXAMPLES / "stats.json"),
+        "--prompt-lengths",
+        "64",
+        "--detail",
+        "metrics",
+        "--sample",
+        "6",
+        "--sampler",
+        "random",
+        "--seed",
+        "1",
+        "--sweep",
+        "analog.adc.draft_bits=3..5",
+        "--sweep",
+        "analog.dac_bits=1,2,4",
+        "--output",
+        str(out),
+    ]
+    assert main(args) == 0
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [row["index"] for row in rows] == list(range(6))
+    assert all(3 <= row["overrides"]["analog.adc.draft_bits"] <= 5 for row in rows)
+
+    at = args.index("--sample")
+    with pytest.raises(SystemExit):
+        main([*args[:at], *args[at + 2 :]])
+    assert "--sampler and --seed require --sample" in capsys.readouterr().err
@@ -0,0 +1,131 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import HardwareConfig, ModelConfig, _load_yaml
+from selfspec_calculator.dse import run_sweep
+from selfspec_calculator.estimator import estimate_sweep
+from selfspec_calculator.io import load_speculation_stats
+from selfspec_calculator.shards import (
+    _claim,
+    merge_report,
+    merge_shards,
+    plan_shards,
+    requeue_stale,
+    shard_status,
+    work_shards,
+)
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def _common(hardware_file: str = "hardware.yaml") -> dict:
+    return {
+        "model_raw": _load_yaml(EXAMPLES / "model.yaml"),
+        "hardware_raw": _load_yaml(EXAMPLES / hardware_file),
+        "stats": load_speculation_stats(EXAMPLES / "stats.json"),
+        "prompt_lengths": [64, 128, 256, 512, 1024],
+    }
+
+
+def test_sharded_sweep_merges_to_the_unsharded_rows(tmp_path: Path) -> None:
+    common = _common()
+    sweeps = [("analog.dac_bits", [1, 2, 3]), ("reuse_policy", ["reuse", "reread"])]
+    shards = plan_shards(tmp_path, **common, sweeps=sweeps, detail="metrics", shard_size=4)
+    assert shards == 8  # 6 combinations x 5 prompt lengths, most combinations split across shards
+
+    with pytest.raises(ValueError, match="no results yet"):
+        merge_shards(tmp_path)
+    assert work_shards(tmp_path, worker_id="a", max_shards=3) == 3
+    assert work_shards(tmp_path, worker_id="b") == 5
+    assert shard_status(tmp_path) == {"shards": 8, "pending": 0, "claimed": 0, "done": 8}
+
+    expected = list(run_sweep(**common, sweeps=sweeps, detail="metrics"))
+    assert merge_shards(tmp_path) == json.loads(json.dumps(expected))
+    with pytest.raises(ValueError, match="already holds"):
+        plan_shards(tmp_path, **common, sweeps=sweeps)
+
+
+def test_sharded_single_config_merges_to_one_report(tmp_path: Path) -> None:
+    common = _common("hardware_soc_memory.yaml")
+    paths = {"model": "m.yaml", "hardware": "h.yaml", "stats": "s.json"}
+    plan_shards(tmp_path, **common, sweeps=[], shard_size=2, paths=paths)
+    work_shards(tmp_path)
+
+    merged = merge_report(tmp_path)
+    expected = estimate_sweep(
+        ModelConfig.model_validate(common["model_raw"]),
+        HardwareConfig.model_validate(common["hardware_raw"]),
+        common["stats"],
+        common["prompt_lengths"],
+        paths=paths,
+        break_even=True,
+    ).model_dump(mode="json")
+    merged.pop("generated_at")
+    expected.pop("generated_at")
+    assert merged == expected
+
+
+def test_part_failure_reports_the_first_error(tmp_path: Path) -> None:
+    common = _common("hardware_soc_memory.yaml")
+    common["hardware_raw"]["memory"].setdefault("kv_cache", {})["max_context_tokens"] = 300
+    sweeps = [("memory.kv_cache.max_context_tokens", [300, 2000])]
+    plan_shards(tmp_path, **common, sweeps=sweeps, detail="metrics", shard_size=2)
+    work_shards(tmp_path)
+
+    rows = merge_shards(tmp_path)
+    expected = json.loads(json.dumps(list(run_sweep(**common, sweeps=sweeps, detail="metrics"))))
+    assert rows == expected
+    assert "capacity" in rows[0]["error"] and "report" in rows[1]
+
+
+def test_stale_claims_are_requeued(tmp_path: Path) -> None:
+    plan_shards(tmp_path, **_common(), sweeps=[], shard_size=2)
+    name, claimed = _claim(tmp_path, "crashed")
+    assert shard_status(tmp_path)["claimed"] == 1
+    assert requeue_stale(tmp_path, 60.0) == []
+    os.utime(claimed, (0, 0))
+    assert requeue_stale(tmp_path, 60.0) == [name]
+    assert work_shards(tmp_path) == 3
+    assert len(merge_report(tmp_path)["points"]) == 5
+
+
+def test_cli_sharded_sweep(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    shard_dir = tmp_path / "shards"
+    plan = [
+        "sweep",
+        "--shard-dir",
+        str(shard_dir),
+        "--model",
+        str(EXAMPLES / "model.yaml"),
+        "--hardware",
+        str(EXAMPLES / "hardware.yaml"),
+        "--stats",
+        str(EXAMPLES / "stats.json"),
+        "--prompt-lengths",
+        "64",
+        "128",
+        "--detail",
+        "metrics",
+        "--sweep",
+        "analog.dac_bits=1,2",
+        "--shard-size",
+        "1",
+    ]
+    assert main(plan) == 0
+    assert json.loads(capsys.readouterr().out) == {"shards": 4}
+    with pytest.raises(SystemExit):
+        main(["sweep", "--shard-dir", str(shard_dir)])
+    assert "--work" in capsys.readouterr().err
+
+    assert main(["sweep", "--shard-dir", str(shard_dir), "--work", "--worker-id", "w1"]) == 0
+    assert json.loads(capsys.readouterr().out)["worker_shards"] == 4
+    out = tmp_path / "merged.jsonl"
+    assert main(["merge", "--shard-dir", str(shard_dir), "--output", str(out)]) == 0
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [row["overrides"] for row in rows] == [{"analog.dac_bits": 1}, {"analog.dac_bits": 2}]
+    assert [len(row["report"]["points"]) for row in rows] == [2, 2]
@@ -299,3 +299,21 @@ def test_max_context_tokens_not_enforced_when_unset() -> None:
     )
 
     estimate_point(model=model, hardware=hardware, stats=stats, l_prompt=61)
+
+
+def test_resolved_knob_specs_are_memoized_and_follow_knob_changes() -> None:
+    hardware = _base_knob_hardware()
+
+    specs = hardware.resolve_knob_specs()
+    assert hardware.resolve_knob_specs() is specs
+    payload = hardware.resolved_library_payload()
+    assert payload is not None
+    payload["name"] = "mutated"
+    assert hardware.resolved_library_payload()["name"] == "puma_like_v1"
+
+    assert hardware.analog is not None
+    hardware.analog.dac_bits = 2
+    resolved = hardware.resolve_knob_specs()
+    assert resolved is not specs
+    assert resolved.dac_bits == 2
+    assert hardware.resolved_library_payload()["dac"]["bits"] == 2
@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import HardwareConfig, ModelConfig
+from selfspec_calculator.estimator import Estimator, estimate_batch, estimate_sweep
+from selfspec_calculator.stats import SpeculationStats
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+STATS = {
+    "low_noise": SpeculationStats(k=4, histogram={0: 1.0, 4: 9.0}),
+    "high_noise": SpeculationStats(k=4, histogram={0: 6.0, 1: 3.0, 2: 1.0}),
+    "k2": SpeculationStats(k=2, histogram={1: 1.0, 2: 1.0}),
+}
+
+
+@pytest.mark.parametrize("detail", ["full", "metrics"])
+def test_batch_matches_individual_sweeps(detail: str) -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware_soc_memory.yaml")
+    batch = estimate_batch(model, hardware, STATS, [16, 512], detail=detail)
+
+    assert batch.stats_ids == list(STATS)
+    assert [(p.stats_id, p.l_prompt) for p in batch.points] == [(s, l) for s in STATS for l in (16, 512)]
+    for stats_id, stats in STATS.items():
+        report = estimate_sweep(model, hardware, stats, [16, 512], detail=detail)
+        rows = [p for p in batch.points if p.stats_id == stats_id]
+        for row, point in zip(rows, report.points):
+            assert row.k == stats.k
+            assert row.speculative.model_dump() == pytest.approx(point.speculative.model_dump(), rel=1e-12)
+            assert row.delta.model_dump() == pytest.approx(point.delta.model_dump(), rel=1e-12)
+            assert (row.breakdown is None) == (detail == "metrics")
+    assert batch.area_breakdown_mm2 == report.area_breakdown_mm2
+
+
+def test_batch_accepts_a_list_and_rejects_empty_input() -> None:
+    model = ModelConfig.from_yaml(EXAMPLES / "model.yaml")
+    hardware = HardwareConfig.from_yaml(EXAMPLES / "hardware.yaml")
+    estimator = Estimator(model, hardware)
+
+    batch = estimator.evaluate_batch([64], list(STATS.values()), detail="metrics")
+    assert batch.stats_ids == ["0", "1", "2"]
+    with pytest.raises(ValueError, match="at least one"):
+        estimator.evaluate_batch([64], [])
+
+
+def test_cli_stats_glob_emits_one_table(tmp_path: Path) -> None:
+    for name, stats in STATS.items():
+        (tmp_path / f"noise_{name}.json").write_text(stats.model_dump_json(), encoding="utf-8")
+    out = tmp_path / "out" / "batch.json"
+    code = main(
+        [
+            "--model",
+            str(EXAMPLES / "model.yaml"),
+            "--hardware",
+            str(EXAMPLES / "hardware.yaml"),
+            "--stats",
+            str(tmp_path / "noise_*.json"),
+            "--prompt-lengths",
+            "64",
+            "128",
+            "--detail",
+            "metrics",
+            "--output",
+            str(out),
+        ]
+    )
+    assert code == 0
+    payload = json.loads(out.read_text(encoding="utf-8"))
+    assert [Path(s).name for s in payload["stats_ids"]] == sorted(f"noise_{name}.json" for name in STATS)
+    assert len(payload["points"]) == 2 * len(STATS)
+    assert {point["l_prompt"] for point in payload["points"]} == {64, 128}
@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from selfspec_calculator.cli import main
+from selfspec_calculator.config import HardwareConfig, ModelConfig, _load_yaml
+from selfspec_calculator.dse import apply_overrides, run_sweep, run_top, top_n
+from selfspec_calculator.estimator import estimate_point
+from selfspec_calculator.io import load_speculation_stats
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def _row(index: int, values: dict[int, float]) -> dict:
+    points = [
+        {"l_prompt": l, "speculative": {"tokens_per_joule": v, "energy_pj_per_token": -v}} for l, v in values.items()
+    ]
+    return {"index": index, "overrides": {"i": index}, "report": {"points": points}}
+
+
+def test_top_n_keeps_best_candidates_with_stable_ties() -> None:
+    rows = [
+        _row(0, {8: 1.0, 64: 5.0}),
+        {"index": 1, "overrides": {}, "error": "x"},
+        _row(2, {8: 5.0, 64: 3.0}),
+        _row(3, {8: 4.0}),
+    ]
+
+    best = top_n(iter(rows), 3, "tokens_per_joule")
+    assert [(c["index"], c["l_prompt"], c["value"]) for c in best] == [(0, 64, 5.0), (2, 8, 5.0), (3, 8, 4.0)]
+
+    lowest_energy = top_n(iter(rows), 2, "energy_pj_per_token")
+    assert [c["value"] for c in lowest_energy] == [-5.0, -5.0]
+
+    with pytest.raises(ValueError, match="objective"):
+        top_n(iter(rows), 1, "area")
+
+
+def test_run_top_matches_full_sweep_ranking_and_recomputes_breakdowns() -> None:
+    kwargs = {
+        "model_raw": _load_yaml(EXAMPLES / "model.yaml"),
+        "hardware_raw": _load_yaml(EXAMPLES / "hardware.yaml"),
+        "stats": load_speculation_stats(EXAMPLES / "stats.json"),
+        "prompt_lengths": [64, 1024],
+        "sweeps": [("analog.dac_bits", [1, 2, 4]), ("analog.adc.draft_bits", [3, 4])],
+    }
+    everything = [
+        (point["speculative"]["tokens_per_joule"], row["index"], point["l_prompt"])
+        for row in run_sweep(**kwargs, detail="metrics")
+        for point in row["report"]["points"]
+    ]
+    expected = sorted(everything, reverse=True)[:4]
+
+    winners = list(run_top(**kwargs, n=4, objective="tokens_per_joule"))
+
+    assert [(w["objective"]["tokens_per_joule"], w["index"], w["l_prompt"]) for w in winners] == expected
+    assert [w["rank"] for w in winners] == [1, 2, 3, 4]
+    first = winners[0]
+    model_raw, hardware_raw = apply_overrides(kwargs["model_raw"], kwargs["hardware_raw"], first["overrides"])
+    model = ModelConfig.model_validate(model_raw)
+    hardware = HardwareConfig.model_validate(hardware_raw)
+    metrics, breakdown = estimate_point(model, hardware, kwargs["stats"], first["l_prompt"])
+    point = first["report"]["points"][0]
+    assert point["speculative"]["tokens_per_joule"] == pytest.approx(metrics.tokens_per_joule, rel=1e-9)
+    assert point["breakdown"]["total"]["energy_pj"] == pytest.approx(breakdown.total.energy_pj, rel=1e-9)
+
+
+def test_cli_top_without_sweep_ranks_prompt_lengths(tmp_path: Path) -> None:
+    out = tmp_path / "top.jsonl"
+    code = main(
+        [
+            "--model",
+            str(EXAMPLES / "model.yaml"),
+            "--hardware",
+            str(EXAMPLES / "hardware.yaml"),
+            "--stats",
+            str(EXAMPLES / "stats.json"),
+            "--prompt-lengths",
+            "16",
+            "256",
+            "4096",
+            "--top",
+            "2",
+            "--objective",
+            "latency_ns_per_token",
+            "--output",
+            str(out),
+        ]
+    )
+    assert code == 0
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["l_prompt"] for r in rows] == [16, 256]
+    assert rows[0]["objective"]["latency_ns_per_token"] <= rows[1]["objective"]["latency_ns_per_token"]
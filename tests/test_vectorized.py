@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from selfspec_calculator.config import HardwareConfig, MemoryTechKnobs, ModelConfig
+from selfspec_calculator.estimator import memory_energy_latency, estimate_point, estimate_sweep
+from selfspec_calculator.stats import SpeculationStats
+from selfspec_calculator.vectorized import estimate_sweep_array
+
+
+MODEL = {
+    "n_layers": 3,
+    "d_model": 64,
+    "n_heads": 8,
+    "activation_bits": 12,
+    "ffn_type": "mlp",
+    "ffn_expansion": 4.0,
+    "draft_policy": {"per_layer": {2: {"wo": "full"}}},
+}
+
+
+def _knob_hardware(**overrides) -> HardwareConfig:
+    return HardwareConfig.model_validate(
+        {
+            "reuse_policy": "reuse",
+            "library": "science_soc_v1",
+            "analog": {
+                "xbar_size": 128,
+                "num_columns_per_adc": 16,
+                "dac_bits": 4,
+                "adc": {"draft_bits": 4, "residual_bits": 12},
+            },
+            **overrides,
+        }
+    )
+
+
+@pytest.mark.parametrize("schedule", ["serialized", "layer-pipelined"])
+@pytest.mark.parametrize("with_memory", [False, True])
+def test_array_sweep_matches_scalar_metrics(schedule: str, with_memory: bool) -> None:
+    model = ModelConfig.model_validate(MODEL)
+    overrides = {"soc": {"schedule": schedule}}
+    if with_memory:
+        overrides["memory"] = {"hbm": {"read_bandwidth_GBps": 50.0}}
+    hardware = _knob_hardware(**overrides)
+    stats = SpeculationStats(k=4, histogram={0: 1.0, 2: 1.0, 4: 2.0})
+    lengths = np.array([0, 1, 100, 20_000])
+
+    arrays = estimate_sweep_array(model, hardware, stats, lengths)
+
+    assert len(arrays) == 4
+    for i, l_prompt in enumerate(lengths.tolist()):
+        metrics, breakdown = estimate_point(model, hardware, stats, l_prompt)
+        for name, value in metrics.model_dump().items():
+            assert arrays.speculative[name][i] == pytest.approx(value, rel=1e-9)
+        assert arrays.breakdown["total.energy_pj"][i] == pytest.approx(breakdown.total.energy_pj, rel=1e-9)
+        assert arrays.breakdown["draft.stages.qk_latency_ns"][i] == pytest.approx(
+            breakdown.draft.stages.qk_latency_ns, rel=1e-9
+        )
+        assert arrays.breakdown["verify_bonus.components.adc_residual_energy_pj"][i] == pytest.approx(
+            breakdown.verify_bonus.components.adc_residual_energy_pj, rel=1e-9
+        )
+
+
+def test_array_sweep_builds_backward_compatible_report() -> None:
+    model = ModelConfig.model_validate(MODEL)
+    hardware = _knob_hardware(memory={}, soc={"schedule": "layer-pipelined"})
+    stats = SpeculationStats(k=2, histogram={0: 1.0, 2: 3.0})
+
+    expected = estimate_sweep(model, hardware, stats, [16, 64]).model_dump(mode="json")
+    actual = estimate_sweep_array(model, hardware, stats, np.array([16, 64])).to_report().model_dump(mode="json")
+
+    for payload in (expected, actual):
+        payload.pop("generated_at")
+    assert actual.keys() == expected.keys()
+    assert actual["points"][1]["breakdown"]["total"]["energy_pj"] == pytest.approx(
+        expected["points"][1]["breakdown"]["total"]["energy_pj"], rel=1e-9
+    )
+    assert actual["points"][0]["baseline"] == pytest.approx(expected["points"][0]["baseline"], rel=1e-9)
+    assert actual["area_breakdown_mm2"] == expected["area_breakdown_mm2"]
+
+
+def test_array_sweep_enforces_context_capacity() -> None:
+    model = ModelConfig.model_validate(MODEL)
+    hardware = _knob_hardware(memory={"kv_cache": {"max_context_tokens": 128}})
+    stats = SpeculationStats(k=4, histogram={0: 1.0})
+
+    with pytest.raises(ValueError, match=r"L_prompt \(125\)"):
+        estimate_sweep_array(model, hardware, stats, np.array([64, 125, 200]))
+
+
+@pytest.mark.parametrize("bandwidth", [0.0, 64.0])
+def test_memory_cost_is_shared_between_scalar_and_array_paths(bandwidth: float) -> None:
+    tech = MemoryTechKnobs(
+        read_energy_pj_per_byte=0.5,
+        write_energy_pj_per_byte=0.7,
+        read_bandwidth_GBps=bandwidth,
+        write_bandwidth_GBps=bandwidth,
+        read_latency_ns=3.0,
+        write_latency_ns=5.0,
+    )
+    read_bytes = np.array([0.0, 0.0, 128.0, 4096.0])
+    write_bytes = np.array([0.0, 256.0, 0.0, 1024.0])
+    energy, latency = memory_energy_latency(tech=tech, read_bytes=read_bytes, write_bytes=write_bytes)
+    for i, (r, w) in enumerate(zip(read_bytes.tolist(), write_bytes.tolist())):
+        assert (energy[i], latency[i]) == memory_energy_latency(tech=tech, read_bytes=r, write_bytes=w)
+    assert latency[0] == 0.0 and latency[1] == pytest.approx(5.0 + (256.0 / bandwidth if bandwidth else 0.0))